@@ -24,7 +24,6 @@ __all__ = ['asdm_recoverable', 'asdm_encode', 'asdm_decode',
            'asdm_decode_pop', 'asdm_decode_pop_ins']
 
 import numpy as np
-import scipy.signal
 
 # The sici() function in scipy.special is used to construct the matrix
 # G in certain decoding algorithms because it can compute the sine
@@ -32,6 +31,13 @@ import scipy.signal
 import scipy.special
 
 import bionet.utils.numpy_extras as ne
+from bionet.ted.synthesis import sinc_synth
+import bionet.ted.solvers as solvers
+from bionet.ted.operators import GOperator
+from bionet.ted.parallel import assemble_blocks
+from bionet.ted.spikes import SpikeTrain, spike_intervals, \
+     spike_midpoints, spike_times
+from bionet.utils.signal_extras import Upsampler
 from bionet.ted.vtdm import asdm_decode_vander, \
      asdm_decode_vander_ins
 
@@ -127,8 +133,103 @@ def asdm_recoverable(u, bw, b, d, k):
     else:
         return True
 
+def _asdm_encode_engine(du_pos, du_neg, dt, d, y, interval, sgn):
+    """
+    Find the spikes generated by an ASDM driven by the specified
+    integrator increments.
+
+    Rather than updating the integrator one sample at a time, the
+    trajectory between spikes is computed in bulk with a cumulative
+    sum over chunks of the input whose length is adapted to the
+    observed interspike intervals. The results are identical to those
+    obtained by iterating `y = y+du[i]` (where `du` is `du_pos` when
+    `sgn` is positive and `du_neg` otherwise), setting `y` to `d*sgn`
+    and flipping `sgn` whenever `abs(y)` reaches `d`.
+
+    Parameters
+    ----------
+    du_pos : ndarray of floats
+        Integrator increments when the integrator sign is positive.
+    du_neg : ndarray of floats
+        Integrator increments when the integrator sign is negative.
+    dt : float
+        Time step (in s).
+    d : float
+        Encoder threshold.
+    y : float
+        Initial value of integrator.
+    interval : float
+        Time since last spike (in s).
+    sgn : {+1, -1}
+        Sign of integrator.
+
+    Returns
+    -------
+    s : ndarray of floats
+        Interspike intervals.
+    y : float
+        Final value of integrator.
+    interval : float
+        Time since last spike (in s).
+    sgn : {+1, -1}
+        Sign of integrator.
+    """
+
+    N = len(du_pos)
+    if N == 0:
+        return np.array((), np.float), y, interval, sgn
+
+    # The interval between two successive spikes is the result of
+    # repeatedly adding dt to 0; these sums are precomputed so that they
+    # exhibit the same roundoff as the sequential additions:
+    ticks = np.cumsum(np.repeat(np.float(dt), N))
+
+    s = []
+    start = 0   # index of first step after the last spike
+    i = 0       # index of next increment to integrate
+    L = 64      # length of chunk to search for the next crossing
+    while i < N:
+        j = min(i+L, N)
+        if sgn > 0:
+            x = du_pos[i:j].copy()
+        else:
+            x = du_neg[i:j].copy()
+        x[0] += y
+        yc = np.cumsum(x)
+        m = np.argmax(np.abs(yc) >= d)
+        if np.abs(yc[m]) >= d:
+            n = i+m+1-start
+            if start == 0:
+                s.append(np.cumsum(np.hstack((interval,
+                                              np.repeat(dt, n))))[-1])
+            else:
+                s.append(ticks[n-1])
+            y = d*sgn
+            sgn = -sgn
+            i = start = i+m+1
+
+            # Assume that the next interspike interval will be
+            # similar in length to the current one:
+            L = n+n/4+8
+        else:
+            y = yc[-1]
+            i = j
+            L *= 2
+
+    # Update the time since the last spike:
+    n = N-start
+    if start == 0:
+        interval = np.cumsum(np.hstack((interval, np.repeat(dt, n))))[-1]
+    elif n > 0:
+        interval = ticks[n-1]
+    else:
+        interval = 0.0
+
+    return np.array(s), y, interval, sgn
+
 def asdm_encode(u, dt, b, d, k=1.0, dte=0.0, y=0.0, interval=0.0,
-                sgn=1, quad_method='trapz', full_output=False):
+                sgn=1, quad_method='trapz', full_output=False,
+                spike_train=False, flush=True):
     """
     ASDM time encoding machine.
 
@@ -148,9 +249,11 @@ def asdm_encode(u, dt, b, d, k=1.0, dte=0.0, y=0.0, interval=0.0,
         Encoder threshold.
     k : float
         Encoder integration constant.
-    dte : float
+    dte : float or Upsampler
         Sampling resolution assumed by the encoder (s).
-        This may not exceed `dt`.
+        This may not exceed `dt`. If finer than `dt`, the signal is
+        interpolated block by block with an `Upsampler`, which is
+        returned in place of `dte` when `full_output` is set.
     y : float
         Initial value of integrator.
     interval : float
@@ -164,10 +267,21 @@ def asdm_encode(u, dt, b, d, k=1.0, dte=0.0, y=0.0, interval=0.0,
         by the given parameters (with updated values for `y`, `interval`, and
         `sgn`). This is useful when the function is called repeatedly to
         encode a long signal.
+    spike_train : bool
+        If set, the encoded signal is returned as a `SpikeTrain`
+        rather than as an array of interspike intervals. This may
+        not be combined with `full_output`.
+    flush : bool
+        If set, all of the interpolated samples are encoded before
+        returning. Otherwise, those associated with the last few
+        entries in `u` are retained by the `Upsampler` and encoded
+        during the next call; this is only useful when the function
+        is called repeatedly with `full_output` set to encode a long
+        signal in blocks.
 
     Returns
     -------
-    s : ndarray of floats
+    s : ndarray of floats or SpikeTrain
         If `full_output` == False, returns the signal encoded as an
         array of time intervals between spikes.
     s, dt, b, d, k, dte, y, interval, sgn, quad_method, full_output : tuple
@@ -178,8 +292,53 @@ def asdm_encode(u, dt, b, d, k=1.0, dte=0.0, y=0.0, interval=0.0,
     -----
     When trapezoidal integration is used, the value of the integral
     will not be computed for the very last entry in `u`.
+    When the signal is interpolated and `flush` is not set, the
+    interpolated samples associated with the last few entries in `u`
+    are encoded during the next call; encoding an empty block flushes
+    them.
     """
 
+    if spike_train:
+        if full_output:
+            raise ValueError('spike trains cannot be returned with '
+                             'full output')
+        return SpikeTrain.from_intervals(asdm_encode(u, dt, b, d, k, dte, y,
+                                                     interval, sgn,
+                                                     quad_method,
+                                                     flush=flush))
+
+    # Check whether the encoding resolution is finer than that of the
+    # original sampled signal:
+    if not isinstance(dte, Upsampler):
+        if dte > dt:
+            raise ValueError('encoding time resolution must not exceeed original signal resolution')
+        if dte < 0:
+            raise ValueError('encoding time resolution must be nonnegative')
+    if isinstance(dte, Upsampler) or (dte != 0 and dte != dt):
+
+        # Interpolate the signal one block at a time and encode each
+        # interpolated block. The interpolator retains the samples
+        # needed to interpolate across block boundaries and is
+        # returned in place of dte so that subsequent calls continue
+        # the interpolation:
+        if isinstance(dte, Upsampler):
+            upsampler = dte
+        else:
+            upsampler = Upsampler(int(round(dt/dte)))
+        s = []
+        for u_block in upsampler.blocks(u,
+                flush=flush or len(u) == 0,
+                overlap=quad_method == 'trapz'):
+            temp = asdm_encode(u_block, dt/upsampler.n, b, d, k, 0, y,
+                               interval, sgn, quad_method, True)
+            s.extend(temp[0])
+            y, interval, sgn = temp[6:9]
+        if full_output:
+            return np.array(s), dt, b, d, k, upsampler, y, interval, sgn, \
+                   quad_method, full_output
+        else:
+            return np.array(s)
+
     Nu = len(u)
     if Nu == 0:
         if full_output:
@@ -188,53 +347,58 @@ def asdm_encode(u, dt, b, d, k=1.0, dte=0.0, y=0.0, interval=0.0,
         else:
             return np.array((), np.float)
 
-    # Check whether the encoding resolution is finer than that of the
-    # original sampled signal:
-    if dte > dt:
-        raise ValueError('encoding time resolution must not exceeed original signal resolution')
-    if dte < 0:
-        raise ValueError('encoding time resolution must be nonnegative')
-    if dte != 0 and dte != dt:
-
-        # Resample signal and adjust signal length accordingly:
-        M = int(dt/dte)
-        u = scipy.signal.resample(u, len(u)*M)
-        Nu *= M
-        dt = dte
-
-    # Use a list rather than an array to save the spike intervals
-    # because the number of spikes is not fixed:
-    s = []
-
-    # Choose integration method and set the number of points over
-    # which to integrate the input (see note above). This allows the
-    # use of one loop below to perform the integration regardless of
-    # the method chosen:
+    # Compute the increments added to the integrator at each step for
+    # either sign of the integrator. These are evaluated using the same
+    # expressions (and hence the same floating point roundoff) as a
+    # sample-by-sample update:
+    u = np.asarray(u, np.float)
     if quad_method == 'rect':
-        compute_y = lambda y, sgn, i: y + dt*(sgn*b+u[i])/k
-        last = Nu
+        v = u
     elif quad_method == 'trapz':
-        compute_y = lambda y, sgn, i : y + dt*(sgn*b+(u[i]+u[i+1])/2.0)/k
-        last = Nu-1
+        v = (u[:-1]+u[1:])/2.0
     else:
         raise ValueError('unrecognized quadrature method')
+    du_pos = dt*(b+v)/k
+    du_neg = dt*(-b+v)/k
 
-    for i in xrange(last):
-        y = compute_y(y, sgn, i)
-        interval += dt
-        if np.abs(y) >= d:
-            s.append(interval)
-            interval = 0.0
-            y = d*sgn
-            sgn = -sgn
+    s, y, interval, sgn = \
+       _asdm_encode_engine(du_pos, du_neg, dt, d, y, interval, sgn)
 
     if full_output:
-        return np.array(s), dt, b, d, k, dte, y, interval, sgn, \
+        return s, dt, b, d, k, dte, y, interval, sgn, \
                quad_method, full_output
     else:
-        return np.array(s)
+        return s
+
+def _asdm_quanta(s, b, d, k, sgn):
+    """
+    Compute the quanta of an ASDM time decoding machine.
+
+    Compute the integrals of the encoded signal over the intervals
+    between the spike times implied by the interspike intervals `s`;
+    the sign of the first spike is `sgn`.
+    """
+
+    s = np.asarray(s)
+    if sgn == -1:
+        return (-1)**np.arange(1, len(s))*(2*k*d-b*s[1:])
+    else:
+        return (-1)**np.arange(0, len(s)-1)*(2*k*d-b*s[1:])
+
+def _asdm_G_block(ts, tsh, bw):
+    """
+    Compute a block of the reconstruction matrix of an ASDM time
+    decoding machine.
 
-def asdm_decode(s, dur, dt, bw, b, d, k=1.0, sgn=-1):
+    Evaluate the integrals of the sinc kernels centered at the times
+    `tsh` over the intervals between the spike times `ts`.
+    """
+
+    temp = scipy.special.sici(bw*(ts[:, np.newaxis]-tsh))[0]/np.pi
+    return temp[1:]-temp[:-1]
+
+def asdm_decode(s, dur, dt, bw, b, d, k=1.0, sgn=-1, solver='pinv',
+                dtype=np.float64):
     """
     ASDM time decoding machine.
 
@@ -242,7 +406,7 @@ def asdm_decode(s, dur, dt, bw, b, d, k=1.0, sgn=-1):
 
     Parameters
     ----------
-    s : ndarray of floats
+    s : array_like of floats or SpikeTrain
         Encoded signal. The values represent the time between spikes (in s).
     dur : float
         Duration of signal (in s).
@@ -259,6 +423,16 @@ def asdm_decode(s, dur, dt, bw, b, d, k=1.0, sgn=-1):
         Encoder integrator constant.
     sgn : {-1, 1}
         Sign of first spike.
+    solver : {'pinv', 'tsvd', 'cg', 'lsqr', 'minres'} or callable
+        Solver used to compute the reconstruction coefficients; see
+        `bionet.ted.solvers` for details.
+        If an iterative solver is specified by name, the
+        reconstruction matrix is not formed explicitly.
+    dtype : {numpy.float64, numpy.float32}
+        Floating point type used to compute the reconstruction
+        coefficients and the recovered signal. Single precision halves
+        the memory occupied by the reconstruction matrix but limits the
+        accuracy of the recovered signal; see `bionet.ted.solvers`.
 
     Returns
     -------
@@ -270,46 +444,34 @@ def asdm_decode(s, dur, dt, bw, b, d, k=1.0, sgn=-1):
     if Ns < 2:
         raise ValueError('s must contain at least 2 elements')
 
-    # Cast s to an ndarray to permit ndarray operations:
-    s = np.asarray(s)
-
-    # Compute the spike times:
-    ts = np.cumsum(s)
-
-    # Compute the midpoints between spike times:
-    tsh = (ts[0:-1]+ts[1:])/2
+    # Compute the spike times and the midpoints between them:
+    ts = spike_times(s)
+    tsh = spike_midpoints(s)
+    s = np.asarray(spike_intervals(s))
     Nsh = len(tsh)
 
-    bwpi = bw/np.pi
-
     # Compute G matrix:
-    G = np.empty((Nsh, Nsh), np.float)
-    for j in xrange(Nsh):
+    if solvers.is_iterative(solver):
+        G = GOperator(ts, tsh, bw)
+    else:
+        G = np.empty((Nsh, Nsh), dtype)
+        for j in xrange(Nsh):
 
-        # Compute the values for all of the sincs so that they do not
-        # need to each be recomputed when determining the integrals
-        # between spike times:
-        temp = scipy.special.sici(bw*(ts-tsh[j]))[0]/np.pi
-        G[:, j] = temp[1:]-temp[:-1]
-    G_inv = np.linalg.pinv(G, __pinv_rcond__)
+            # Compute the values for all of the sincs so that they do not
+            # need to each be recomputed when determining the integrals
+            # between spike times:
+            temp = scipy.special.sici(bw*(ts-tsh[j]))[0]/np.pi
+            G[:, j] = temp[1:]-temp[:-1]
 
     # Compute quanta:
-    if sgn == -1:
-        q = (-1)**np.arange(1, Nsh+1)*(2*k*d-b*s[1:])
-    else:
-        q = (-1)**np.arange(0, Nsh)*(2*k*d-b*s[1:])
+    q = np.asarray(_asdm_quanta(s, b, d, k, sgn), dtype)
 
-    # Reconstruct signal by adding up the weighted sinc functions. The
-    # weighted sinc functions are computed on the fly here to save
-    # memory:
-    t = np.arange(0, dur, dt)
-    u_rec = np.zeros(len(t), np.float)
-    c = np.dot(G_inv, q)
-    for i in xrange(Nsh):
-        u_rec += np.sinc(bwpi*(t-tsh[i]))*bwpi*c[i]
-    return u_rec
+    # Reconstruct signal by adding up the weighted sinc functions:
+    c = solvers.solve(G, q, solver, __pinv_rcond__)
+    return np.asarray(sinc_synth(tsh, c, dur, dt, bw), dtype)
 
-def asdm_decode_ins(s, dur, dt, bw, b, sgn=-1):
+def asdm_decode_ins(s, dur, dt, bw, b, sgn=-1, solver='pinv',
+                    dtype=np.float64):
     """
     Threshold-insensitive ASDM time decoding machine.
 
@@ -318,7 +480,7 @@ def asdm_decode_ins(s, dur, dt, bw, b, sgn=-1):
 
     Parameters
     ----------
-    s : ndarray of floats
+    s : array_like of floats or SpikeTrain
         Encoded signal. The values represent the time between spikes (in s).
     dur : float
         Duration of signal (in s).
@@ -331,6 +493,14 @@ def asdm_decode_ins(s, dur, dt, bw, b, sgn=-1):
         Encoder bias.
     sgn : {-1, 1}
         Sign of first spike.
+    solver : {'pinv', 'tsvd', 'cg', 'lsqr', 'minres'} or callable
+        Solver used to compute the reconstruction coefficients; see
+        `bionet.ted.solvers` for details.
+    dtype : {numpy.float64, numpy.float32}
+        Floating point type used to compute the reconstruction
+        coefficients and the recovered signal. Single precision halves
+        the memory occupied by the reconstruction matrix but limits the
+        accuracy of the recovered signal; see `bionet.ted.solvers`.
 
     Returns
     -------
@@ -342,22 +512,14 @@ def asdm_decode_ins(s, dur, dt, bw, b, sgn=-1):
     if Ns < 2:
         raise ValueError('s must contain at least 2 elements')
 
-    # Cast s to an ndarray to permit ndarray operations:
-    s = np.asarray(s)
-
-    # Compute the spike times:
-    ts = np.cumsum(s)
-
-    # Compute the midpoints between spike times:
-    tsh = (ts[0:-1]+ts[1:])/2
+    # Compute the spike times and the midpoints between them:
+    ts = spike_times(s)
+    tsh = spike_midpoints(s)
+    s = np.asarray(spike_intervals(s))
     Nsh = len(tsh)
 
-    t = np.arange(0, dur, dt)
-
-    bwpi = bw/np.pi
-
     # Compute G matrix:
-    G = np.empty((Nsh, Nsh), np.float)
+    G = np.empty((Nsh, Nsh), dtype)
     for j in xrange(Nsh):
 
         # Compute the values for all of the sinc functions so that
@@ -367,20 +529,18 @@ def asdm_decode_ins(s, dur, dt, bw, b, sgn=-1):
         G[:, j] = temp[1:]-temp[:-1]
 
     # Apply compensation principle:
-    B = np.diag(np.ones(Nsh-1), -1)+np.eye(Nsh)
+    B = np.diag(np.ones(Nsh-1, dtype), -1)+np.eye(Nsh, dtype=dtype)
     if sgn == -1:
         Bq = (-1)**np.arange(Nsh)*b*(s[1:]-s[:-1])
     else:
         Bq = (-1)**np.arange(1, Nsh+1)*b*(s[1:]-s[:-1])
+    Bq = np.asarray(Bq, dtype)
 
     # Reconstruct signal by adding up the weighted sinc functions; the
-    # first row of B is removed to eliminate boundary issues. The
-    # weighted sinc functions are computed on the fly to save memory:
-    u_rec = np.zeros(len(t), np.float)
-    c = np.dot(np.linalg.pinv(np.dot(B[1:, :], G), __pinv_rcond__), Bq[1:, np.newaxis])
-    for i in xrange(Nsh):
-        u_rec += np.sinc(bwpi*(t-tsh[i]))*bwpi*c[i]
-    return u_rec
+    # first row of B is removed to eliminate boundary issues:
+    c = solvers.solve(np.dot(B[1:, :], G), Bq[1:, np.newaxis], solver,
+                      __pinv_rcond__)
+    return np.asarray(sinc_synth(tsh, c, dur, dt, bw), dtype)
 
 def asdm_decode_fast(s, dur, dt, bw, M, b, d, k=1.0, sgn=-1):
     """
@@ -391,7 +551,7 @@ def asdm_decode_fast(s, dur, dt, bw, M, b, d, k=1.0, sgn=-1):
 
     Parameters
     ----------
-    s : numpy array of floats
+    s : array_like of floats or SpikeTrain
         Encoded signal. The values represent the time between spikes (in s).
     dur : float
         Duration of signal (in s).
@@ -421,14 +581,10 @@ def asdm_decode_fast(s, dur, dt, bw, M, b, d, k=1.0, sgn=-1):
     if Ns < 2:
         raise ValueError('s must contain at least 2 elements')
 
-    # Cast s to an ndarray to permit ndarray operations:
-    s = np.asarray(s)
-
-    # Compute the spike times:
-    ts = np.cumsum(s)
-
-    # Compute the midpoints between spike times:
-    tsh = (ts[0:-1]+ts[1:])/2
+    # Compute the spike times and the midpoints between them:
+    ts = spike_times(s)
+    tsh = spike_midpoints(s)
+    s = np.asarray(spike_intervals(s))
     Nsh = len(tsh)
 
     # Convert M in the event that an integer was specified:
@@ -436,10 +592,7 @@ def asdm_decode_fast(s, dur, dt, bw, M, b, d, k=1.0, sgn=-1):
     jbwM = 1j*bw/M
 
     # Compute quanta:
-    if sgn == -1:
-        q = (-1)**np.arange(1, Nsh+1)*(2*k*d-b*s[1:])
-    else:
-        q = (-1)**np.arange(0, Nsh)*(2*k*d-b*s[1:])
+    q = _asdm_quanta(s, b, d, k, sgn)
 
     # Compute approximation coefficients:
     a = bw/(np.pi*(2*M+1))
@@ -455,7 +608,9 @@ def asdm_decode_fast(s, dur, dt, bw, M, b, d, k=1.0, sgn=-1):
     t = np.arange(0, dur, dt)
     return np.ravel(np.real(jbwM*np.dot(m*dd.T, np.exp(jbwM*m[:, np.newaxis]*t))))
 
-def asdm_decode_pop(s_list, dur, dt, bw, b_list, d_list, k_list, sgn_list=[]):
+def asdm_decode_pop(s_list, dur, dt, bw, b_list, d_list, k_list, sgn_list=[],
+                    solver='pinv', n_workers=1, executor='thread',
+                    G_file=None, dtype=np.float64):
     """
     Multi-input single-output ASDM time decoding machine.
 
@@ -464,7 +619,7 @@ def asdm_decode_pop(s_list, dur, dt, bw, b_list, d_list, k_list, sgn_list=[]):
 
     Parameters
     ----------
-    s_list : list of ndarrays of floats
+    s_list : list of ndarrays of floats or SpikeEnsemble
         Signal encoded by an ensemble of encoders. The values represent the
         time between spikes (in s). The number of arrays in the list
         corresponds to the number of encoders in the ensemble.
@@ -483,6 +638,25 @@ def asdm_decode_pop(s_list, dur, dt, bw, b_list, d_list, k_list, sgn_list=[]):
         List of encoder integration constants.
     sgn_list : list of integers {-1, 1}
         List of signs of first spikes in trains.
+    solver : {'pinv', 'tsvd', 'cg', 'lsqr', 'minres'} or callable
+        Solver used to compute the reconstruction coefficients; see
+        `bionet.ted.solvers` for details.
+        If an iterative solver is specified by name, the
+        reconstruction matrix is not formed explicitly.
+    n_workers : int
+        Number of workers used to compute the blocks of the
+        reconstruction matrix associated with each pair of encoders. If
+        None, the number of processors is used.
+    executor : {'thread', 'process'}
+        Type of workers; see `bionet.ted.parallel.assemble_blocks`.
+    G_file : str
+        If specified, the reconstruction matrix is stored in a
+        memory-mapped file with this name rather than in memory.
+    dtype : {numpy.float64, numpy.float32}
+        Floating point type used to compute the reconstruction
+        coefficients and the recovered signal. Single precision halves
+        the memory occupied by the reconstruction matrix but limits the
+        accuracy of the recovered signal; see `bionet.ted.solvers`.
 
     Returns
     -------
@@ -505,13 +679,10 @@ def asdm_decode_pop(s_list, dur, dt, bw, b_list, d_list, k_list, sgn_list=[]):
     if len(sgn_list) != M:
         raise ValueError('incorrect number of first spike signs')
 
-    bwpi = bw/np.pi
-
-    # Compute the spike times:
-    ts_list = map(np.cumsum, s_list)
-
-    # Compute the midpoints between spike times:
-    tsh_list = map(lambda ts:(ts[0:-1]+ts[1:])/2, ts_list)
+    # Compute the spike times and the midpoints between them:
+    ts_list = map(spike_times, s_list)
+    tsh_list = map(spike_midpoints, s_list)
+    s_list = [np.asarray(spike_intervals(s)) for s in s_list]
 
     # Compute number of spikes in each spike list:
     Ns_list = map(len, ts_list)
@@ -519,46 +690,36 @@ def asdm_decode_pop(s_list, dur, dt, bw, b_list, d_list, k_list, sgn_list=[]):
 
     # Compute the values of the matrix that must be inverted to obtain
     # the reconstruction coefficients:
-    Nsh_cumsum = np.cumsum([0.0]+Nsh_list)
+    Nsh_cumsum = np.cumsum([0]+Nsh_list)
     Nsh_sum = Nsh_cumsum[-1]
-    G = np.empty((Nsh_sum, Nsh_sum), np.float)
-    q = np.empty((Nsh_sum, 1), np.float)
-    for l in xrange(M):
-        for m in xrange(M):
-            G_block = np.empty((Nsh_list[l], Nsh_list[m]), np.float)
-
-            # Compute the values for all of the sincs so that they
-            # do not need to each be recomputed when determining
-            # the integrals between spike times:
-            for k in xrange(Nsh_list[m]):
-                temp = scipy.special.sici(bw*(ts_list[l]-tsh_list[m][k]))[0]/np.pi
-                G_block[:, k] = temp[1:]-temp[:-1]
-
-            G[Nsh_cumsum[l]:Nsh_cumsum[l+1],
-              Nsh_cumsum[m]:Nsh_cumsum[m+1]] = G_block
-
-        # Compute the quanta:
-        if sgn_list[l] == -1:
-            q[Nsh_cumsum[l]:Nsh_cumsum[l+1], 0] = \
-                (-1)**np.arange(1, Nsh_list[l]+1)* \
-                (2*k_list[l]*d_list[l]-b_list[l]*s_list[l][1:])
+    if solvers.is_iterative(solver):
+        G = GOperator(ts_list, np.hstack(tsh_list), bw)
+    else:
+        if G_file is None:
+            G = np.empty((Nsh_sum, Nsh_sum), dtype)
         else:
-            q[Nsh_cumsum[l]:Nsh_cumsum[l+1], 0] = \
-                (-1)**np.arange(0, Nsh_list[l])* \
-                (2*k_list[l]*d_list[l]-b_list[l]*s_list[l][1:])
+            G = np.memmap(G_file, dtype, 'w+', shape=(Nsh_sum, Nsh_sum))
+        tasks = [((Nsh_cumsum[l], Nsh_cumsum[l+1],
+                   Nsh_cumsum[m], Nsh_cumsum[m+1]),
+                  (ts_list[l], tsh_list[m], bw)) \
+                 for l in xrange(M) for m in xrange(M)]
+        assemble_blocks(G, tasks, _asdm_G_block, n_workers, executor)
+
+    # Compute the quanta:
+    q = np.empty((Nsh_sum, 1), dtype)
+    for l in xrange(M):
+        q[Nsh_cumsum[l]:Nsh_cumsum[l+1], 0] = \
+            _asdm_quanta(s_list[l], b_list[l], d_list[l], k_list[l],
+                         sgn_list[l])
 
     # Compute the reconstruction coefficients:
-    c = np.dot(np.linalg.pinv(G), q)
+    c = solvers.solve(G, q, solver, 1e-15)
 
     # Reconstruct the signal using the coefficients:
-    t = np.arange(0, dur, dt)
-    u_rec = np.zeros(len(t), np.float)
-    for m in xrange(M):
-        for k in xrange(Nsh_list[m]):
-            u_rec += np.sinc(bwpi*(t-tsh_list[m][k]))*bwpi*c[Nsh_cumsum[m]+k, 0]
-    return u_rec
+    return np.asarray(sinc_synth(np.hstack(tsh_list), c, dur, dt, bw), dtype)
 
-def asdm_decode_pop_ins(s_list, dur, dt, bw, b_list, sgn_list=[]):
+def asdm_decode_pop_ins(s_list, dur, dt, bw, b_list, sgn_list=[],
+                        solver='pinv', dtype=np.float64):
     """
     Threshold-insensitive multi-input single-output time decoding
     machine.
@@ -568,7 +729,7 @@ def asdm_decode_pop_ins(s_list, dur, dt, bw, b_list, sgn_list=[]):
 
     Parameters
     ----------
-    s_list : list of ndarrays of floats
+    s_list : list of ndarrays of floats or SpikeEnsemble
         Signal encoded by an ensemble of encoders. The values represent the
         time between spikes (in s). The number of arrays in the list
         corresponds to the number of encoders in the ensemble.
@@ -581,6 +742,14 @@ def asdm_decode_pop_ins(s_list, dur, dt, bw, b_list, sgn_list=[]):
         Signal bandwidth (in rad/s).
     b_list : list of floats
         List of encoder biases.
+    solver : {'pinv', 'tsvd', 'cg', 'lsqr', 'minres'} or callable
+        Solver used to compute the reconstruction coefficients; see
+        `bionet.ted.solvers` for details.
+    dtype : {numpy.float64, numpy.float32}
+        Floating point type used to compute the reconstruction
+        coefficients and the recovered signal. Single precision halves
+        the memory occupied by the reconstruction matrix but limits the
+        accuracy of the recovered signal; see `bionet.ted.solvers`.
 
     Returns
     -------
@@ -603,23 +772,20 @@ def asdm_decode_pop_ins(s_list, dur, dt, bw, b_list, sgn_list=[]):
     if len(sgn_list) != M:
         raise ValueError('incorrect number of first spike signs')
 
-    bwpi = bw/np.pi
-
-    # Compute the spike times:
-    ts_list = map(np.cumsum, s_list)
-
-    # Compute the midpoints between spike times:
-    tsh_list = map(lambda ts:(ts[0:-1]+ts[1:])/2, ts_list)
+    # Compute the spike times and the midpoints between them:
+    ts_list = map(spike_times, s_list)
+    tsh_list = map(spike_midpoints, s_list)
+    s_list = [np.asarray(spike_intervals(s)) for s in s_list]
 
     # Compute number of spikes in each spike list:
     Nsh_list = map(lambda x: len(x)-1, tsh_list)
 
     # Compute the values of the matrix that must be inverted to obtain
     # the reconstruction coefficients:
-    Nsh_cumsum = np.cumsum([0.0]+Nsh_list)
+    Nsh_cumsum = np.cumsum([0]+Nsh_list)
     Nsh_sum = Nsh_cumsum[-1]
-    G = np.empty((Nsh_sum, Nsh_sum), np.float)
-    Bq = np.empty((Nsh_sum, 1), np.float)
+    G = np.empty((Nsh_sum, Nsh_sum), dtype)
+    Bq = np.empty((Nsh_sum, 1), dtype)
     for l in xrange(M):
         for m in xrange(M):
             G_block = np.empty((Nsh_list[l], Nsh_list[m]), np.float)
@@ -645,13 +811,10 @@ def asdm_decode_pop_ins(s_list, dur, dt, bw, b_list, sgn_list=[]):
                 b_list[l]*(s_list[l][2:]-s_list[l][1:-1])
 
     # Compute the reconstruction coefficients:
-    c = np.dot(np.linalg.pinv(G), Bq)
+    c = solvers.solve(G, Bq, solver, 1e-15)
 
-    # Reconstruct the signal using the coefficients:
-    t = np.arange(0, dur, dt)
-    u_rec = np.zeros(len(t), np.float)
-    for m in xrange(M):
-        for k in xrange(Nsh_list[m]):
-            u_rec += np.sinc(bwpi*(t-tsh_list[m][k]))*bwpi*c[Nsh_cumsum[m]+k, 0]
-    return u_rec
+    # Reconstruct the signal using the coefficients; the last
+    # midpoint of each spike train is not used:
+    return np.asarray(sinc_synth(np.hstack([tsh[:-1] for tsh in tsh_list]),
+                                 c, dur, dt, bw), dtype)
 
@@ -22,12 +22,13 @@ def bpa(np.ndarray V, np.ndarray b):
     ----------
     V : ndarray of floats, shape (M, M)
         A Vandermonde matrix.
-    b : ndarray of floats, shape (M,)
-        The system solved by this routine is `dot(V,d) == b`.
+    b : ndarray of floats, shape (M,) or (M, K)
+        The system solved by this routine is `dot(V,d) == b`. If `b`
+        has `K` columns, the system is solved for each column.
 
     Returns
     -------
-    d : ndarray of floats, shape (M,)
+    d : ndarray of floats, shape (M,) or (M, K)
         System solution.
 
     See Also
@@ -49,6 +50,10 @@ def bpa(np.ndarray V, np.ndarray b):
     if N <= 1:
         raise ValueError('V must contain more than 1 element')
 
+    # Solve the system for each column of b:
+    if b.ndim == 2 and b.shape[0] == N and b.shape[1] > 1:
+        return np.column_stack([bpa(V, b[:, i]) for i in xrange(b.shape[1])])
+
     # Save shape of b to set the shape of the output:
     bs = np.shape(b)
 
@@ -71,12 +71,13 @@ def bpa(V, b):
     ----------
     V : ndarray of floats, shape (M, M)
         A Vandermonde matrix.
-    b : ndarray of floats, shape (M,)
-        The system solved by this routine is `dot(V, d) == b`.
+    b : ndarray of floats, shape (M,) or (M, K)
+        The system solved by this routine is `dot(V, d) == b`. If `b`
+        has `K` columns, the system is solved for each column.
 
     Returns
     -------
-    d : ndarray of floats, shape (M,)
+    d : ndarray of floats, shape (M,) or (M, K)
         System solution.
 
     See Also
@@ -88,6 +89,10 @@ def bpa(V, b):
     The matrix is assumed to be oriented such that its second column
     contains the arguments that would need to be passed to the
     `vander()` function in order to contruct the matrix.
+
+    Each step of the recurrences of the algorithm updates all of the
+    entries of `b` at once; the cost of solving the system for several
+    right-hand sides is therefore close to that of solving it for one.
     """
 
     (N, C) = np.shape(V)
@@ -98,16 +103,20 @@ def bpa(V, b):
 
     z = V[:, 1].copy()
     bs = np.shape(b)
-    b = b.copy().flatten()
-
-    if b.size != N:
-        raise ValueError('size mismatch between V and b')
-
+    if len(bs) == 2 and bs[0] == N:
+        b = np.array(b, np.result_type(V, b))
+    else:
+        b = np.array(b, np.result_type(V, b)).flatten()
+        if b.size != N:
+            raise ValueError('size mismatch between V and b')
+        b = b[:, np.newaxis]
+    z = z[:, np.newaxis]
+
+    # The right-hand sides of the updates in each step only depend on
+    # the values of b computed in the previous step:
     for n in xrange(N):
-        for m in xrange(N-1, n, -1):
-            b[m] = (b[m] - b[m-1])/(z[m]-z[m-n-1])
+        b[n+1:] = (b[n+1:]-b[n:-1])/(z[n+1:]-z[:N-n-1])
     for n in xrange(N-1, -1, -1):
-        for m in xrange(n, N-1):
-            b[m] = b[m] - b[m+1]*z[n]
+        b[n:-1] -= b[n+1:]*z[n]
 
     return np.reshape(b, bs)
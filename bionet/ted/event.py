@@ -0,0 +1,346 @@
+#!/usr/bin/env python
+
+"""
+Event-driven time encoding algorithms. These algorithms encode signals
+that are specified analytically rather than by their samples; the
+integrals computed by each encoder are evaluated in closed form and
+the time of each spike is found by solving for the time at which the
+integrator reaches its threshold. The accuracy of the spike times
+therefore does not depend on any time resolution, and the cost of
+encoding is proportional to the number of spikes.
+
+- SincSignal        - Band-limited signal specified by its samples.
+- TrigPolySignal    - Trigonometric polynomial specified by its coefficients.
+- asdm_encode       - Event-driven ASDM time encoding machine.
+- iaf_encode        - Event-driven IAF time encoding machine.
+
+"""
+
+# Copyright (c) 2009-2015, Lev Givon
+# All rights reserved.
+# Distributed under the terms of the BSD license:
+# http://www.opensource.org/licenses/bsd-license
+
+__all__ = ['SincSignal', 'TrigPolySignal', 'asdm_encode', 'iaf_encode']
+
+import numpy as np
+import scipy.special
+
+from bionet.ted.spikes import SpikeTrain
+
+# Maximum number of iterations used to find each spike:
+__max_iter__ = 100
+
+class TrigPolySignal(object):
+    """
+    Trigonometric polynomial.
+
+    This class represents the real trigonometric polynomial
+    `u(t) = sum(am[m+M]*exp(1j*m*Omega*t/M)/sqrt(T))`, where `m` ranges
+    from `-M` to `M` and `T == 2*pi*M/Omega` is its period.
+
+    Parameters
+    ----------
+    am : array_like of complex
+        Dirichlet coefficients, e.g., as generated by
+        `bionet.utils.trig_poly.gen_dirichlet_coeffs`. The
+        coefficients are ordered such that `am[0]` contains the
+        coefficient for `m == -M`.
+    Omega : float
+        Bandwidth (in rad/s).
+
+    Methods
+    -------
+    integral(t0, t)
+        Integral of the signal over `[t0, t]`.
+    leaky_integral(t0, t, RC)
+        Integral of the signal over `[t0, t]` weighted by `exp(-(t-s)/RC)`.
+
+    """
+
+    def __init__(self, am, Omega):
+        self.am = np.asarray(am, np.complex)
+        if len(self.am) % 2 == 0:
+            raise ValueError('number of coefficients must be odd')
+        self.M = len(self.am)/2
+        self.Omega = Omega
+        self.T = 2*np.pi*self.M/Omega
+        self.wm = np.arange(-self.M, self.M+1)*Omega/self.M
+        self.cm = self.am/np.sqrt(self.T)
+
+    def __call__(self, t):
+        return np.real(np.dot(self.cm, np.exp(1j*self.wm*t)))
+
+    def integral(self, t0, t):
+        """Integrate the signal over the interval `[t0, t]`."""
+
+        # The constant term must be integrated separately:
+        M = self.M
+        e = np.exp(1j*self.wm*t)-np.exp(1j*self.wm*t0)
+        e[M] = 0.0
+        r = 1j*self.wm
+        r[M] = 1.0
+        return np.real(np.dot(self.cm, e/r)+self.cm[M]*(t-t0))
+
+    def leaky_integral(self, t0, t, RC):
+        """Integrate the signal weighted by `exp(-(t-s)/RC)` over the
+        interval `[t0, t]`."""
+
+        e = np.exp(1j*self.wm*t)-np.exp(-(t-t0)/RC+1j*self.wm*t0)
+        return np.real(np.dot(self.cm, e/(1j*self.wm+1.0/RC)))
+
+    def __repr__(self):
+        return 'TrigPolySignal(M=%i, Omega=%r)' % (self.M, self.Omega)
+
+class SincSignal(object):
+    """
+    Band-limited signal.
+
+    This class represents the band-limited signal
+    `u(t) = sum(u[k]*dt*sin(bw*(t-k*dt))/(pi*(t-k*dt)))` interpolated
+    from its uniformly spaced samples `u[k]`.
+
+    Parameters
+    ----------
+    u : array_like of floats
+        Signal samples.
+    dt : float
+        Sampling resolution; the sampling frequency is 1/dt Hz.
+    bw : float
+        Bandwidth of the interpolating kernel (in rad/s). Must be at
+        least the signal bandwidth and at most `pi/dt`.
+    n : int
+        If specified, the signal and its integrals are evaluated using
+        only the `n` samples on either side of the times at which they
+        are evaluated.
+
+    Methods
+    -------
+    integral(t0, t)
+        Integral of the signal over `[t0, t]`.
+
+    """
+
+    def __init__(self, u, dt, bw, n=None):
+        if bw > np.pi/dt:
+            raise ValueError('bandwidth may not exceed pi/dt')
+        self.u = np.asarray(u, np.float)
+        self.dt = dt
+        self.bw = bw
+        self.n = n
+        self.T = len(self.u)*dt
+
+    def _samples(self, t0, t):
+        """Return the sample times and samples used to evaluate the
+        signal over the interval `[t0, t]`."""
+
+        if self.n is None:
+            k = np.arange(len(self.u))
+        else:
+            k = np.arange(max(int(np.floor(t0/self.dt))-self.n, 0),
+                          min(int(np.ceil(t/self.dt))+self.n+1, len(self.u)))
+        return k*self.dt, self.u[k]
+
+    def __call__(self, t):
+        tk, uk = self._samples(t, t)
+        return np.dot(uk, (self.bw*self.dt/np.pi)*np.sinc(self.bw*(t-tk)/np.pi))
+
+    def integral(self, t0, t):
+        """Integrate the signal over the interval `[t0, t]`."""
+
+        tk, uk = self._samples(t0, t)
+        si = lambda x: scipy.special.sici(self.bw*x)[0]
+        return np.dot(uk, (self.dt/np.pi)*(si(t-tk)-si(t0-tk)))
+
+    def __repr__(self):
+        return 'SincSignal(N=%i, dt=%r, bw=%r)' % (len(self.u), self.dt,
+                                                   self.bw)
+
+def _find_crossing(f, df, t0, h, t_end, tol):
+    """
+    Find the earliest time after `t0` at which the increasing function
+    `f` with derivative `df` crosses 0.
+
+    The crossing is bracketed by repeatedly doubling the step `h` and
+    then found by Newton's method, falling back on bisection whenever a
+    Newton step leaves the bracket. Returns None if `f` does not cross 0
+    before `t_end`.
+    """
+
+    # Bracket the crossing:
+    lo = t0
+    hi = min(t0+h, t_end)
+    while f(hi) < 0:
+        if hi >= t_end:
+            return None
+        lo = hi
+        h *= 2
+        hi = min(t0+h, t_end)
+
+    # Refine the crossing:
+    t = hi
+    for i in xrange(__max_iter__):
+        ft = f(t)
+        if ft < 0:
+            lo = t
+        else:
+            hi = t
+        dft = df(t)
+        if dft > 0:
+            t_new = t-ft/dft
+        else:
+            t_new = lo
+        if not lo < t_new < hi:
+            t_new = (lo+hi)/2.0
+        if abs(t_new-t) <= tol or hi-lo <= tol:
+            return t_new
+        t = t_new
+    return t
+
+def iaf_encode(u, dur, b, d, R=np.inf, C=1.0, y=0.0, tol=1e-12,
+               spike_train=False):
+    """
+    Event-driven IAF time encoding machine.
+
+    Encode an analytically specified signal with an Integrate-and-Fire
+    neuron.
+
+    Parameters
+    ----------
+    u : TrigPolySignal or SincSignal
+        Signal to encode. Only trigonometric polynomials may be encoded
+        with leaky neurons.
+    dur : float
+        Duration of the signal to encode (in s). If None, the period of
+        a trigonometric polynomial or the duration of the samples of a
+        band-limited signal is used.
+    b : float
+        Encoder bias.
+    d : float
+        Encoder threshold.
+    R : float
+        Neuron resistance.
+    C : float
+        Neuron capacitance.
+    y : float
+        Initial value of integrator.
+    tol : float
+        Tolerance of the computed spike times (in s).
+    spike_train : bool
+        If set, the encoded signal is returned as a `SpikeTrain` that
+        contains the computed spike times rather than as an array of
+        interspike intervals.
+
+    Returns
+    -------
+    s : ndarray of floats or SpikeTrain
+        Returns the signal encoded as an array of time intervals between
+        spikes.
+
+    Notes
+    -----
+    Between spikes, the integrator must increase, i.e., `b` must exceed
+    the maximum magnitude of `u` if the neuron is ideal, and `R*(b-max(|u|))`
+    must exceed `d` if the neuron is leaky. These are the conditions
+    under which the encoded signal can be recovered.
+    """
+
+    if dur is None:
+        dur = u.T
+    if b <= 0:
+        raise ValueError('bias must be positive')
+    if not np.isinf(R) and not hasattr(u, 'leaky_integral'):
+        raise ValueError('leaky integral of signal cannot be computed '
+                         'in closed form')
+
+    ts = []
+    t0 = 0.0
+    while True:
+        if np.isinf(R):
+            f = lambda t: y+(b*(t-t0)+u.integral(t0, t))/C-d
+            df = lambda t: (b+u(t))/C
+        else:
+            RC = R*C
+            g = lambda t: y*np.exp(-(t-t0)/RC)+ \
+                R*b*(1-np.exp(-(t-t0)/RC))+u.leaky_integral(t0, t, RC)/C
+            f = lambda t: g(t)-d
+            df = lambda t: (b+u(t))/C-g(t)/RC
+        t = _find_crossing(f, df, t0, (d-y)*C/b, dur, tol)
+        if t is None:
+            break
+        ts.append(t)
+
+        # Reset the integrator:
+        t0 = t
+        y = 0.0
+    if spike_train:
+        return SpikeTrain(ts)
+    return np.diff(ts, prepend=0.0)
+
+def asdm_encode(u, dur, b, d, k=1.0, y=0.0, sgn=1, tol=1e-12,
+                spike_train=False):
+    """
+    Event-driven ASDM time encoding machine.
+
+    Encode an analytically specified signal with an Asynchronous
+    Sigma-Delta Modulator.
+
+    Parameters
+    ----------
+    u : TrigPolySignal or SincSignal
+        Signal to encode.
+    dur : float
+        Duration of the signal to encode (in s). If None, the period of
+        a trigonometric polynomial or the duration of the samples of a
+        band-limited signal is used.
+    b : float
+        Encoder bias.
+    d : float
+        Encoder threshold.
+    k : float
+        Encoder integration constant.
+    y : float
+        Initial value of integrator.
+    sgn : {+1, -1}
+        Sign of integrator.
+    tol : float
+        Tolerance of the computed spike times (in s).
+    spike_train : bool
+        If set, the encoded signal is returned as a `SpikeTrain` that
+        contains the computed spike times rather than as an array of
+        interspike intervals.
+
+    Returns
+    -------
+    s : ndarray of floats or SpikeTrain
+        Returns the signal encoded as an array of time intervals between
+        spikes.
+
+    Notes
+    -----
+    The bias `b` must exceed the maximum magnitude of `u` so that the
+    integrator changes monotonically between spikes.
+    """
+
+    if dur is None:
+        dur = u.T
+    if b <= 0:
+        raise ValueError('bias must be positive')
+
+    ts = []
+    t0 = 0.0
+    while True:
+        f = lambda t: sgn*(y+(sgn*b*(t-t0)+u.integral(t0, t))/k)-d
+        df = lambda t: (b+sgn*u(t))/k
+        t = _find_crossing(f, df, t0, (d-sgn*y)*k/b, dur, tol)
+        if t is None:
+            break
+        ts.append(t)
+
+        # Reverse the direction of the integrator:
+        t0 = t
+        y = d*sgn
+        sgn = -sgn
+    if spike_train:
+        return SpikeTrain(ts)
+    return np.diff(ts, prepend=0.0)
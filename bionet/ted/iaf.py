@@ -42,6 +42,13 @@ import scipy.special
 import bionet.utils.numpy_extras as ne
 import bionet.utils.scipy_extras as se
 from bionet.ted.vtdm import iaf_decode_vander
+from bionet.ted.synthesis import sinc_synth
+import bionet.ted.solvers as solvers
+from bionet.ted.operators import GOperator
+from bionet.ted.parallel import assemble_blocks
+from bionet.ted.spikes import SpikeEnsemble, SpikeTrain, spike_intervals, \
+     spike_midpoints, spike_times
+from bionet.utils.signal_extras import Upsampler
 
 __all__ += ['iaf_decode_vander']
 
@@ -94,8 +101,101 @@ def iaf_recoverable(u, bw, b, d, R, C):
     else:
         return True
 
+def _iaf_encode_engine(du, dt, d, y, interval, alpha=None):
+    """
+    Find the spikes generated by an IAF neuron driven by the specified
+    integrator increments.
+
+    Rather than updating the integrator one sample at a time, the
+    trajectory between spikes is computed in bulk (with a cumulative
+    sum when the neuron is ideal and with a first-order recursive
+    filter when it is leaky) over chunks of the input whose length is
+    adapted to the observed interspike intervals. The results are
+    identical to those obtained by iterating `y = alpha*y+du[i]` (or
+    `y = y+du[i]` when `alpha` is None) and subtracting `d` from `y`
+    whenever it reaches `d`.
+
+    Parameters
+    ----------
+    du : ndarray of floats
+        Integrator increments.
+    dt : float
+        Time step (in s).
+    d : float
+        Encoder threshold.
+    y : float
+        Initial value of integrator.
+    interval : float
+        Time since last spike (in s).
+    alpha : float
+        Decay factor applied to the integrator at every step; None
+        if the neuron is ideal.
+
+    Returns
+    -------
+    s : ndarray of floats
+        Interspike intervals.
+    y : float
+        Final value of integrator.
+    interval : float
+        Time since last spike (in s).
+    """
+
+    N = len(du)
+    if N == 0:
+        return np.array((), np.float), y, interval
+
+    # The interval between two successive spikes is the result of
+    # repeatedly adding dt to 0; these sums are precomputed so that they
+    # exhibit the same roundoff as the sequential additions:
+    ticks = np.cumsum(np.repeat(np.float(dt), N))
+
+    s = []
+    start = 0   # index of first step after the last spike
+    i = 0       # index of next increment to integrate
+    L = 64      # length of chunk to search for the next crossing
+    while i < N:
+        j = min(i+L, N)
+        if alpha is None:
+            x = du[i:j].copy()
+            x[0] += y
+            yc = np.cumsum(x)
+        else:
+            yc = scipy.signal.lfilter([1.0], [1.0, -alpha], du[i:j],
+                                      zi=[alpha*y])[0]
+        k = np.argmax(yc >= d)
+        if yc[k] >= d:
+            n = i+k+1-start
+            if start == 0:
+                s.append(np.cumsum(np.hstack((interval,
+                                              np.repeat(dt, n))))[-1])
+            else:
+                s.append(ticks[n-1])
+            y = yc[k]-d
+            i = start = i+k+1
+
+            # Assume that the next interspike interval will be
+            # similar in length to the current one:
+            L = n+n/4+8
+        else:
+            y = yc[-1]
+            i = j
+            L *= 2
+
+    # Update the time since the last spike:
+    n = N-start
+    if start == 0:
+        interval = np.cumsum(np.hstack((interval, np.repeat(dt, n))))[-1]
+    elif n > 0:
+        interval = ticks[n-1]
+    else:
+        interval = 0.0
+
+    return np.array(s), y, interval
+
 def iaf_encode(u, dt, b, d, R=np.inf, C=1.0, dte=0, y=0.0, interval=0.0,
-               quad_method='trapz', full_output=False):
+               quad_method='trapz', full_output=False, spike_train=False,
+               flush=True):
     """
     IAF time encoding machine.
 
@@ -116,9 +216,11 @@ def iaf_encode(u, dt, b, d, R=np.inf, C=1.0, dte=0, y=0.0, interval=0.0,
         Neuron resistance.
     C : float
         Neuron capacitance.
-    dte : float
+    dte : float or Upsampler
         Sampling resolution assumed by the encoder (s).
-        This may not exceed `dt`.
+        This may not exceed `dt`. If finer than `dt`, the signal is
+        interpolated block by block with an `Upsampler`, which is
+        returned in place of `dte` when `full_output` is set.
     y : float
         Initial value of integrator.
     interval : float
@@ -132,10 +234,21 @@ def iaf_encode(u, dt, b, d, R=np.inf, C=1.0, dte=0, y=0.0, interval=0.0,
         by the given parameters (with updated values for `y` and `interval`).
         This is useful when the function is called repeatedly to
         encode a long signal.
+    spike_train : bool
+        If set, the encoded signal is returned as a `SpikeTrain`
+        rather than as an array of interspike intervals. This may
+        not be combined with `full_output`.
+    flush : bool
+        If set, all of the interpolated samples are encoded before
+        returning. Otherwise, those associated with the last few
+        entries in `u` are retained by the `Upsampler` and encoded
+        during the next call; this is only useful when the function
+        is called repeatedly with `full_output` set to encode a long
+        signal in blocks.
 
     Returns
     -------
-    s : ndarray of floats
+    s : ndarray of floats or SpikeTrain
         If `full_output` == False, returns the signal encoded as an
         array of time intervals between spikes.
     [s, dt, b, d, R, C, dte, y, interval, quad_method, full_output] : list
@@ -146,8 +259,53 @@ def iaf_encode(u, dt, b, d, R=np.inf, C=1.0, dte=0, y=0.0, interval=0.0,
     -----
     When trapezoidal integration is used, the value of the integral
     will not be computed for the very last entry in `u`.
+    When the signal is interpolated and `flush` is not set, the
+    interpolated samples associated with the last few entries in `u`
+    are encoded during the next call; encoding an empty block flushes
+    them.
     """
 
+    if spike_train:
+        if full_output:
+            raise ValueError('spike trains cannot be returned with '
+                             'full output')
+        return SpikeTrain.from_intervals(iaf_encode(u, dt, b, d, R, C, dte,
+                                                    y, interval,
+                                                    quad_method,
+                                                    flush=flush))
+
+    # Check whether the encoding resolution is finer than that of the
+    # original sampled signal:
+    if not isinstance(dte, Upsampler):
+        if dte > dt:
+            raise ValueError('encoding time resolution must not exceeed original signal resolution')
+        if dte < 0:
+            raise ValueError('encoding time resolution must be nonnegative')
+    if isinstance(dte, Upsampler) or (dte != 0 and dte != dt):
+
+        # Interpolate the signal one block at a time and encode each
+        # interpolated block. The interpolator retains the samples
+        # needed to interpolate across block boundaries and is
+        # returned in place of dte so that subsequent calls continue
+        # the interpolation:
+        if isinstance(dte, Upsampler):
+            upsampler = dte
+        else:
+            upsampler = Upsampler(int(round(dt/dte)))
+        s = []
+        for u_block in upsampler.blocks(u,
+                flush=flush or len(u) == 0,
+                overlap=np.isinf(R) and quad_method == 'trapz'):
+            temp = iaf_encode(u_block, dt/upsampler.n, b, d, R, C, 0, y,
+                              interval, quad_method, True)
+            s.extend(temp[0])
+            y, interval = temp[7:9]
+        if full_output:
+            return [np.array(s), dt, b, d, R, C, upsampler, y, interval, \
+                    quad_method, full_output]
+        else:
+            return np.array(s)
+
     Nu = len(u)
     if Nu == 0:
         if full_output:
@@ -156,51 +314,27 @@ def iaf_encode(u, dt, b, d, R=np.inf, C=1.0, dte=0, y=0.0, interval=0.0,
         else:
             return np.array((),np.float)
 
-    # Check whether the encoding resolution is finer than that of the
-    # original sampled signal:
-    if dte > dt:
-        raise ValueError('encoding time resolution must not exceeed original signal resolution')
-    if dte < 0:
-        raise ValueError('encoding time resolution must be nonnegative')
-    if dte != 0 and dte != dt:
-
-        # Resample signal and adjust signal length accordingly:
-        M = int(dt/dte)
-        u = scipy.signal.resample(u, len(u)*M)
-        Nu *= M
-        dt = dte
-
-    # Use a list rather than an array to save the spike intervals
-    # because the number of spikes is not fixed:
-    s = []
-
-    # Choose integration method:
+    # Compute the increments added to the integrator at each step. These
+    # are evaluated using the same expressions (and hence the same
+    # floating point roundoff) as a sample-by-sample update:
+    u = np.asarray(u, np.float)
     if np.isinf(R):
         if quad_method == 'rect':
-            compute_y = lambda y, i: y + dt*(b+u[i])/C
-            last = Nu
+            du = dt*(b+u)/C
         elif quad_method == 'trapz':
-            compute_y = lambda y, i: y + dt*(b+(u[i]+u[i+1])/2.0)/C
-            last = Nu-1
+            du = dt*(b+(u[:-1]+u[1:])/2.0)/C
         else:
             raise ValueError('unrecognized quadrature method')
+        alpha = None
     else:
 
         # When the neuron is leaky, use the exponential Euler method to perform
         # the encoding:
         RC = R*C
-        compute_y = lambda y, i: y*np.exp(-dt/RC)+R*(1-np.exp(-dt/RC))*(b+u[i])
-        last = Nu
+        alpha = np.exp(-dt/RC)
+        du = R*(1-np.exp(-dt/RC))*(b+u)
 
-    # The interval between spikes is saved between iterations rather than the
-    # absolute time so as to avoid overflow problems for very long signals:
-    for i in xrange(last):
-        y = compute_y(y, i)
-        interval += dt
-        if y >= d:
-            s.append(interval)
-            interval = 0.0
-            y -= d
+    s, y, interval = _iaf_encode_engine(du, dt, d, y, interval, alpha)
 
     if full_output:
         return [np.array(s), dt, b, d, R, C, dte, y, interval, \
@@ -208,8 +342,232 @@ def iaf_encode(u, dt, b, d, R=np.inf, C=1.0, dte=0, y=0.0, interval=0.0,
     else:
         return np.array(s)
 
+class _SpikeBuffer(object):
+    """
+    Array-backed storage for the spikes emitted by an ensemble of neurons.
+
+    Spikes are appended as pairs of neuron indices and interspike
+    intervals to preallocated arrays whose capacity is doubled when
+    necessary; the intervals are grouped by neuron (in CSR fashion)
+    only when the stored data is retrieved.
+
+    Parameters
+    ----------
+    N : int
+        Number of neurons.
+    n : int
+        Initial capacity.
+    """
+
+    def __init__(self, N, n=1024):
+        self.N = N
+        self.count = 0
+        self.idx = np.empty(n, np.int)
+        self.s = np.empty(n, np.float)
+
+    def append(self, idx, s):
+        """Save the intervals `s` emitted by the neurons `idx`."""
+
+        n = self.count+len(idx)
+        if n > len(self.s):
+            cap = max(2*len(self.s), n)
+            idx_new = np.empty(cap, np.int)
+            idx_new[:self.count] = self.idx[:self.count]
+            s_new = np.empty(cap, np.float)
+            s_new[:self.count] = self.s[:self.count]
+            self.idx, self.s = idx_new, s_new
+        self.idx[self.count:n] = idx
+        self.s[self.count:n] = s
+        self.count = n
+
+    def offsets(self):
+        """Return the stored intervals sorted by neuron and the
+        offsets of each neuron's intervals."""
+
+        # A stable sort preserves the temporal order of each
+        # neuron's spikes:
+        order = np.argsort(self.idx[:self.count], kind='mergesort')
+        offsets = np.hstack((0, np.cumsum(np.bincount(self.idx[:self.count],
+                                                      minlength=self.N))))
+        return self.s[:self.count][order], offsets
+
+    def tolist(self):
+        """Return the stored intervals as a list of arrays."""
+
+        s, offsets = self.offsets()
+        return [s[offsets[i]:offsets[i+1]] for i in xrange(self.N)]
+
+def _iaf_encode_pop_engine(compute_du, Nt, dt, d, y, interval, alpha=None,
+                           block_size=None):
+    """
+    Find the spikes generated by an ensemble of IAF neurons.
+
+    The integrator trajectories of all of the neurons are computed for
+    blocks of time samples at once. Within each block, the trajectory
+    of every neuron that emitted a spike is recomputed from the step
+    following the spike until no more spikes occur in the block; the
+    results are identical to those obtained by updating the
+    integrators one step at a time.
+
+    Parameters
+    ----------
+    compute_du : function
+        Function that returns the integrator increments of all of the
+        neurons for steps `i0` through `i1-1` as an array of shape
+        `(N, i1-i0)` when called as `compute_du(i0, i1)`.
+    Nt : int
+        Number of steps.
+    dt : float
+        Time step (in s).
+    d : ndarray of floats
+        Encoder thresholds.
+    y : ndarray of floats
+        Initial values of integrators.
+    interval : ndarray of floats
+        Times since last spike (in s).
+    alpha : ndarray of floats
+        Decay factors applied to the integrators at every step; None
+        if the neurons are ideal.
+    block_size : int
+        Number of steps to process at once. If not specified, the
+        block size is adjusted so that each neuron emits about one
+        spike per block.
+
+    Returns
+    -------
+    s_list : list of ndarrays of floats
+        Interspike intervals.
+    y : ndarray of floats
+        Final values of integrators.
+    interval : ndarray of floats
+        Times since last spike (in s).
+    """
+
+    N = len(d)
+    y = np.array(y, np.float)
+    interval0 = np.array(interval, np.float)
+    if Nt == 0:
+        return [np.array((), np.float) for i in xrange(N)], y, interval0
+
+    # Limit the size of the temporary arrays:
+    max_size = int(max(16, 2**22/N))
+    if block_size is None:
+        L = min(256, max_size)
+    else:
+        L = block_size
+
+    # The intervals between spikes are the results of repeatedly
+    # adding dt to 0; these sums are precomputed so that they exhibit
+    # the same roundoff as sequential additions. The first interval
+    # emitted by each neuron is computed separately because it
+    # includes the time since the last spike specified by the caller:
+    ticks = np.cumsum(np.repeat(np.float(dt), Nt))
+    carry = lambda i, n: np.cumsum(np.hstack((interval0[i],
+                                              np.repeat(dt, n))))[-1]
+
+    # Index of the step following the last spike emitted by each
+    # neuron and whether the time since that spike started at 0:
+    start = np.zeros(N, np.int)
+    reset = interval0 == 0.0
+
+    buf = _SpikeBuffer(N)
+    i0 = 0
+    while i0 < Nt:
+        i1 = min(i0+L, Nt)
+        du = compute_du(i0, i1)
+
+        # Neurons whose trajectories must be computed, the index of
+        # the first step of each trajectory within the block, and the
+        # initial integrator values:
+        rows = np.arange(N)
+        p = np.zeros(N, np.int)
+        y0 = y.copy()
+        passes = 0
+        while len(rows):
+            passes += 1
+            r = np.arange(len(rows))
+
+            # Only the steps following the earliest trajectory start
+            # need to be processed. The increments preceding the start
+            # of each trajectory are zeroed out and the initial value
+            # is folded into the first increment so that the running
+            # sums reproduce the sequential updates exactly:
+            pmin = p.min()
+            q = p-pmin
+            if passes == 1:
+
+                # The first pass starts at the beginning of the block
+                # for all neurons; since later passes only access the
+                # increments after the first step, the increments can
+                # be modified in place:
+                x = du
+            else:
+                x = du[rows, pmin:]
+                if q.any():
+                    x[np.arange(x.shape[1]) < q[:, np.newaxis]] = 0.0
+            if alpha is None:
+                x[r, q] += y0
+                yc = np.cumsum(x, axis=1)
+            else:
+                a = alpha[rows]
+                x[r, q] += a*y0
+                yc = np.empty_like(x)
+                for a_val in np.unique(a):
+                    g = a == a_val
+                    yc[g] = scipy.signal.lfilter([1.0], [1.0, -a_val],
+                                                 x[g], axis=1)
+
+            # Find the first threshold crossing in each trajectory;
+            # since the zeroed out steps cannot exceed the (positive)
+            # thresholds, they do not need to be masked:
+            hit = yc >= d[rows][:, np.newaxis]
+            k = np.argmax(hit, axis=1)
+            spiked = hit[r, k]
+
+            # Neurons that do not spike again in the block are done:
+            done = ~spiked
+            y[rows[done]] = yc[done, -1]
+
+            # Save the spikes and restart the trajectories of the
+            # neurons that emitted them:
+            r, k = r[spiked], k[spiked]
+            idx = rows[r]
+            n = i0+pmin+k+1-start[idx]
+            s = np.empty(len(idx), np.float)
+            s[reset[idx]] = ticks[n[reset[idx]]-1]
+            for j in np.where(~reset[idx])[0]:
+                s[j] = carry(idx[j], n[j])
+            buf.append(idx, s)
+            start[idx] = i0+pmin+k+1
+            reset[idx] = True
+
+            rows, p, y0 = idx, pmin+k+1, yc[r, k]-d[idx]
+            fin = p >= i1-i0
+            y[rows[fin]] = y0[fin]
+            rows, p, y0 = rows[~fin], p[~fin], y0[~fin]
+
+        # Adjust the block size so that each neuron emits about one
+        # spike per block:
+        i0 = i1
+        if block_size is None:
+            if passes > 2:
+                L = max(16, L/2)
+            elif passes < 2:
+                L = min(2*L, max_size)
+
+    # Compute the times since the last spikes:
+    n = Nt-start
+    interval = np.zeros(N, np.float)
+    i = reset & (n > 0)
+    interval[i] = ticks[n[i]-1]
+    for j in np.where(~reset)[0]:
+        interval[j] = carry(j, n[j])
+
+    return buf.tolist(), y, interval
+
 def iaf_encode_pop(u_list, dt, b_list, d_list, R_list, C_list, dte=0, y=None, interval=None,
-               quad_method='trapz', full_output=False):
+               quad_method='trapz', full_output=False, block_size=None,
+               spike_train=False, flush=True):
     """
     Multi-input multi-output IAF time encoding machine.
 
@@ -230,9 +588,11 @@ def iaf_encode_pop(u_list, dt, b_list, d_list, R_list, C_list, dte=0, y=None, in
         List of encoder resistances.
     C_list : list of floats
         List of encoder capacitances.
-    dte : float
+    dte : float or Upsampler
         Sampling resolution assumed by the encoders.
-        This may not exceed `dt`.
+        This may not exceed `dt`. If finer than `dt`, the signals are
+        interpolated block by block with an `Upsampler`, which is
+        returned in place of `dte` when `full_output` is set.
     y : ndarray of floats
         Initial values of integrators.
     interval : ndarray of float
@@ -246,12 +606,28 @@ def iaf_encode_pop(u_list, dt, b_list, d_list, R_list, C_list, dte=0, y=None, in
         by the given parameters (with updated values for `y` and `interval`).
         This is useful when the function is called repeatedly to
         encode a long signal.
+    block_size : int
+        Number of time samples processed for all of the neurons at
+        once. If not specified, the number of samples is adjusted so
+        that each neuron emits about one spike per block while
+        limiting the temporary arrays to 2**22 (about 4*10^6) entries.
+    spike_train : bool
+        If set, the encoded signals are returned as a `SpikeEnsemble`
+        rather than as a list of arrays of interspike intervals. This
+        may not be combined with `full_output`.
+    flush : bool
+        If set, all of the interpolated samples are encoded before
+        returning. Otherwise, those associated with the last few
+        entries in the arrays in `u_list` are retained by the
+        `Upsampler` and encoded during the next call; this is only
+        useful when the function is called repeatedly with
+        `full_output` set to encode long signals in blocks.
 
     Returns
     -------
-    s_list : ndarray of floats
-        If `full_output` == False, returns the signal encoded as an
-        array of time intervals between spikes.
+    s_list : list of ndarrays of floats or SpikeEnsemble
+        If `full_output` == False, returns the signals encoded as
+        arrays of time intervals between spikes.
     [s_list, dt, b_list, d_list, R_list, C_list, dte, y, interval,
     quad_method, full_output] : list
         If `full_output` == True, returns the encoded signal
@@ -262,93 +638,229 @@ def iaf_encode_pop(u_list, dt, b_list, d_list, R_list, C_list, dte=0, y=None, in
     When trapezoidal integration is used, the value of the integral
     will not be computed for the very last entry in the arrays in
     `u_list`.
+    When the signals are interpolated and `flush` is not set, the
+    interpolated samples associated with the last few entries in the
+    arrays in `u_list` are encoded during the next call; encoding empty
+    arrays flushes them.
     Using this function to encode multiple signals is faster than than
     repeatedly invoking `iaf_encode()` when the number of signals is
-    sufficiently high.
+    sufficiently high. The spike intervals are identical to those
+    obtained by encoding each signal separately with `iaf_encode()`.
     """
 
+    if spike_train:
+        if full_output:
+            raise ValueError('spike trains cannot be returned with '
+                             'full output')
+        return SpikeEnsemble.from_intervals(
+            iaf_encode_pop(u_list, dt, b_list, d_list, R_list, C_list, dte,
+                           y, interval, quad_method, False, block_size,
+                           flush=flush))
+
     u_array = np.array(u_list)
+
+    # Check whether the encoding resolution is finer than that of the
+    # original sampled signal:
+    if not isinstance(dte, Upsampler):
+        if dte > dt:
+            raise ValueError('encoding time resolution must not exceeed original signal resolution')
+        if dte < 0:
+            raise ValueError('encoding time resolution must be nonnegative')
+    if isinstance(dte, Upsampler) or (dte != 0 and dte != dt):
+
+        # Interpolate the signal one block at a time and encode each
+        # interpolated block. The interpolator retains the samples
+        # needed to interpolate across block boundaries and is
+        # returned in place of dte so that subsequent calls continue
+        # the interpolation:
+        if isinstance(dte, Upsampler):
+            upsampler = dte
+        else:
+            upsampler = Upsampler(int(round(dt/dte)))
+        s_list = [[] for i in xrange(u_array.shape[0])]
+        for u_block in upsampler.blocks(u_array,
+                flush=flush or u_array.shape[-1] == 0,
+                overlap=np.all(np.asarray(R_list) == np.inf) and \
+                        quad_method == 'trapz'):
+            temp = iaf_encode_pop(u_block, dt/upsampler.n, b_list, d_list,
+                                  R_list, C_list, 0, y, interval,
+                                  quad_method, True, block_size)
+            for i in xrange(len(s_list)):
+                s_list[i].extend(temp[0][i])
+            y, interval = temp[7:9]
+        s_list = map(np.array, s_list)
+        if full_output:
+            return [s_list, dt, b_list, d_list, R_list, C_list, upsampler, y,
+                    interval, quad_method, full_output]
+        else:
+            return s_list
+
     Nu = u_array.shape[1]
     if Nu == 0:
-        s_list = [np.array((), np.float) for i in u_array.shape[0]]
+        s_list = [np.array((), np.float) for i in xrange(u_array.shape[0])]
         if full_output:
             return s_list, dt, b_list, d_list, R_list, C_list, dte, y, interval, \
                    quad_method, full_output
         else:
             return s_list
 
-    # Check whether the encoding resolution is finer than that of the
-    # original sampled signal:
-    if dte > dt:
-        raise ValueError('encoding time resolution must not exceeed original signal resolution')
-    if dte < 0:
-        raise ValueError('encoding time resolution must be nonnegative')
-    if dte != 0 and dte != dt:
-        M = int(dt/dte)
-        u_array = np.array([scipy.signal.resample(u, len(u)*M) for u in u_list])
-        Nu *= M
-        dt = dte
-
-    # Use a list rather than an array to save the spike intervals
-    # because the number of spikes is not fixed:
-    s_list = [[] for i in xrange(u_array.shape[0])]
-
     # For the sake of computational efficiency, all of the input
     # signals must be encoded using either ideal or nonideal neurons
     # exclusively:
-    b_array = np.asarray(b_list)
-    d_array = np.asarray(d_list)
-    R_array = np.asarray(R_list)
-    C_array = np.asarray(C_list)
+    b_array = np.asarray(b_list, np.float)
+    d_array = np.asarray(d_list, np.float)
+    R_array = np.asarray(R_list, np.float)
+    C_array = np.asarray(C_list, np.float)
     if not np.all(R_array == np.inf) and not np.all(R_array != np.inf):
         raise ValueError('all neurons must be either exclusively ' +
                          'ideal or exclusively leaky')
 
-    # Choose integration method:
+    # Choose integration method; the integrator increments are
+    # computed one block of samples at a time to limit memory usage:
+    b_col = b_array[:, np.newaxis]
     if np.all(R_array == np.inf):
+        C_col = C_array[:, np.newaxis]
         if quad_method == 'rect':
-            compute_y = lambda y, i: y + dt*(b_array+u_array[:, i])/C_array
+            compute_du = lambda i0, i1: dt*(b_col+u_array[:, i0:i1])/C_col
             last = Nu
         elif quad_method == 'trapz':
-            compute_y = lambda y, i: y + dt*(b_array+ \
-                                             (u_array[:, i]+u_array[:, i+1])/2.0)/C_array
+            compute_du = lambda i0, i1: \
+                dt*(b_col+(u_array[:, i0:i1]+u_array[:, i0+1:i1+1])/2.0)/C_col
             last = Nu-1
         else:
             raise ValueError('unrecognized quadrature method')
+        alpha = None
     else:
 
         # When the neuron is leaky, use the exponential Euler method to perform
         # the encoding:
         RC_array = R_array*C_array
-        compute_y = lambda y, i: \
-            y*np.exp(-dt/RC_array)+R_array*(1-np.exp(-dt/RC_array))*(b_array+u_array[:, i])
+        alpha = np.exp(-dt/RC_array)
+        scale_col = (R_array*(1-np.exp(-dt/RC_array)))[:, np.newaxis]
+        compute_du = lambda i0, i1: scale_col*(b_col+u_array[:, i0:i1])
         last = Nu
 
     # Initialize integrator variables if necessary:
-    if y == None:
+    if y is None:
         y = np.zeros(u_array.shape[0], np.float)
-    if interval == None:
+    if interval is None:
         interval = np.zeros(u_array.shape[0], np.float)
 
-    # The interval between spikes is saved between iterations rather than the
-    # absolute time so as to avoid overflow problems for very long signals:
-    for i in xrange(last):
-        y = compute_y(y, i)
-        interval += dt
-        exceeded = np.where(y >= d_array)[0]
-        for i in exceeded:
-            s_list[i].append(interval[i])
-        y[exceeded] -= d_array[exceeded]
-        interval[exceeded] = 0.0
-
-    s_list = [np.array(s) for s in s_list]
+    s_list, y, interval = \
+            _iaf_encode_pop_engine(compute_du, last, dt, d_array, y,
+                                   interval, alpha, block_size)
+
     if full_output:
         return [s_list, dt, b_list, d_list, R_list, C_list, dte, y, interval, \
                 quad_method, full_output]
     else:
         return s_list
 
-def iaf_decode(s, dur, dt, bw, b, d, R=np.inf, C=1.0):
+def _iaf_G_leaky(ts, tsh, bw, RC, tile_size=None):
+    """
+    Compute the reconstruction matrix of a leaky IAF time decoding machine.
+
+    Evaluate the entries `G[i, j]` of the matrix that must be inverted to
+    obtain the reconstruction coefficients of a leaky IAF neuron whose
+    spikes occur at the times `ts`, i.e., the integral of
+    `exp((t-ts[i+1])/RC)` times the sinc kernel centered at `tsh[j]`
+    over the interval `[ts[i], ts[i+1]]`. The exponential integrals
+    for all of the entries in a tile of columns are computed in one
+    call to `ei()`.
+
+    Parameters
+    ----------
+    ts : ndarray of floats
+        Spike times (in s).
+    tsh : ndarray of floats
+        Centers of the sinc kernels (in s).
+    bw : float
+        Signal bandwidth (in rad/s).
+    RC : float
+        Neuron time constant (in s).
+    tile_size : int
+        Number of columns of `G` to compute at once. If not specified,
+        the number of columns is chosen to limit the temporary arrays
+        to 2**20 (about 10^6) entries.
+
+    Returns
+    -------
+    G : ndarray of complex
+        Matrix of shape `(len(ts)-1, len(tsh))`.
+    """
+
+    ts = np.asarray(ts)
+    tsh = np.asarray(tsh)
+    Ns = len(ts)
+    Nsh = len(tsh)
+    if tile_size is None:
+        tile_size = max(1, 2**20/max(Ns, 1))
+
+    am = (1-1j*RC*bw)/RC
+    ap = (1+1j*RC*bw)/RC
+
+    # Terms that only contribute to the entries whose sinc kernel is
+    # centered within the integration interval:
+    K = np.log(-1-1j*RC*bw)+np.log(1-1j*RC*bw)- \
+        np.log(-1+1j*RC*bw)-np.log(1+1j*RC*bw)+ \
+        np.log(-1j/(-1j+RC*bw))-np.log(1j/(-1j+RC*bw))+ \
+        np.log(-1j/(1j+RC*bw))-np.log(1j/(1j+RC*bw))
+
+    G = np.empty((Ns-1, Nsh), np.complex)
+    for j0 in xrange(0, Nsh, tile_size):
+        j1 = min(j0+tile_size, Nsh)
+
+        # Since the upper limit of each interval is the lower limit of
+        # the next one, the exponential integrals only need to be
+        # evaluated once for each spike time:
+        x = (ts[:, np.newaxis]-tsh[np.newaxis, j0:j1]).ravel()
+        E = (se.ei(am*x)-se.ei(ap*x)).reshape(Ns, j1-j0)
+        inside = (x[:-(j1-j0)] < 0).reshape(Ns-1, j1-j0) & \
+                 (x[j1-j0:] > 0).reshape(Ns-1, j1-j0)
+        G[:, j0:j1] = (-1j/4)*np.exp((tsh[np.newaxis, j0:j1]-ts[1:, np.newaxis])/RC)* \
+                      (2*(E[:-1]-E[1:])+np.where(inside, K, 0))/np.pi
+    return G
+
+def _iaf_quanta(s, b, d, R, C):
+    """
+    Compute the quanta of an IAF time decoding machine.
+
+    Compute the integrals of the encoded signal over the intervals
+    between the spike times implied by the interspike intervals `s` of
+    an ideal (if `R` is infinite) or leaky IAF neuron.
+    """
+
+    s = np.asarray(s)
+    if np.isinf(R):
+        return C*d-b*s[1:]
+    else:
+        return C*(d+b*R*(np.exp(-s[1:]/(R*C))-1))
+
+def _iaf_G_block(ts, tsh, bw, RC):
+    """
+    Compute a block of the reconstruction matrix of an IAF time decoding
+    machine.
+
+    Evaluate the integrals of the sinc kernels centered at the times
+    `tsh` over the intervals between the spike times `ts` of an ideal
+    (if `RC` is infinite) or leaky IAF neuron.
+    """
+
+    if np.isinf(RC):
+        temp = scipy.special.sici(bw*(ts[:, np.newaxis]-tsh))[0]/np.pi
+        return temp[1:]-temp[:-1]
+    else:
+
+        # The entries of the block are functionally equivalent to
+        # (but considerably faster to compute than) the integration
+        # below:
+        #
+        # f = lambda t:np.sinc(bwpi*(t-tsh[k]))*bwpi*np.exp((ts[n+1]-t)/-RC)
+        # G_block[n, k] = scipy.integrate.quad(f, ts[n], ts[n+1])[0]
+        return _iaf_G_leaky(ts, tsh, bw, RC)
+
+def iaf_decode(s, dur, dt, bw, b, d, R=np.inf, C=1.0, solver='pinv',
+               dtype=np.float64):
     """
     IAF time decoding machine.
 
@@ -357,7 +869,7 @@ def iaf_decode(s, dur, dt, bw, b, d, R=np.inf, C=1.0):
 
     Parameters
     ----------
-    s : ndarray of floats
+    s : array_like of floats or SpikeTrain
         Encoded signal. The values represent the time between spikes (in s).
     dur : float
         Duration of signal (in s).
@@ -374,6 +886,19 @@ def iaf_decode(s, dur, dt, bw, b, d, R=np.inf, C=1.0):
         Neuron resistance.
     C : float
         Neuron capacitance.
+    solver : {'pinv', 'tsvd', 'cg', 'lsqr', 'minres'} or callable
+        Solver used to compute the reconstruction coefficients; see
+        `bionet.ted.solvers` for details.
+        If an iterative solver is specified by name and the neurons
+        are ideal, the reconstruction matrix is not formed explicitly.
+    dtype : {numpy.float64, numpy.float32}
+        Floating point type used to compute the reconstruction
+        coefficients and the recovered signal. The reconstruction
+        matrix of ideal neurons is real; that of leaky neurons is
+        complex with the same precision. Single precision halves the
+        memory occupied by the matrix, but the recovered signal's
+        accuracy is limited by the smaller singular value cutoff that
+        can be resolved.
 
     Returns
     -------
@@ -385,65 +910,42 @@ def iaf_decode(s, dur, dt, bw, b, d, R=np.inf, C=1.0):
     if Ns < 2:
         raise ValueError('s must contain at least 2 elements')
 
-    # Cast s to an ndarray to permit ndarray operations:
-    s = np.asarray(s)
-
-    # Compute the spike times:
-    ts = np.cumsum(s)
-
-    # Compute the midpoints between spike times:
-    tsh = (ts[0:-1]+ts[1:])/2
+    # Compute the spike times and the midpoints between them:
+    ts = spike_times(s)
+    tsh = spike_midpoints(s)
+    s = np.asarray(spike_intervals(s))
     Nsh = len(tsh)
 
-    t = np.arange(0, dur, dt)
-
     bwpi = bw/np.pi
     RC = R*C
 
-    # Compute G matrix and quanta:
-    G = np.empty((Nsh, Nsh), np.complex)
+    # Compute G matrix and quanta; since the entries of G are
+    # computed from the sine integral when the neuron is ideal, they
+    # are real and only need to be stored as complex numbers when the
+    # neuron is leaky:
     if np.isinf(R):
-        for j in xrange(Nsh):
-            temp = scipy.special.sici(bw*(ts-tsh[j]))[0]/np.pi
-            for i in xrange(Nsh):
-                G[i,j] = temp[i+1]-temp[i]
-        q = C*d-b*s[1:]
+        if solvers.is_iterative(solver):
+            G = GOperator(ts, tsh, bw)
+        else:
+            G = np.asarray(_iaf_G_block(ts, tsh, bw, RC), dtype)
     else:
-        for i in xrange(Nsh):
-            for j in xrange(Nsh):
-
-                # The code below is functionally equivalent to (but
-                # considerably faster than) the integration below:
-                #
-                # f = lambda t:np.sinc(bwpi*(t-tsh[j]))*bwpi*np.exp((ts[i+1]-t)/-RC)
-                # G[i,j] = scipy.integrate.quad(f, ts[i], ts[i+1])[0]
-                if ts[i] < tsh[j] and tsh[j] < ts[i+1]:
-                    G[i,j] = (-1j/4)*np.exp((tsh[j]-ts[i+1])/RC)* \
-                             (2*se.ei((1-1j*RC*bw)*(ts[i]-tsh[j])/RC)-
-                              2*se.ei((1-1j*RC*bw)*(ts[i+1]-tsh[j])/RC)-
-                              2*se.ei((1+1j*RC*bw)*(ts[i]-tsh[j])/RC)+
-                              2*se.ei((1+1j*RC*bw)*(ts[i+1]-tsh[j])/RC)+
-                              np.log(-1-1j*RC*bw)+np.log(1-1j*RC*bw)-
-                              np.log(-1+1j*RC*bw)-np.log(1+1j*RC*bw)+
-                              np.log(-1j/(-1j+RC*bw))-np.log(1j/(-1j+RC*bw))+
-                              np.log(-1j/(1j+RC*bw))-np.log(1j/(1j+RC*bw)))/np.pi
-                else:
-                    G[i,j] = (-1j/2)*np.exp((tsh[j]-ts[i+1])/RC)* \
-                             (se.ei((1-1j*RC*bw)*(ts[i]-tsh[j])/RC)-
-                              se.ei((1-1j*RC*bw)*(ts[i+1]-tsh[j])/RC)-
-                              se.ei((1+1j*RC*bw)*(ts[i]-tsh[j])/RC)+
-                              se.ei((1+1j*RC*bw)*(ts[i+1]-tsh[j])/RC))/np.pi
 
-        q = C*(d+b*R*(np.exp(-s[1:]/RC)-1))
+        # The entries of G are functionally equivalent to (but
+        # considerably faster to compute than) the integration below:
+        #
+        # f = lambda t:np.sinc(bwpi*(t-tsh[j]))*bwpi*np.exp((ts[i+1]-t)/-RC)
+        # G[i,j] = scipy.integrate.quad(f, ts[i], ts[i+1])[0]
+        G = np.asarray(_iaf_G_leaky(ts, tsh, bw, RC),
+                       np.result_type(dtype, np.complex64))
+    q = np.asarray(_iaf_quanta(s, b, d, R, C), dtype)
 
     # Compute the reconstruction coefficients:
-    c = np.dot(np.linalg.pinv(G, __pinv_rcond__), q)
+    c = solvers.solve(G, q, solver, __pinv_rcond__)
 
-    # Reconstruct signal by adding up the weighted sinc functions.
-    u_rec = np.zeros(len(t), np.complex)
-    for i in xrange(Nsh):
-        u_rec += np.sinc(bwpi*(t-tsh[i]))*bwpi*c[i]
-    return np.real(u_rec)
+    # Reconstruct signal by adding up the weighted sinc functions; since
+    # the sinc functions are real, only the real part of the
+    # coefficients contributes to the real part of the signal:
+    return np.asarray(sinc_synth(tsh, np.real(c), dur, dt, bw), dtype)
 
 def iaf_decode_fast(s, dur, dt, bw, M, b, d, R=np.inf, C=1.0):
     """
@@ -454,7 +956,7 @@ def iaf_decode_fast(s, dur, dt, bw, M, b, d, R=np.inf, C=1.0):
 
     Parameters
     ----------
-    s : array_like of floats
+    s : array_like of floats or SpikeTrain
         Encoded signal. The values represent the time between spikes (in s).
     dur : float
         Duration of signal (in s).
@@ -484,14 +986,10 @@ def iaf_decode_fast(s, dur, dt, bw, M, b, d, R=np.inf, C=1.0):
     if Ns < 2:
         raise ValueError('s must contain at least 2 elements')
 
-    # Cast s to an ndarray to permit ndarray operations:
-    s = np.asarray(s)
-
-    # Compute the spike times:
-    ts = np.cumsum(s)
-
-    # Compute the midpoints between spike times:
-    tsh = (ts[0:-1]+ts[1:])/2
+    # Compute the spike times and the midpoints between them:
+    ts = spike_times(s)
+    tsh = spike_midpoints(s)
+    s = np.asarray(spike_intervals(s))
     Nsh = len(tsh)
 
     # Convert M to a float in the event that an integer was specified:
@@ -501,10 +999,7 @@ def iaf_decode_fast(s, dur, dt, bw, M, b, d, R=np.inf, C=1.0):
     jbwM = 1j*bw/M
 
     # Compute quanta:
-    if np.isinf(R):
-        q = C*d-b*s[1:]
-    else:
-        q = C*(d+b*R*(np.exp(-s[1:]/RC)-1))
+    q = _iaf_quanta(s, b, d, R, C)
 
     # Compute approximation coefficients:
     a = bw/(np.pi*(2*M+1))
@@ -520,7 +1015,9 @@ def iaf_decode_fast(s, dur, dt, bw, M, b, d, R=np.inf, C=1.0):
     t = np.arange(0, dur, dt)
     return np.ravel(np.real(jbwM*np.dot(m*dd.T, np.exp(jbwM*m[:, np.newaxis]*t))))
 
-def iaf_decode_pop(s_list, dur, dt, bw, b_list, d_list, R_list, C_list):
+def iaf_decode_pop(s_list, dur, dt, bw, b_list, d_list, R_list, C_list,
+                   solver='pinv', n_workers=1, executor='thread', G_file=None,
+                   dtype=np.float64):
     """
     Multi-input single-output IAF time decoding machine.
 
@@ -528,7 +1025,7 @@ def iaf_decode_pop(s_list, dur, dt, bw, b_list, d_list, R_list, C_list):
 
     Parameters
     ----------
-    s_list : list of ndarrays of floats
+    s_list : list of ndarrays of floats or SpikeEnsemble
         Signal encoded by an ensemble of encoders. The values represent the
         time between spikes (in s). The number of arrays in the list
         corresponds to the number of encoders in the ensemble.
@@ -547,6 +1044,28 @@ def iaf_decode_pop(s_list, dur, dt, bw, b_list, d_list, R_list, C_list):
         List of encoder neuron resistances.
     C_list : list of floats.
         List of encoder neuron capacitances.
+    solver : {'pinv', 'tsvd', 'cg', 'lsqr', 'minres'} or callable
+        Solver used to compute the reconstruction coefficients; see
+        `bionet.ted.solvers` for details.
+        If an iterative solver is specified by name and the neurons
+        are ideal, the reconstruction matrix is not formed explicitly.
+    n_workers : int
+        Number of workers used to compute the blocks of the
+        reconstruction matrix associated with each pair of neurons. If
+        None, the number of processors is used.
+    executor : {'thread', 'process'}
+        Type of workers; see `bionet.ted.parallel.assemble_blocks`.
+    G_file : str
+        If specified, the reconstruction matrix is stored in a
+        memory-mapped file with this name rather than in memory.
+    dtype : {numpy.float64, numpy.float32}
+        Floating point type used to compute the reconstruction
+        coefficients and the recovered signal. The reconstruction
+        matrix of a population of ideal neurons is real; that of a
+        population containing leaky neurons is complex with the same
+        precision. Single precision halves the memory occupied by the
+        matrix, but the recovered signal's accuracy is limited by the
+        smaller singular value cutoff that can be resolved.
 
     Returns
     -------
@@ -564,13 +1083,10 @@ def iaf_decode_pop(s_list, dur, dt, bw, b_list, d_list, R_list, C_list):
     if not M:
         raise ValueError('no spike data given')
 
-    bwpi = bw/np.pi
-
-    # Compute the spike times:
-    ts_list = map(np.cumsum, s_list)
-
-    # Compute the midpoints between spike times:
-    tsh_list = map(lambda ts:(ts[0:-1]+ts[1:])/2, ts_list)
+    # Compute the spike times and the midpoints between them:
+    ts_list = map(spike_times, s_list)
+    tsh_list = map(spike_midpoints, s_list)
+    s_list = [np.asarray(spike_intervals(s)) for s in s_list]
 
     # Compute number of spikes in each spike list:
     Ns_list = map(len, ts_list)
@@ -578,81 +1094,40 @@ def iaf_decode_pop(s_list, dur, dt, bw, b_list, d_list, R_list, C_list):
 
     # Compute the values of the matrix that must be inverted to obtain
     # the reconstruction coefficients:
-    Nsh_cumsum = np.cumsum([0.0]+Nsh_list)
+    Nsh_cumsum = np.cumsum([0]+Nsh_list)
     Nsh_sum = Nsh_cumsum[-1]
-    G = np.empty((Nsh_sum, Nsh_sum), np.complex)
-    q = np.empty((Nsh_sum, 1), np.float)
-    if np.all(np.isinf(R_list)):
-        for l in xrange(M):
-            for m in xrange(M):
-                G_block = np.empty((Nsh_list[l], Nsh_list[m]), np.float)
-
-                # Compute the values for all of the sincs so that they
-                # do not need to each be recomputed when determining
-                # the integrals between spike times:
-                for k in xrange(Nsh_list[m]):
-                    temp = scipy.special.sici(bw*(ts_list[l]-tsh_list[m][k]))[0]/np.pi
-                    G_block[:, k] = temp[1:]-temp[:-1]
-
-                G[Nsh_cumsum[l]:Nsh_cumsum[l+1],
-                  Nsh_cumsum[m]:Nsh_cumsum[m+1]] = G_block
-
-            # Compute the quanta:
-            q[Nsh_cumsum[l]:Nsh_cumsum[l+1], 0] = \
-                        C_list[l]*d_list[l]-b_list[l]*s_list[l][1:]
+    if np.all(np.isinf(R_list)) and solvers.is_iterative(solver):
+        G = GOperator(ts_list, np.hstack(tsh_list), bw)
     else:
-        for l in xrange(M):
-            for m in xrange(M):
-                G_block = np.empty((Nsh_list[l], Nsh_list[m]), np.complex)
-
-                for n in xrange(Nsh_list[l]):
-                    for k in xrange(Nsh_list[m]):
-
-                        # The code below is functionally equivalent to
-                        # (but considerably faster than) the
-                        # integration below:
-                        #
-                        # f = lambda t:np.sinc(bwpi*(t-tsh_list[m][k]))* \
-                        #     bwpi*np.exp((ts_list[l][n+1]-t)/-(R_list[l]*C_list[l]))
-                        # G_block[n, k] = scipy.integrate.quad(f, ts_list[l][n], ts_list[l][n+1])[0]
-                        RC = R_list[l]*C_list[l]
-                        tsh = tsh_list[m]
-                        ts = ts_list[l]
-                        if ts[n] < tsh[k] and tsh[k] < ts[n+1]:
-                            G_block[n, k] = (-1j/4)*np.exp((tsh[k]-ts[n+1])/(RC))* \
-                                            (2*se.ei((1-1j*RC*bw)*(ts[n]-tsh[k])/RC)-
-                                             2*se.ei((1-1j*RC*bw)*(ts[n+1]-tsh[k])/RC)-
-                                             2*se.ei((1+1j*RC*bw)*(ts[n]-tsh[k])/RC)+
-                                             2*se.ei((1+1j*RC*bw)*(ts[n+1]-tsh[k])/RC)+
-                                             np.log(-1-1j*RC*bw)+np.log(1-1j*RC*bw)-
-                                             np.log(-1+1j*RC*bw)-np.log(1+1j*RC*bw)+
-                                             np.log(-1j/(-1j+RC*bw))-np.log(1j/(-1j+RC*bw))+
-                                             np.log(-1j/(1j+RC*bw))-np.log(1j/(1j+RC*bw)))/np.pi
-                        else:
-                            G_block[n, k] = (-1j/2)*np.exp((tsh[k]-ts[n+1])/RC)* \
-                                            (se.ei((1-1j*RC*bw)*(ts[n]-tsh[k])/RC)-
-                                             se.ei((1-1j*RC*bw)*(ts[n+1]-tsh[k])/RC)-
-                                             se.ei((1+1j*RC*bw)*(ts[n]-tsh[k])/RC)+
-                                             se.ei((1+1j*RC*bw)*(ts[n+1]-tsh[k])/RC))/np.pi
-
-                G[Nsh_cumsum[l]:Nsh_cumsum[l+1],
-                  Nsh_cumsum[m]:Nsh_cumsum[m+1]] = G_block
-
-            # Compute the quanta:
-            q[Nsh_cumsum[l]:Nsh_cumsum[l+1], 0] = \
-                       C_list[l]*(d_list[l]+b_list[l]*R_list[l]* \
-                                  (np.exp(-s_list[l][1:]/(R_list[l]*C_list[l]))-1))
+        if np.all(np.isinf(R_list)):
+            G_dtype = dtype
+        else:
+            G_dtype = np.result_type(dtype, np.complex64)
+        if G_file is None:
+            G = np.empty((Nsh_sum, Nsh_sum), G_dtype)
+        else:
+            G = np.memmap(G_file, G_dtype, 'w+', shape=(Nsh_sum, Nsh_sum))
+
+        # The block of G associated with neurons l and m only depends
+        # on the spike times of those neurons:
+        tasks = [((Nsh_cumsum[l], Nsh_cumsum[l+1],
+                   Nsh_cumsum[m], Nsh_cumsum[m+1]),
+                  (ts_list[l], tsh_list[m], bw, R_list[l]*C_list[l])) \
+                 for l in xrange(M) for m in xrange(M)]
+        assemble_blocks(G, tasks, _iaf_G_block, n_workers, executor)
+
+    # Compute the quanta:
+    q = np.empty((Nsh_sum, 1), dtype)
+    for l in xrange(M):
+        q[Nsh_cumsum[l]:Nsh_cumsum[l+1], 0] = \
+            _iaf_quanta(s_list[l], b_list[l], d_list[l], R_list[l], C_list[l])
 
     # Compute the reconstruction coefficients:
-    c = np.dot(np.linalg.pinv(G, __pinv_rcond__), q)
+    c = solvers.solve(G, q, solver, __pinv_rcond__)
 
     # Reconstruct the signal using the coefficients:
-    t = np.arange(0, dur, dt)
-    u_rec = np.zeros(len(t), np.complex)
-    for m in xrange(M):
-        for k in xrange(Nsh_list[m]):
-            u_rec += np.sinc(bwpi*(t-tsh_list[m][k]))*bwpi*c[Nsh_cumsum[m]+k, 0]
-    return np.real(u_rec)
+    return np.asarray(sinc_synth(np.hstack(tsh_list), np.real(c[:, 0]),
+                                 dur, dt, bw), dtype)
 
 def iaf_decode_spline(s, dur, dt, b, d, R=np.inf, C=1.0):
     """
@@ -663,7 +1138,7 @@ def iaf_decode_spline(s, dur, dt, b, d, R=np.inf, C=1.0):
 
     Parameters
     ----------
-    s : array_like of floats
+    s : array_like of floats or SpikeTrain
         Encoded signal. The values represent the time between spikes (in s).
     dur : float
         Duration of signal (in s).
@@ -689,11 +1164,9 @@ def iaf_decode_spline(s, dur, dt, b, d, R=np.inf, C=1.0):
     if ns < 2:
         raise ValueError('s must contain at least 2 elements')
 
-    # Cast s to an ndarray to permit ndarray operations:
-    s = np.asarray(s)
-
     # Compute the spike times:
-    ts = np.cumsum(s)
+    ts = spike_times(s)
+    s = np.asarray(spike_intervals(s))
     n = ns-1
 
     RC = R*C
@@ -785,6 +1258,172 @@ def iaf_decode_spline(s, dur, dt, b, d, R=np.inf, C=1.0):
 
     return u_rec
 
+def _spline_F(t, K, L, M, N):
+    """
+    Antiderivative used to compute the entries of the reconstruction
+    matrix of a leaky spline interpolation IAF time decoding machine.
+    """
+
+    return np.exp(-(M-t)/K)*(K*((N-t)/L)**3+(3*K**2/L-3*K)*((N-t)/L)**2+\
+                             (6*K**3/L**2-6*K**2/L+6*K)*((N-t)/L)+\
+                             (6*K**4/L**3-6*K**3/L**2+6*K**2/L-6*K))
+
+def _spline_F2(t, K, L, M, N):
+    """
+    Antiderivative used to compute the entries of the reconstruction
+    matrix of a leaky spline interpolation IAF time decoding machine.
+    """
+
+    return ((K*L)/(K+L))*np.exp(-(L*M+K*N-(K+L)*t)/(K*L))
+
+def _iaf_spline_G_block_ref(tsi, tsj, RCi=np.inf, RCj=np.inf):
+    """
+    Compute a block of the reconstruction matrix of a spline
+    interpolation IAF time decoding machine one entry at a time.
+    """
+
+    F = _spline_F
+    F2 = _spline_F2
+    Gpr_block = np.zeros((len(tsi)-1, len(tsj)-1), np.float)
+    for k in xrange(len(tsi)-1):
+        for l in xrange(len(tsj)-1):
+
+            # Notice that Python's builtin max and min
+            # functions are used here:
+            a1 = tsi[k]
+            b1 = min(tsj[l], tsi[k+1])
+            a2 = max(tsj[l], tsi[k])
+            b2 = min(tsj[l+1], tsi[k+1])
+            a3 = max(tsj[l+1], tsi[k])
+            b3 = tsi[k+1]
+
+            if np.isinf(RCi):
+                if (tsi[k]<tsj[l]):
+                    Gpr_block[k, l] += \
+                        0.05*(((b1-tsj[l+1])**5-(b1-tsj[l])**5)\
+                              -((a1-tsj[l+1])**5-(a1-tsj[l])**5))
+                if (tsj[l]<tsi[k+1] and tsj[l+1]>tsi[k]):
+                    Gpr_block[k, l] += \
+                        0.05*(((b2-tsj[l+1])**5+(b2-tsj[l])**5)\
+                              -((a2-tsj[l+1])**5+(a2-tsj[l])**5))
+                if (tsj[l+1]<tsi[k+1]):
+                    Gpr_block[k, l] += \
+                        0.05*(((b3-tsj[l])**5-(b3-tsj[l+1])**5)\
+                              -((a3-tsj[l])**5-(a3-tsj[l+1])**5))
+            else:
+                if (tsi[k]<tsj[l]):
+                    Gpr_block[k, l] += RCj**4*\
+                        ((F(b1, RCi, RCj, tsi[k+1], tsj[l+1])-\
+                          F(a1, RCi, RCj, tsi[k+1], tsj[l+1]))+\
+                         np.exp(-(tsj[l+1]-tsj[l])/RCj)*\
+                         (-F(b1, RCi, RCj, tsi[k+1], tsj[l])+\
+                          F(a1, RCi, RCj, tsi[k+1], tsj[l])))
+                if (tsj[l]<tsi[k+1] and tsj[l+1]>tsi[k]):
+                    Gpr_block[k, l] += RCj**4*\
+                        (12*(F2(b2, RCi, RCj, tsi[k+1], tsj[l+1])-\
+                             F2(a2, RCi, RCj, tsi[k+1], tsj[l+1]))+\
+                         F(b2, RCi, RCj, tsi[k+1], tsj[l+1])-\
+                         F(a2, RCi, RCj, tsi[k+1], tsj[l+1])+\
+                         np.exp(-(tsj[l+1]-tsj[l])/RCj)*\
+                         (F(b2, RCi, RCj, tsi[k+1], tsj[l])-\
+                          F(a2, RCi, RCj, tsi[k+1], tsj[l])))
+                if (tsj[l+1]<tsi[k+1]):
+                    Gpr_block[k, l] += RCj**4*\
+                        (np.exp(-(tsj[l+1]-tsj[l])/RCj)*\
+                         (F(b3, RCi, RCj, tsi[k+1], tsj[l])-\
+                          F(a3, RCi, RCj, tsi[k+1], tsj[l]))-\
+                         F(b3, RCi, RCj, tsi[k+1], tsj[l+1])+\
+                         F(a3, RCi, RCj, tsi[k+1], tsj[l+1]))
+    return Gpr_block
+
+def _iaf_spline_G_block(tsi, tsj, RCi=np.inf, RCj=np.inf, reference=False):
+    """
+    Compute a block of the reconstruction matrix of a spline
+    interpolation IAF time decoding machine.
+
+    Evaluate the inner products between the spline functions
+    associated with the intervals between the spike times `tsi` of
+    neuron `i` and those associated with the intervals between the
+    spike times `tsj` of neuron `j`. Each entry is the sum of up to
+    three integrals whose presence depends upon how the two intervals
+    overlap; all of the entries are computed at once by masking the
+    entries to which each integral contributes.
+
+    Parameters
+    ----------
+    tsi, tsj : ndarray of floats
+        Spike times of neurons `i` and `j` (in s).
+    RCi, RCj : float
+        Time constants of neurons `i` and `j`. If `RCi` is infinite,
+        the neurons are assumed to be ideal.
+    reference : bool
+        If True, compute the entries one at a time with scalar
+        operations. This is much slower, but is useful for checking
+        the results.
+
+    Returns
+    -------
+    Gpr_block : ndarray of floats
+        Block of shape `(len(tsi)-1, len(tsj)-1)`.
+    """
+
+    if reference:
+        return _iaf_spline_G_block_ref(tsi, tsj, RCi, RCj)
+
+    # Each entry depends on the interval [tk, tk1] of neuron i
+    # associated with its row and the interval [tl, tl1] of neuron j
+    # associated with its column:
+    tk, tk1, tl, tl1 = \
+        np.broadcast_arrays(tsi[:-1, np.newaxis], tsi[1:, np.newaxis],
+                            tsj[np.newaxis, :-1], tsj[np.newaxis, 1:])
+    Gpr_block = np.zeros(tk.shape, np.float)
+
+    # Masks of the entries to which each integral contributes:
+    m1 = tk < tl
+    m2 = (tl < tk1) & (tl1 > tk)
+    m3 = tl1 < tk1
+
+    # Limits of the integrals:
+    a1 = tk[m1]
+    b1 = np.minimum(tl[m1], tk1[m1])
+    a2 = np.maximum(tl[m2], tk[m2])
+    b2 = np.minimum(tl1[m2], tk1[m2])
+    a3 = np.maximum(tl1[m3], tk[m3])
+    b3 = tk1[m3]
+
+    if np.isinf(RCi):
+        Gpr_block[m1] += \
+            0.05*(((b1-tl1[m1])**5-(b1-tl[m1])**5)\
+                  -((a1-tl1[m1])**5-(a1-tl[m1])**5))
+        Gpr_block[m2] += \
+            0.05*(((b2-tl1[m2])**5+(b2-tl[m2])**5)\
+                  -((a2-tl1[m2])**5+(a2-tl[m2])**5))
+        Gpr_block[m3] += \
+            0.05*(((b3-tl[m3])**5-(b3-tl1[m3])**5)\
+                  -((a3-tl[m3])**5-(a3-tl1[m3])**5))
+    else:
+        F = _spline_F
+        F2 = _spline_F2
+        e = np.exp(-(tl1-tl)/RCj)
+        Gpr_block[m1] += RCj**4*\
+            ((F(b1, RCi, RCj, tk1[m1], tl1[m1])-\
+              F(a1, RCi, RCj, tk1[m1], tl1[m1]))+\
+             e[m1]*(-F(b1, RCi, RCj, tk1[m1], tl[m1])+\
+                    F(a1, RCi, RCj, tk1[m1], tl[m1])))
+        Gpr_block[m2] += RCj**4*\
+            (12*(F2(b2, RCi, RCj, tk1[m2], tl1[m2])-\
+                 F2(a2, RCi, RCj, tk1[m2], tl1[m2]))+\
+             F(b2, RCi, RCj, tk1[m2], tl1[m2])-\
+             F(a2, RCi, RCj, tk1[m2], tl1[m2])+\
+             e[m2]*(F(b2, RCi, RCj, tk1[m2], tl[m2])-\
+                    F(a2, RCi, RCj, tk1[m2], tl[m2])))
+        Gpr_block[m3] += RCj**4*\
+            (e[m3]*(F(b3, RCi, RCj, tk1[m3], tl[m3])-\
+                    F(a3, RCi, RCj, tk1[m3], tl[m3]))-\
+             F(b3, RCi, RCj, tk1[m3], tl1[m3])+\
+             F(a3, RCi, RCj, tk1[m3], tl1[m3]))
+    return Gpr_block
+
 def iaf_decode_spline_pop(s_list, dur, dt, b_list, d_list, R_list,
                           C_list):
     """
@@ -795,7 +1434,7 @@ def iaf_decode_spline_pop(s_list, dur, dt, b_list, d_list, R_list,
 
     Parameters
     ----------
-    s_list: list of ndarrays of floats
+    s_list: list of ndarrays of floats or SpikeEnsemble
         Signal encoded by an ensemble of encoders. The values represent the
         time between spikes (in s). The number of arrays in the list
         corresponds to the number of encoders in the ensemble.
@@ -828,7 +1467,8 @@ def iaf_decode_spline_pop(s_list, dur, dt, b_list, d_list, R_list,
         raise ValueError('no spike data given')
 
     # Compute the spike times:
-    ts_list = map(np.cumsum, s_list)
+    ts_list = map(spike_times, s_list)
+    s_list = [np.asarray(spike_intervals(s)) for s in s_list]
     n_list = map(lambda ts: len(ts)-1, ts_list)
 
     # Define the spline polynomial:
@@ -836,7 +1476,7 @@ def iaf_decode_spline_pop(s_list, dur, dt, b_list, d_list, R_list,
 
     # Compute the values of the matrix that must be inverted to obtain
     # the reconstruction coefficients:
-    n_cumsum = np.cumsum([0.0]+n_list)
+    n_cumsum = np.cumsum([0]+n_list)
     n_sum = n_cumsum[-1]
     Gpr = np.zeros((n_sum+2, n_sum+2), np.float)
     qz = np.zeros(n_sum+2, np.float)
@@ -856,51 +1496,34 @@ def iaf_decode_spline_pop(s_list, dur, dt, b_list, d_list, R_list,
             qz[n_cumsum[i]:n_cumsum[i+1]] = \
                 C_list[i]*d_list[i]-b_list[i]*s[1:]
 
-            # Compute the G matrix:
+            # Compute the G matrix; the analytic expressions for the
+            # entries of each block are equivalent to the integration
+            # described in the comment below:
+            #
+            # f1 = lambda t: \
+            #      0.25*(((t-ts_list[j][l+1])**4-(t-ts_list[j][l])**4))
+            # f2 = lambda t: \
+            #      0.25*(((t-ts_list[j][l+1])**4+(t-ts_list[j][l])**4))
+            # f3 = lambda t: \
+            #      0.25*(((t-ts_list[j][l])**4-(t-ts_list[j][l+1])**4))
+            # if (ts_list[i][k]<ts_list[j][l]):
+            #     Gpr_block[k, l] += scipy.integrate.quad(f1, a1, b1)[0]
+            # if (ts_list[j][l]<ts_list[i][k+1] and
+            #     ts_list[j][l+1]>ts_list[i][k]):
+            #     Gpr_block[k, l] += scipy.integrate.quad(f2, a2, b2)[0]
+            # if (ts_list[j][l+1]<ts_list[i][k+1]):
+            #     Gpr_block[k, l] += scipy.integrate.quad(f3, a3, b3)[0]
+            #
+            # where a1 = ts_list[i][k],
+            # b1 = min(ts_list[j][l], ts_list[i][k+1]),
+            # a2 = max(ts_list[j][l], ts_list[i][k]),
+            # b2 = min(ts_list[j][l+1], ts_list[i][k+1]),
+            # a3 = max(ts_list[j][l+1], ts_list[i][k]), and
+            # b3 = ts_list[i][k+1]:
             for j in xrange(M):
-                Gpr_block = np.zeros((n_list[i], n_list[j]), np.float)
-                for k in xrange(n_list[i]):
-                    for l in xrange(n_list[j]):
-
-                        # Notice that Python's builtin max and min
-                        # functions are used here:
-                        a1 = ts_list[i][k]
-                        b1 = min(ts_list[j][l], ts_list[i][k+1])
-                        a2 = max(ts_list[j][l], ts_list[i][k])
-                        b2 = min(ts_list[j][l+1], ts_list[i][k+1])
-                        a3 = max(ts_list[j][l+1], ts_list[i][k])
-                        b3 = ts_list[i][k+1]
-
-                        # The analytic expression for Gpr_block[k, l] is equivalent
-                        # to the integration described in the comment below:
-                        # f1 = lambda t: \
-                        #      0.25*(((t-ts_list[j][l+1])**4-(t-ts_list[j][l])**4))
-                        # f2 = lambda t: \
-                        #      0.25*(((t-ts_list[j][l+1])**4+(t-ts_list[j][l])**4))
-                        # f3 = lambda t: \
-                        #      0.25*(((t-ts_list[j][l])**4-(t-ts_list[j][l+1])**4))
-                        # if (ts_list[i][k]<ts_list[j][l]):
-                        #     Gpr_block[k, l] += scipy.integrate.quad(f1, a1, b1)[0]
-                        # if (ts_list[j][l]<ts_list[i][k+1] and
-                        #     ts_list[j][l+1]>ts_list[i][k]):
-                        #     Gpr_block[k, l] += scipy.integrate.quad(f2, a2, b2)[0]
-                        # if (ts_list[j][l+1]<ts_list[i][k+1]):
-                        #     Gpr_block[k, l] += scipy.integrate.quad(f3, a3, b3)[0]
-                        if (ts_list[i][k]<ts_list[j][l]):
-                            Gpr_block[k, l] += \
-                                         0.05*(((b1-ts_list[j][l+1])**5-(b1-ts_list[j][l])**5)\
-                                               -((a1-ts_list[j][l+1])**5-(a1-ts_list[j][l])**5))
-                        if (ts_list[j][l]<ts_list[i][k+1] and ts_list[j][l+1]>ts_list[i][k]):
-                            Gpr_block[k, l] += \
-                                         0.05*(((b2-ts_list[j][l+1])**5+(b2-ts_list[j][l])**5)\
-                                               -((a2-ts_list[j][l+1])**5+(a2-ts_list[j][l])**5))
-                        if (ts_list[j][l+1]<ts_list[i][k+1]):
-                            Gpr_block[k, l] += \
-                                         0.05*(((b3-ts_list[j][l])**5-(b3-ts_list[j][l+1])**5)\
-                                               -((a3-ts_list[j][l])**5-(a3-ts_list[j][l+1])**5))
-
                 Gpr[n_cumsum[i]:n_cumsum[i+1],
-                    n_cumsum[j]:n_cumsum[j+1]] = Gpr_block
+                    n_cumsum[j]:n_cumsum[j+1]] = \
+                    _iaf_spline_G_block(ts_list[i], ts_list[j])
 
     else:
         for i in xrange(M):
@@ -920,75 +1543,34 @@ def iaf_decode_spline_pop(s_list, dur, dt, b_list, d_list, R_list,
             qz[n_cumsum[i]:n_cumsum[i+1]] = \
                 C_list[i]*d_list[i]-b_list[i]*RCi*(1-np.exp(-s[1:]/RCi))
 
-            # Compute the G matrix:
+            # Compute the G matrix; the analytic expressions for the
+            # entries of each block are equivalent to the integration
+            # described in the comment below:
+            #
+            # f1 = lambda t: \
+            #      RCj**4*np.exp(-(ts_list[i][k+1]-t)/RCi)* \
+            #      (f((ts_list[j][l+1]-t)/RCj)-\
+            #      f((ts_list[j][l]-t)/RCj)*np.exp(-(ts_list[j][l+1]-ts_list[j][l])/RCj))
+            # f2 = lambda t: \
+            #      RCj**4*np.exp(-(ts_list[i][k+1]-t)/RCi)* \
+            #      (12*np.exp(-(ts_list[j][l+1]-t)/RCj)+ \
+            #      f((ts_list[j][l+1]-t)/RCj)+ \
+            #      f((ts_list[j][l]-t)/RCj)*np.exp(-(ts_list[j][l+1]-ts_list[j][l])/RCj))
+            # f3 = lambda t: \
+            #      RCj**4*np.exp(-(ts_list[i][k+1]-t)/RCi)* \
+            #      (f((ts_list[j][l]-t)/RCj)*np.exp(-(ts_list[j][l+1]-ts_list[j][l])/RCj)- \
+            #      f((ts_list[j][l+1]-t)/RCj))
+            # if (ts_list[i][k]<ts_list[j][l]):
+            #     Gpr_block[k, l] += scipy.integrate.quad(f1, a1, b1)[0]
+            # if (ts_list[j][l]<ts_list[i][k+1] and ts_list[j][l+1]>ts_list[i][k]):
+            #     Gpr_block[k, l] += scipy.integrate.quad(f2, a2, b2)[0]
+            # if (ts_list[j][l+1]<ts_list[i][k+1]):
+            #     Gpr_block[k, l] += scipy.integrate.quad(f3, a3, b3)[0]
             for j in xrange(M):
-                Gpr_block = np.zeros((n_list[i], n_list[j]), np.float)
-                RCj = R_list[j]*C_list[j]
-                for k in xrange(n_list[i]):
-                    for l in xrange(n_list[j]):
-                        a1 = ts_list[i][k]
-                        b1 = min(ts_list[j][l], ts_list[i][k+1])
-                        a2 = max(ts_list[j][l], ts_list[i][k])
-                        b2 = min(ts_list[j][l+1], ts_list[i][k+1])
-                        a3 = max(ts_list[j][l+1], ts_list[i][k])
-                        b3 = ts_list[i][k+1]
-
-                        # The analytic expression for Gpr_block[k, l] is equivalent
-                        # to the integration described in the comment below:
-                        # f1 = lambda t: \
-                        #      RCj**4*np.exp(-(ts_list[i][k+1]-t)/RCi)* \
-                        #      (f((ts_list[j][l+1]-t)/RCj)-\
-                        #      f((ts_list[j][l]-t)/RCj)*np.exp(-(ts_list[j][l+1]-ts_list[j][l])/RCj))
-                        # f2 = lambda t: \
-                        #      RCj**4*np.exp(-(ts_list[i][k+1]-t)/RCi)* \
-                        #      (12*np.exp(-(ts_list[j][l+1]-t)/RCj)+ \
-                        #      f((ts_list[j][l+1]-t)/RCj)+ \
-                        #      f((ts_list[j][l]-t)/RCj)*np.exp(-(ts_list[j][l+1]-ts_list[j][l])/RCj))
-                        # f3 = lambda t: \
-                        #      RCj**4*np.exp(-(ts_list[i][k+1]-t)/RCi)* \
-                        #      (f((ts_list[j][l]-t)/RCj)*np.exp(-(ts_list[j][l+1]-ts_list[j][l])/RCj)- \
-                        #      f((ts_list[j][l+1]-t)/RCj))                              
-                        # if (ts_list[i][k]<ts_list[j][l]):
-                        #     Gpr_block[k, l] += scipy.integrate.quad(f1, a1, b1)[0]
-                        # if (ts_list[j][l]<ts_list[i][k+1] and ts_list[j][l+1]>ts_list[i][k]):
-                        #     Gpr_block[k, l] += scipy.integrate.quad(f2, a2, b2)[0]
-                        # if (ts_list[j][l+1]<ts_list[i][k+1]):                        
-                        #     Gpr_block[k, l] += scipy.integrate.quad(f3, a3, b3)[0]
-
-                        F = lambda t, K, L, M, N: \
-                            np.exp(-(M-t)/K)*(K*((N-t)/L)**3+(3*K**2/L-3*K)*((N-t)/L)**2+\
-                                           (6*K**3/L**2-6*K**2/L+6*K)*((N-t)/L)+\
-                                           (6*K**4/L**3-6*K**3/L**2+6*K**2/L-6*K))
-                        F2 = lambda t, K, L, M, N: \
-                             ((K*L)/(K+L))*np.exp(-(L*M+K*N-(K+L)*t)/(K*L))
-
-                        if (ts_list[i][k]<ts_list[j][l]):
-                            Gpr_block[k, l] += RCj**4*\
-                                               ((F(b1, RCi, RCj, ts_list[i][k+1], ts_list[j][l+1])-\
-                                                F(a1, RCi, RCj, ts_list[i][k+1], ts_list[j][l+1]))+\
-                                                np.exp(-(ts_list[j][l+1]-ts_list[j][l])/RCj)*\
-                                                (-F(b1, RCi, RCj, ts_list[i][k+1], ts_list[j][l])+\
-                                                 F(a1, RCi, RCj, ts_list[i][k+1], ts_list[j][l])))
-                        if (ts_list[j][l]<ts_list[i][k+1] and
-                            ts_list[j][l+1]>ts_list[i][k]):
-                            Gpr_block[k, l] += RCj**4*\
-                                               (12*(F2(b2, RCi, RCj, ts_list[i][k+1], ts_list[j][l+1])-\
-                                                    F2(a2, RCi, RCj, ts_list[i][k+1], ts_list[j][l+1]))+\
-                                                F(b2, RCi, RCj, ts_list[i][k+1], ts_list[j][l+1])-\
-                                                F(a2, RCi, RCj, ts_list[i][k+1], ts_list[j][l+1])+\
-                                                np.exp(-(ts_list[j][l+1]-ts_list[j][l])/RCj)*\
-                                                (F(b2, RCi, RCj, ts_list[i][k+1], ts_list[j][l])-\
-                                                 F(a2, RCi, RCj, ts_list[i][k+1], ts_list[j][l])))
-                        if (ts_list[j][l+1]<ts_list[i][k+1]):
-                            Gpr_block[k, l] += RCj**4*\
-                                               (np.exp(-(ts_list[j][l+1]-ts_list[j][l])/RCj)*\
-                                                (F(b3, RCi, RCj, ts_list[i][k+1], ts_list[j][l])-\
-                                                 F(a3, RCi, RCj, ts_list[i][k+1], ts_list[j][l]))-\
-                                                F(b3, RCi, RCj, ts_list[i][k+1], ts_list[j][l+1])+\
-                                                F(a3, RCi, RCj, ts_list[i][k+1], ts_list[j][l+1]))
-
                 Gpr[n_cumsum[i]:n_cumsum[i+1],
-                    n_cumsum[j]:n_cumsum[j+1]] = Gpr_block
+                    n_cumsum[j]:n_cumsum[j+1]] = \
+                    _iaf_spline_G_block(ts_list[i], ts_list[j],
+                                        RCi, R_list[j]*C_list[j])
 
     # Compute the reconstruction coefficients:
     cd = np.dot(np.linalg.pinv(Gpr), qz)
@@ -1022,7 +1604,143 @@ def iaf_decode_spline_pop(s_list, dur, dt, b_list, d_list, R_list,
 
     return u_rec
 
-def iaf_encode_coupled(u, dt, b_list, d_list, k_list, h_list, type_list):
+def _iaf_encode_coupled_engine(u, dt, b, d, k, h_tab, types):
+    """
+    Find the spikes generated by an ensemble of coupled ideal IAF
+    neurons whose coupling kernels are tabulated on the time grid.
+
+    The coupling input that each neuron will receive over the next
+    `K` time steps is kept in a ring buffer; the tabulated kernel
+    associated with a spike is added to the buffer when the spike
+    begins to affect the neuron, so the kernels are never evaluated
+    over the spike history. Between spikes, the integrator
+    trajectories of all of the neurons are computed in bulk with a
+    cumulative sum over chunks of the input whose length is adapted
+    to the observed interspike intervals.
+
+    Parameters
+    ----------
+    u : ndarray of floats
+        Signal to encode.
+    dt : float
+        Time step (in s).
+    b : ndarray of floats
+        Encoder biases.
+    d : ndarray of floats
+        Encoder thresholds.
+    k : ndarray of floats
+        Encoder integration constants.
+    h_tab : ndarray of floats
+        Tabulated coupling kernels; `h_tab[j, i, n]` is the input to
+        neuron `i` due to a spike emitted by neuron `j` `n*dt` s
+        earlier.
+    types : ndarray of ints
+        Neuron types.
+
+    Returns
+    -------
+    s_list : list of ndarrays of floats
+        Encoded signal.
+    """
+
+    M, N, K = len(b), len(u), h_tab.shape[2]
+    s_list = [[] for i in xrange(M)]
+    if N == 0:
+        return [np.asarray(s) for s in s_list]
+
+    # The interval between two successive spikes is the result of
+    # repeatedly adding dt to 0; these sums are precomputed so that they
+    # exhibit the same roundoff as the sequential additions:
+    ticks = np.cumsum(np.repeat(np.float(dt), N))
+
+    # buf[i, n % K] contains the coupling input to neuron i at step n:
+    buf = np.zeros((M, K), np.float)
+    coupled = np.any(h_tab != 0, 2)
+
+    def activate(j, i, m, n):
+        """Add the kernel of the spike emitted by neuron j at step m
+        to the input of neuron i from step n onwards."""
+
+        if not coupled[j, i] or n-m-1 >= K:
+            return
+        h = h_tab[j, i, n-m-1:]
+        p = n % K
+        q = min(len(h), K-p)
+        buf[i, p:p+q] += h[0:q]
+        buf[i, 0:len(h)-q] += h[q:]
+
+    # Every neuron is assumed to have emitted a spike at time 0
+    # (i.e., at step -1). The spikes emitted by neuron j only affect
+    # neuron i once the latter has emitted a spike at the same time or
+    # later:
+    ts_last = np.zeros(M, np.float)
+    start = np.zeros(M, np.int)
+    pending = [[] for i in xrange(M)]
+    for j in xrange(M):
+        for i in xrange(M):
+            activate(j, i, -1, 0)
+
+    b_col = b[:, np.newaxis]
+    k_col = k[:, np.newaxis]
+    types_col = types[:, np.newaxis]
+    d_col = (types*d)[:, np.newaxis]
+    y = np.zeros(M, np.float)
+    n = 0       # index of next step to integrate
+    L = 64      # length of chunk to search for the next crossing
+    while n < N:
+
+        # The chunk may not extend beyond the steps covered by the
+        # ring buffer:
+        n1 = min(n+L, N, n+K)
+        idx = np.arange(n, n1) % K
+        x = ((u[n:n1]+b_col)+buf[:, idx])*dt/k_col
+        x[:, 0] += y
+        yc = np.cumsum(x, 1)
+        crossed = types_col*yc >= d_col
+        crossed_any = np.any(crossed, 0)
+        c = np.argmax(crossed_any)
+        if not crossed_any[c]:
+            y = yc[:, -1]
+            buf[:, idx] = 0.0
+            n = n1
+            L *= 2
+            continue
+
+        # Record the spikes emitted at step m and reset the
+        # integrators of the neurons that emitted them:
+        m = n+c
+        buf[:, idx[0:c+1]] = 0.0
+        y = yc[:, c]
+        new = []
+        for j in np.where(crossed[:, c])[0]:
+            interval = ticks[m-start[j]]
+            s_list[j].append(interval)
+            ts_last[j] += interval
+            start[j] = m+1
+            y[j] -= d[j]
+            new.append((ts_last[j], j, m))
+
+        # Add the kernels of the spikes that begin to affect each
+        # neuron; spikes that have receded beyond the support of the
+        # kernels are discarded:
+        for i in xrange(M):
+            remaining = []
+            for ts, j, mj in pending[i]+new:
+                if ts <= ts_last[i]:
+                    activate(j, i, mj, m+1)
+                elif m-mj < K:
+                    remaining.append((ts, j, mj))
+            pending[i] = remaining
+        n = m+1
+
+        # Assume that the next spike will be emitted after a
+        # similar number of steps:
+        L = c+c/4+8
+
+    return [np.asarray(s) for s in s_list]
+
+def iaf_encode_coupled(u, dt, b_list, d_list, k_list, h_list, type_list,
+                       support=None, spike_train=False):
     """
     Single-input multi-output coupled IAF time encoding
     machine.
@@ -1051,16 +1769,45 @@ def iaf_encode_coupled(u, dt, b_list, d_list, k_list, h_list, type_list):
         Neuron types. A value of -1 indicates that a neuron is an OFF-type
         neuron, while a value of 1 indicates that it is an ON-type
         neuron.
+    support : float
+        Length of the support of the coupling functions (in s). If
+        specified, the coupling functions are tabulated once over
+        `[0, support)` with resolution `dt` and the contribution of
+        each spike is accumulated incrementally, so that the encoding
+        time grows linearly with the length of the signal; the
+        coupling functions must then accept arrays of times, and
+        their values outside of the support are ignored. If not
+        specified, the coupling functions are evaluated over the
+        entire spike history at every time step.
+    spike_train : bool
+        If set, the encoded signals are returned as a `SpikeEnsemble`
+        rather than as a list of arrays of interspike intervals.
 
     Returns
     -------
-    s_list : list of ndarrays of floats
+    s_list : list of ndarrays of floats or SpikeEnsemble
         Encoded signal.
     """
 
+    if spike_train:
+        return SpikeEnsemble.from_intervals(
+            iaf_encode_coupled(u, dt, b_list, d_list, k_list, h_list,
+                               type_list, support))
+
     M = len(b_list)
     N = len(u)
 
+    if support is not None:
+        K = max(int(np.ceil(support/dt)), 1)
+        t = np.arange(K)*dt
+        h_tab = np.array([[h_list[j][i](t)+np.zeros(K) for i in xrange(M)]
+                          for j in xrange(M)], np.float)
+        return _iaf_encode_coupled_engine(np.asarray(u, np.float), dt,
+                                          np.asarray(b_list, np.float),
+                                          np.asarray(d_list, np.float),
+                                          np.asarray(k_list, np.float),
+                                          h_tab, np.asarray(type_list))
+
     s_list = [[] for i in xrange(M)]
     ts_list = [[0.0] for i in xrange(M)]
 
@@ -1101,7 +1848,7 @@ def iaf_decode_coupled(s_list, dur, dt, b_list, d_list, k_list, h_list):
 
     Parameters
     ----------
-    s_list : list of ndarrays of floats
+    s_list : list of ndarrays of floats or SpikeEnsemble
         Signal encoded by an ensemble of coupled encoders. The values
         represent the time between spikes (in s). The number of arrays
         in the list corresponds to the number of encoders in the ensemble.
@@ -1138,12 +1885,13 @@ def iaf_decode_coupled(s_list, dur, dt, b_list, d_list, k_list, h_list):
         raise ValueError('no spike data given')
 
     # Compute the spike times:
-    ts_list = map(np.cumsum, s_list)
+    ts_list = map(spike_times, s_list)
+    s_list = [np.asarray(spike_intervals(s)) for s in s_list]
     n_list = map(lambda ts: len(ts)-1, ts_list)
 
     # Compute the values of the matrix that must be inverted to obtain
     # the reconstruction coefficients:
-    n_cumsum = np.cumsum([0.0]+n_list)
+    n_cumsum = np.cumsum([0]+n_list)
     n_sum = n_cumsum[-1]
     Gpr = np.zeros((n_sum+2, n_sum+2), np.float)
     qz = np.zeros(n_sum+2, np.float)
@@ -1173,31 +1921,9 @@ def iaf_decode_coupled(s_list, dur, dt, b_list, d_list, k_list, h_list):
 
         # Compute the G matrix:
         for j in xrange(M):
-            Gpr_block = np.zeros((n_list[i], n_list[j]), np.float)
-            for k in xrange(n_list[i]):
-                for l in xrange(n_list[j]):
-                    a1 = ts_list[i][k]
-                    b1 = min(ts_list[j][l], ts_list[i][k+1])
-                    a2 = max(ts_list[j][l], ts_list[i][k])
-                    b2 = min(ts_list[j][l+1], ts_list[i][k+1])
-                    a3 = max(ts_list[j][l+1], ts_list[i][k])
-                    b3 = ts_list[i][k+1]
-
-                    if (ts_list[i][k]<ts_list[j][l]):
-                        Gpr_block[k, l] += \
-                                     0.05*(((b1-ts_list[j][l+1])**5-(b1-ts_list[j][l])**5)\
-                                           -((a1-ts_list[j][l+1])**5-(a1-ts_list[j][l])**5))
-                    if (ts_list[j][l]<ts_list[i][k+1] and ts_list[j][l+1]>ts_list[i][k]):
-                        Gpr_block[k, l] += \
-                                     0.05*(((b2-ts_list[j][l+1])**5+(b2-ts_list[j][l])**5)\
-                                           -((a2-ts_list[j][l+1])**5+(a2-ts_list[j][l])**5))
-                    if (ts_list[j][l+1]<ts_list[i][k+1]):
-                        Gpr_block[k, l] += \
-                                     0.05*(((b3-ts_list[j][l])**5-(b3-ts_list[j][l+1])**5)\
-                                           -((a3-ts_list[j][l])**5-(a3-ts_list[j][l+1])**5))
-
             Gpr[n_cumsum[i]:n_cumsum[i+1],
-                n_cumsum[j]:n_cumsum[j+1]] = Gpr_block
+                n_cumsum[j]:n_cumsum[j+1]] = \
+                _iaf_spline_G_block(ts_list[i], ts_list[j])
 
     cd = np.dot(np.linalg.pinv(Gpr), qz)
 
@@ -1218,7 +1944,7 @@ def iaf_decode_coupled(s_list, dur, dt, b_list, d_list, k_list, h_list):
 
 def iaf_encode_delay(u_list, t_start, dt, b_list, d_list, k_list, a_list,
                      w_list, y_list=None, interval_list=None,
-                     full_output=False):
+                     full_output=False, spike_train=False):
     """
     Multi-input multi-output delayed IAF time encoding machine.
 
@@ -1254,10 +1980,14 @@ def iaf_encode_delay(u_list, t_start, dt, b_list, d_list, k_list, a_list,
         by the given parameters (with updated values for `y` and `interval`).
         This is useful when the function is called repeatedly to
         encode a long signal.
+    spike_train : bool
+        If set, the encoded signals are returned as a `SpikeEnsemble`
+        rather than as a list of arrays of interspike intervals. This
+        may not be combined with `full_output`.
 
     Returns
     -------
-    s_list : list of ndarrays of floats
+    s_list : list of ndarrays of floats or SpikeEnsemble
         If `full_output` == False, returns the signals encoded as a list
         of arrays of time intervals between spikes.
     [s_list, t_start, dt, b_list, d_list, k_list, a_list, w_list, y_list,
@@ -1270,6 +2000,14 @@ def iaf_encode_delay(u_list, t_start, dt, b_list, d_list, k_list, a_list,
     `t_start` must exceed `max(a)`.
     """
 
+    if spike_train:
+        if full_output:
+            raise ValueError('spike trains cannot be returned with '
+                             'full output')
+        return SpikeEnsemble.from_intervals(
+            iaf_encode_delay(u_list, t_start, dt, b_list, d_list, k_list,
+                             a_list, w_list, y_list, interval_list))
+
     M = len(u_list) # number of input signals
     if not M:
         raise ValueError('no spike data given')
@@ -1322,7 +2060,114 @@ def iaf_encode_delay(u_list, t_start, dt, b_list, d_list, k_list, a_list,
     else:
         return [np.asarray(s) for s in s_list]
 
-def iaf_decode_delay(s_list, T, dt, b_list, d_list, k_list, a_list, w_list):
+def _iaf_delay_G_block_ref(tau_i, tau_j, w_i, w_j):
+    """
+    Compute a block of the reconstruction matrix of a delayed IAF time
+    decoding machine one entry at a time.
+    """
+
+    M = len(w_i)
+    Gpr_block = np.zeros((tau_i.shape[1]-1, tau_j.shape[1]-1), np.float)
+    for k in xrange(Gpr_block.shape[0]):
+        for l in xrange(Gpr_block.shape[1]):
+            for m in xrange(M):
+                tau_im = tau_i[m]
+                tau_jm = tau_j[m]
+                temp = 0.0
+                if tau_jm[l+1] <= tau_im[k]:
+                    temp += \
+                         (tau_im[k+1]-tau_jm[l])**5+(tau_im[k]-tau_jm[l+1])**5-\
+                         (tau_im[k]-tau_jm[l])**5-(tau_im[k+1]-tau_jm[l+1])**5
+                if (tau_jm[l] <= tau_im[k]) and (tau_im[k] <= tau_jm[l+1]) and \
+                       (tau_jm[l+1] <= tau_im[k+1]):
+                    temp += \
+                         (tau_im[k+1]-tau_jm[l])**5-(tau_im[k]-tau_jm[l+1])**5-\
+                         (tau_im[k]-tau_jm[l])**5-(tau_im[k+1]-tau_jm[l+1])**5
+                if (tau_jm[l] <= tau_im[k]) and (tau_im[k] <= tau_im[k+1]) and \
+                       (tau_im[k+1] <= tau_jm[l+1]):
+                    temp += \
+                         (tau_im[k+1]-tau_jm[l])**5-(tau_im[k]-tau_jm[l+1])**5-\
+                         (tau_im[k]-tau_jm[l])**5+(tau_im[k+1]-tau_jm[l+1])**5
+                if (tau_im[k] <= tau_jm[l]) and (tau_jm[l] <= tau_jm[l+1]) and \
+                       (tau_jm[l+1] <= tau_im[k+1]):
+                    temp += \
+                         (tau_im[k+1]-tau_jm[l])**5-(tau_im[k]-tau_jm[l+1])**5+\
+                         (tau_im[k]-tau_jm[l])**5-(tau_im[k+1]-tau_jm[l+1])**5
+                if (tau_im[k] <= tau_jm[l]) and (tau_jm[l] <= tau_im[k+1]) and \
+                       (tau_im[k+1] <= tau_jm[l+1]):
+                    temp += \
+                         (tau_im[k+1]-tau_jm[l])**5-(tau_im[k]-tau_jm[l+1])**5+\
+                         (tau_im[k]-tau_jm[l])**5+(tau_im[k+1]-tau_jm[l+1])**5
+                if tau_im[k+1] <= tau_jm[l]:
+                    temp += \
+                         -(tau_im[k+1]-tau_jm[l])**5-(tau_im[k]-tau_jm[l+1])**5+\
+                         (tau_im[k]-tau_jm[l])**5+(tau_im[k+1]-tau_jm[l+1])**5
+                Gpr_block[k, l] += temp*w_i[m]*w_j[m]/20.0
+    return Gpr_block
+
+def _iaf_delay_G_block(tau_i, tau_j, w_i, w_j, reference=False):
+    """
+    Compute a block of the reconstruction matrix of a delayed IAF time
+    decoding machine.
+
+    Evaluate the inner products between the functions associated with
+    the intervals between the delayed spike times of neuron `i` and
+    those associated with the intervals between the delayed spike
+    times of neuron `j`, summed over all of the decoded signals. The
+    piecewise expression for each entry depends upon how the two
+    intervals are ordered; all of the entries are computed at once by
+    masking the entries to which each piece contributes.
+
+    Parameters
+    ----------
+    tau_i, tau_j : ndarray of floats
+        Arrays of shape `(M, len(ts_i))` and `(M, len(ts_j))` whose
+        rows contain the spike times of neurons `i` and `j` shifted by
+        the delays associated with each of the `M` decoded signals.
+    w_i, w_j : ndarray of floats
+        Scaling factors of neurons `i` and `j` associated with each of
+        the decoded signals.
+    reference : bool
+        If True, compute the entries one at a time with scalar
+        operations. This is much slower, but is useful for checking
+        the results.
+
+    Returns
+    -------
+    Gpr_block : ndarray of floats
+        Block of shape `(len(ts_i)-1, len(ts_j)-1)`.
+    """
+
+    if reference:
+        return _iaf_delay_G_block_ref(tau_i, tau_j, w_i, w_j)
+
+    Gpr_block = np.zeros((tau_i.shape[1]-1, tau_j.shape[1]-1), np.float)
+    for m in xrange(len(w_i)):
+
+        # Each entry depends on the interval [a, b] of neuron i
+        # associated with its row and the interval [c, d] of neuron j
+        # associated with its column:
+        a = tau_i[m, :-1, np.newaxis]
+        b = tau_i[m, 1:, np.newaxis]
+        c = tau_j[m, np.newaxis, :-1]
+        d = tau_j[m, np.newaxis, 1:]
+        P1 = (b-c)**5
+        P2 = (a-d)**5
+        P3 = (a-c)**5
+        P4 = (b-d)**5
+
+        # Add the contributions of each ordering of the intervals:
+        temp = (d <= a)*(P1+P2-P3-P4)
+        temp += ((c <= a) & (a <= d) & (d <= b))*(P1-P2-P3-P4)
+        temp += ((c <= a) & (b <= d))*(P1-P2-P3+P4)
+        temp += ((a <= c) & (d <= b))*(P1-P2+P3-P4)
+        temp += ((a <= c) & (c <= b) & (b <= d))*(P1-P2+P3+P4)
+        temp += (b <= c)*(-P1-P2+P3+P4)
+        Gpr_block += temp*(w_i[m]*w_j[m]/20.0)
+    return Gpr_block
+
+def iaf_decode_delay(s_list, T, dt, b_list, d_list, k_list, a_list, w_list,
+                     n_workers=1, executor='thread'):
     """
     Multi-input multi-output delayed IAF time decoding machine.
 
@@ -1331,7 +2176,7 @@ def iaf_decode_delay(s_list, T, dt, b_list, d_list, k_list, a_list, w_list):
 
     Parameters
     ----------
-    s_list : list of ndarrays of floats
+    s_list : list of ndarrays of floats or SpikeEnsemble
         Signals encoded by an ensemble of encoders. The values
         represent the time between spikes (in s). The number of arrays
         in the list corresponds to the number of encoders in the ensemble.
@@ -1350,6 +2195,12 @@ def iaf_decode_delay(s_list, T, dt, b_list, d_list, k_list, a_list, w_list):
         Delays (in s).
     w_list : N x M array_like of floats.
         Scaling factors.
+    n_workers : int
+        Number of workers used to compute the blocks of the
+        reconstruction matrix associated with each pair of neurons. If
+        None, the number of processors is used.
+    executor : {'thread', 'process'}
+        Type of workers; see `bionet.ted.parallel.assemble_blocks`.
 
     Returns
     -------
@@ -1367,12 +2218,20 @@ def iaf_decode_delay(s_list, T, dt, b_list, d_list, k_list, a_list, w_list):
     M = np.shape(a_list)[1] # number of decoded signals
 
     # Compute the spike times:
-    ts_list = map(np.cumsum, s_list)
+    ts_list = map(spike_times, s_list)
+    s_list = [np.asarray(spike_intervals(s)) for s in s_list]
     n_list = map(lambda ts: len(ts)-1, ts_list)
 
+    # Compute the delayed spike times of each neuron for each of the
+    # decoded signals:
+    tau_list = [ts_list[j][np.newaxis, :]- \
+                np.asarray(a_list[j], np.float)[:, np.newaxis] \
+                for j in xrange(N)]
+    w_list = [np.asarray(w_list[j], np.float) for j in xrange(N)]
+
     # Compute the values of the matrix that must be inverted to obtain
     # the reconstruction coefficients:
-    n_cumsum = np.cumsum([0.0]+n_list)
+    n_cumsum = np.cumsum([0]+n_list)
     n_sum = n_cumsum[-1]
     Gpr = np.zeros((n_sum+2*M, n_sum+2*M), np.float)
     qz = np.zeros(n_sum+2*M, np.float)
@@ -1382,86 +2241,38 @@ def iaf_decode_delay(s_list, T, dt, b_list, d_list, k_list, a_list, w_list):
         qz[n_cumsum[j]:n_cumsum[j+1]] = \
             k_list[j]*d_list[j]-b_list[j]*np.array(s_list[j][1:])
 
-        # Compute p and r:
+        # Compute p and r; the delayed spike times are capped at T so
+        # that the integrals do not extend beyond T:
         for i in xrange(M):
-            tau = ts_list[j] - a_list[j][i]
+            tau = np.minimum(tau_list[j][i], T)
             w = w_list[j][i]
-            p = np.zeros(n_list[j], np.float)
-            r = np.zeros(n_list[j], np.float)
-            for k in xrange(n_list[j]):
-                if tau[k+1] < T:
-                     p[k] = w*(tau[k+1]-tau[k])
-                     r[k] = 0.5*w*(tau[k+1]**2-tau[k]**2)
-                elif tau[k] < T:
-                     p[k] = w*(T-tau[k])
-                     r[k] = 0.5*w*(T**2-tau[k]**2)
-                else:
-                     p[k] = 0.0
-                     r[k] = 0.0
+            p = w*(tau[1:]-tau[:-1])
+            r = 0.5*w*(tau[1:]**2-tau[:-1]**2)
             Gpr[n_cumsum[j]:n_cumsum[j+1], n_sum+i] = \
                 Gpr[n_sum+i, n_cumsum[j]:n_cumsum[j+1]] = p
             Gpr[n_cumsum[j]:n_cumsum[j+1], n_sum+i+M] = \
                 Gpr[n_sum+i+M, n_cumsum[j]:n_cumsum[j+1]] = r
 
-    for i in xrange(N):
-        for j in xrange(N):
-
-            # Compute the G matrix:
-            Gpr_block = np.zeros((n_list[i], n_list[j]), np.float)
-            for k in xrange(n_list[i]):
-                for l in xrange(n_list[j]):
-                    for m in xrange(M):
-                        tau_im = ts_list[i]-a_list[i][m]
-                        tau_jm = ts_list[j]-a_list[j][m]
-
-                        # The analytic expression for Gpr_block[k, l]
-                        # is equivalent to the integration described
-                        # in the comment below.
-                        # def psi(t):
-                        #     if t <= tau_jm[l]:
-                        #         result = (t-tau_jm[l+1])**4-(t-tau_jm[l])**4
-                        #     elif t <= tau_jm[l+1]:
-                        #         result = (t-tau_jm[l+1])**4+(t-tau_jm[l])**4
-                        #     else:
-                        #         result = (t-tau_jm[l])**4-(t-tau_jm[l+1])**4
-                        #     return w_list[j][m]*0.25*result
-                        # Gpr_block[k, l] += \
-                        #              w_list[i][m]*scipy.integrate.quad(psi, tau_im[k],
-                        #                                tau_im[k+1])[0]
-
-                        temp = 0.0
-                        if tau_jm[l+1] <= tau_im[k]:
-                            temp += \
-                                 (tau_im[k+1]-tau_jm[l])**5+(tau_im[k]-tau_jm[l+1])**5-\
-                                 (tau_im[k]-tau_jm[l])**5-(tau_im[k+1]-tau_jm[l+1])**5
-                        if (tau_jm[l] <= tau_im[k]) and (tau_im[k] <= tau_jm[l+1]) and \
-                               (tau_jm[l+1] <= tau_im[k+1]):
-                            temp += \
-                                 (tau_im[k+1]-tau_jm[l])**5-(tau_im[k]-tau_jm[l+1])**5-\
-                                 (tau_im[k]-tau_jm[l])**5-(tau_im[k+1]-tau_jm[l+1])**5
-                        if (tau_jm[l] <= tau_im[k]) and (tau_im[k] <= tau_im[k+1]) and \
-                               (tau_im[k+1] <= tau_jm[l+1]):
-                            temp += \
-                                 (tau_im[k+1]-tau_jm[l])**5-(tau_im[k]-tau_jm[l+1])**5-\
-                                 (tau_im[k]-tau_jm[l])**5+(tau_im[k+1]-tau_jm[l+1])**5
-                        if (tau_im[k] <= tau_jm[l]) and (tau_jm[l] <= tau_jm[l+1]) and \
-                               (tau_jm[l+1] <= tau_im[k+1]):
-                            temp += \
-                                 (tau_im[k+1]-tau_jm[l])**5-(tau_im[k]-tau_jm[l+1])**5+\
-                                 (tau_im[k]-tau_jm[l])**5-(tau_im[k+1]-tau_jm[l+1])**5
-                        if (tau_im[k] <= tau_jm[l]) and (tau_jm[l] <= tau_im[k+1]) and \
-                               (tau_im[k+1] <= tau_jm[l+1]):
-                            temp += \
-                                 (tau_im[k+1]-tau_jm[l])**5-(tau_im[k]-tau_jm[l+1])**5+\
-                                 (tau_im[k]-tau_jm[l])**5+(tau_im[k+1]-tau_jm[l+1])**5
-                        if tau_im[k+1] <= tau_jm[l]:
-                            temp += \
-                                 -(tau_im[k+1]-tau_jm[l])**5-(tau_im[k]-tau_jm[l+1])**5+\
-                                 (tau_im[k]-tau_jm[l])**5+(tau_im[k+1]-tau_jm[l+1])**5
-                        Gpr_block[k, l] += temp*w_list[i][m]*w_list[j][m]/20.0
-
-            Gpr[n_cumsum[i]:n_cumsum[i+1],
-                n_cumsum[j]:n_cumsum[j+1]] = Gpr_block
+    # Compute the G matrix. The analytic expression for each entry
+    # Gpr_block[k, l] of the block associated with neurons i and j
+    # is equivalent to the integration described in the comment below,
+    # summed over all signals m:
+    #
+    # def psi(t):
+    #     if t <= tau_jm[l]:
+    #         result = (t-tau_jm[l+1])**4-(t-tau_jm[l])**4
+    #     elif t <= tau_jm[l+1]:
+    #         result = (t-tau_jm[l+1])**4+(t-tau_jm[l])**4
+    #     else:
+    #         result = (t-tau_jm[l])**4-(t-tau_jm[l+1])**4
+    #     return w_list[j][m]*0.25*result
+    # Gpr_block[k, l] += \
+    #              w_list[i][m]*scipy.integrate.quad(psi, tau_im[k],
+    #                                tau_im[k+1])[0]
+    tasks = [((n_cumsum[i], n_cumsum[i+1], n_cumsum[j], n_cumsum[j+1]),
+              (tau_list[i], tau_list[j], w_list[i], w_list[j])) \
+             for i in xrange(N) for j in xrange(N)]
+    assemble_blocks(Gpr, tasks, _iaf_delay_G_block, n_workers, executor)
 
     # Compute the reconstruction coefficients:
     cd = np.dot(np.linalg.pinv(Gpr), qz)
@@ -1482,7 +2293,7 @@ def iaf_decode_delay(s_list, T, dt, b_list, d_list, k_list, a_list, w_list):
                                                 ((t-tau[k])**4-(t-tau[k+1])**4)))
 
             # Compute offset before loop to save time:
-            nj = np.sum(n_list[:j])
+            nj = n_cumsum[j]
             for k in xrange(n_list[j]):
                 u_rec_list[i] += cd[nj+k]*psi(t, k)
 
@@ -24,10 +24,11 @@ from pycuda.compiler import SourceModule
 import pycuda.gpuarray as gpuarray
 import pycuda.driver as drv
 import numpy as np
-from scipy.signal import resample
 
 import scikits.cuda.linalg as culinalg
 import scikits.cuda.misc as cumisc
+from bionet.ted.spikes import SpikeTrain, spike_intervals
+from bionet.utils.signal_extras import Upsampler
 
 # Get installation location of C headers:
 from scikits.cuda import install_headers
@@ -106,7 +107,8 @@ __global__ void iaf_encode(FLOAT *u, FLOAT *s,
 """)
 
 def iaf_encode(u, dt, b, d, R=np.inf, C=1.0, dte=0.0, y=0.0, interval=0.0,
-               quad_method='trapz', full_output=False):
+               quad_method='trapz', full_output=False, spike_train=False,
+               flush=True):
     """
     IAF time encoding machine.
 
@@ -127,9 +129,11 @@ def iaf_encode(u, dt, b, d, R=np.inf, C=1.0, dte=0.0, y=0.0, interval=0.0,
         Neuron resistance.
     C : float
         Neuron capacitance.
-    dte : float
+    dte : float or Upsampler
         Sampling resolution assumed by the encoder (s).
-        This may not exceed `dt`.
+        This may not exceed `dt`. If finer than `dt`, the signal is
+        interpolated block by block with an `Upsampler`, which is
+        returned in place of `dte` when `full_output` is set.
     y : float
         Initial value of integrator.
     interval : float
@@ -143,10 +147,21 @@ def iaf_encode(u, dt, b, d, R=np.inf, C=1.0, dte=0.0, y=0.0, interval=0.0,
         by the given parameters (with updated values for `y` and `interval`).
         This is useful when the function is called repeatedly to
         encode a long signal.
+    spike_train : bool
+        If set, the encoded signal is returned as a `SpikeTrain`
+        rather than as an array of interspike intervals. This may
+        not be combined with `full_output`.
+    flush : bool
+        If set, all of the interpolated samples are encoded before
+        returning. Otherwise, those associated with the last few
+        entries in `u` are retained by the `Upsampler` and encoded
+        during the next call; this is only useful when the function
+        is called repeatedly with `full_output` set to encode a long
+        signal in blocks.
 
     Returns
     -------
-    s : ndarray of floats
+    s : ndarray of floats or SpikeTrain
         If `full_output` is false, returns the signal encoded as an
         array of interspike intervals.
     [s, dt, b, d, R, C, dte, y, interval, quad_method, full_output] : list
@@ -157,9 +172,22 @@ def iaf_encode(u, dt, b, d, R=np.inf, C=1.0, dte=0.0, y=0.0, interval=0.0,
     -----
     When trapezoidal integration is used, the value of the integral
     will not be computed for the very last entry in `u`.
+    When the signal is interpolated and `flush` is not set, the
+    interpolated samples associated with the last few entries in `u`
+    are encoded during the next call; encoding an empty block flushes
+    them.
 
     """
 
+    if spike_train:
+        if full_output:
+            raise ValueError('spike trains cannot be returned with '
+                             'full output')
+        return SpikeTrain.from_intervals(iaf_encode(u, dt, b, d, R, C, dte,
+                                                    y, interval,
+                                                    quad_method,
+                                                    flush=flush))
+
     # Input sanity check:
     float_type = u.dtype.type
     if float_type == np.float32:
@@ -169,6 +197,38 @@ def iaf_encode(u, dt, b, d, R=np.inf, C=1.0, dte=0.0, y=0.0, interval=0.0,
     else:
         raise ValueError('unsupported data type')
 
+    # Check whether the encoding resolution is finer than that of the
+    # original sampled signal:
+    if not isinstance(dte, Upsampler):
+        if dte > dt:
+            raise ValueError('encoding time resolution must not exceeed original signal resolution')
+        if dte < 0:
+            raise ValueError('encoding time resolution must be nonnegative')
+    if isinstance(dte, Upsampler) or (dte != 0 and dte != dt):
+
+        # Interpolate the signal one block at a time and encode each
+        # interpolated block. The interpolator retains the samples
+        # needed to interpolate across block boundaries and is
+        # returned in place of dte so that subsequent calls continue
+        # the interpolation:
+        if isinstance(dte, Upsampler):
+            upsampler = dte
+        else:
+            upsampler = Upsampler(int(round(dt/dte)))
+        s = []
+        for u_block in upsampler.blocks(u,
+                flush=flush or len(u) == 0,
+                overlap=np.isinf(R) and quad_method == 'trapz'):
+            temp = iaf_encode(u_block.astype(float_type), dt/upsampler.n,
+                              b, d, R, C, 0, y, interval, quad_method, True)
+            s.extend(temp[0])
+            y, interval = temp[7:9]
+        if full_output:
+            return np.array(s, float_type), dt, b, d, R, C, upsampler, y, \
+                   interval, quad_method, full_output
+        else:
+            return np.array(s, float_type)
+
     # Handle empty input:
     Nu = len(u)
     if Nu == 0:
@@ -178,20 +238,6 @@ def iaf_encode(u, dt, b, d, R=np.inf, C=1.0, dte=0.0, y=0.0, interval=0.0,
         else:
             return array((),float)
 
-    # Check whether the encoding resolution is finer than that of the
-    # original sampled signal:
-    if dte > dt:
-        raise ValueError('encoding time resolution must not exceeed original signal resolution')
-    if dte < 0:
-        raise ValueError('encoding time resolution must be nonnegative')
-    if dte != 0 and dte != dt:
-
-        # Resample signal and adjust signal length accordingly:
-        M = int(dt/dte)
-        u = resample(u, len(u)*M)
-        Nu *= M
-        dt = dte
-
     dev = cumisc.get_current_device()
 
     # Configure kernel:
@@ -213,7 +259,7 @@ def iaf_encode(u, dt, b, d, R=np.inf, C=1.0, dte=0.0, y=0.0, interval=0.0,
                block=(1, 1, 1))
 
     if full_output:
-        return s[0:i_s_0[0]], dt, b, d, R, C, y_0[0], interval_0[0], \
+        return s[0:i_s_0[0]], dt, b, d, R, C, dte, y_0[0], interval_0[0], \
                quad_method, full_output
     else:
         return s[0:i_s_0[0]]
@@ -396,7 +442,7 @@ def iaf_decode(s, dur, dt, bw, b, d, R=np.inf, C=1.0):
 
     Parameters
     ----------
-    s : ndarray of floats
+    s : array_like of floats or SpikeTrain
         Encoded signal. The values represent the time between spikes (in s).
     dur : float
         Duration of signal (in s).
@@ -420,6 +466,7 @@ def iaf_decode(s, dur, dt, bw, b, d, R=np.inf, C=1.0):
         Recovered signal.
     """
 
+    s = spike_intervals(s)
     N = len(s)
     float_type = s.dtype.type
     if float_type == np.float32:
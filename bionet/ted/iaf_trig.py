@@ -6,6 +6,7 @@ neuron model and the trigonometric polynomial approximation.
 
 - iaf_decode            - IAF time decoding machine.
 - iaf_decode_pop        - MISO IAF time decoding machine.
+- IAFTrigDecoder        - Streaming MISO IAF time decoding machine.
 """
 
 # Copyright (c) 2009-2015, Lev Givon
@@ -13,14 +14,45 @@ neuron model and the trigonometric polynomial approximation.
 # Distributed under the terms of the BSD license:
 # http://www.opensource.org/licenses/bsd-license
 
-__all__ = ['iaf_decode', 'iaf_decode_pop']
+__all__ = ['iaf_decode', 'iaf_decode_pop', 'IAFTrigDecoder']
 
 import numpy as np
 
+from bionet.ted.synthesis import trig_synth
+import bionet.ted.solvers as solvers
+from bionet.ted.spikes import spike_intervals, spike_times
+
 # Pseudoinverse singular value cutoff:
 __pinv_rcond__ = 1e-8
 
-def iaf_decode(s, dur, dt, bw, b, d, R=np.inf, C=1.0, M=5, smoothing=0.0):
+def _iaf_trig_F(s, ts, bwM, M, RC):
+    """
+    Compute the reconstruction matrix of an IAF time decoding machine
+    using trigonometric polynomials.
+
+    Evaluate the integrals of the trigonometric polynomial basis
+    functions `exp(1j*m*bwM*t)`, `m = -M, ..., M`, over the intervals
+    between the spike times `ts` of an ideal (if `RC` is infinite) or
+    leaky IAF neuron; the integrals in the leaky case are weighted by
+    the decay of the neuron's membrane voltage.
+    """
+
+    m = np.arange(-M, M+1)
+    e = np.exp(1j*bwM*np.outer(ts, m))
+    if np.isinf(RC):
+        F = np.empty((len(ts)-1, 2*M+1), complex)
+
+        # The integral of the m == 0 basis function is the length of
+        # each interspike interval:
+        nz = m != 0
+        F[:, nz] = (e[1:, nz]-e[:-1, nz])/(1j*m[nz]*bwM)
+        F[:, M] = s[1:]
+    else:
+        F = (e[1:]-np.exp(-s[1:, np.newaxis]/RC)*e[:-1])/(1j*m*bwM+1/RC)
+    return F
+
+def iaf_decode(s, dur, dt, bw, b, d, R=np.inf, C=1.0, M=5, smoothing=0.0,
+               dtype=np.float64):
     """
     IAF time decoding machine using trigonometric polynomials.
 
@@ -30,7 +62,7 @@ def iaf_decode(s, dur, dt, bw, b, d, R=np.inf, C=1.0, M=5, smoothing=0.0):
 
     Parameters
     ----------
-    s : ndarray of floats
+    s : array_like of floats or SpikeTrain
         Encoded signal. The values represent the time between spikes (in s).
     dur : float
         Duration of signal (in s).
@@ -51,6 +83,14 @@ def iaf_decode(s, dur, dt, bw, b, d, R=np.inf, C=1.0, M=5, smoothing=0.0):
         2*M+1 coefficients are used for reconstructing the signal.
     smoothing : float
         Smoothing parameter.
+    dtype : {numpy.float64, numpy.float32}
+        Floating point type used to compute the reconstruction
+        coefficients and the recovered signal; the reconstruction
+        matrix is complex with the same precision. Since the
+        coefficients are obtained from the normal equations, whose
+        condition number is the square of that of the reconstruction
+        matrix, single precision is only suitable for well-conditioned
+        problems; see `bionet.ted.solvers`.
 
     Returns
     -------
@@ -65,39 +105,27 @@ def iaf_decode(s, dur, dt, bw, b, d, R=np.inf, C=1.0, M=5, smoothing=0.0):
         raise ValueError('2*pi*M/bw must exceed the signal length')
 
     bwM = bw/M
-    em = lambda m, t: np.exp(1j*m*bwM*t)
 
     RC = R*C
-    ts = np.cumsum(s)
-    F = np.empty((N-1, 2*M+1), complex)
+    ts = spike_times(s)
+    s = np.asarray(spike_intervals(s))
+    F = np.asarray(_iaf_trig_F(s, ts, bwM, M, RC),
+                   np.result_type(dtype, np.complex64))
     if np.isinf(R):
-        for k in xrange(N-1):
-            for m in xrange(-M, M+1):
-                if m == 0:
-                    F[k, m+M] = s[k+1]
-                else:
-                    F[k, m+M] = np.conj((em(-m, ts[k+1])-em(-m, ts[k]))/(-1j*m*bwM))
         q = C*d-b*s[1:]
     else:
-        for k in xrange(N-1):
-            for m in xrange(-M, M+1):
-                yk = RC*(1-np.exp(-s[k+1]/RC))
-                F[k, m+M] = np.conj((RC*em(-m, ts[k+1])+(yk-RC)*em(-m, ts[k]))/(1-1j*m*bwM*RC))
         q = C*(d+b*R*(np.exp(-s[1:]/RC)-1))
+    q = np.asarray(q, dtype)
 
     FH = F.conj().T
-    c = np.dot(np.dot(np.linalg.pinv(np.dot(FH,
-                                            F)+(N-1)*smoothing*np.eye(2*M+1),
-                                     __pinv_rcond__), FH), q)
-    t = np.arange(0, dur, dt)
-    u_rec = np.zeros(len(t), complex)
-    for m in xrange(-M, M+1):
-        u_rec += c[m+M]*em(m, t)
+    c = solvers.solve(np.dot(FH, F)+(N-1)*smoothing*np.eye(2*M+1, dtype=dtype),
+                      np.dot(FH, q), 'pinv', __pinv_rcond__)
 
-    return np.real(u_rec)
+    # Reconstruct the signal using the coefficients:
+    return np.asarray(np.real(trig_synth(c, -M*bwM, bwM, dur, dt)), dtype)
 
 def iaf_decode_pop(s_list, dur, dt, bw, b_list, d_list, R_list,
-                   C_list, M=5, smoothing=0.0):
+                   C_list, M=5, smoothing=0.0, dtype=np.float64):
     """
     Multi-input single-output IAF time decoding machine.
 
@@ -107,7 +135,7 @@ def iaf_decode_pop(s_list, dur, dt, bw, b_list, d_list, R_list,
 
     Parameters
     ----------
-    s_list : list of ndarrays of floats
+    s_list : list of ndarrays of floats or SpikeEnsemble
         Signal encoded by an ensemble of encoders. The values represent the
         time between spikes (in s). The number of arrays in the list
         corresponds to the number of encoders in the ensemble.
@@ -130,6 +158,14 @@ def iaf_decode_pop(s_list, dur, dt, bw, b_list, d_list, R_list,
         2*M+1 coefficients are used for reconstructing the signal.
     smoothing : float
         Smoothing parameter.
+    dtype : {numpy.float64, numpy.float32}
+        Floating point type used to compute the reconstruction
+        coefficients and the recovered signal; the reconstruction
+        matrix is complex with the same precision. Since the
+        coefficients are obtained from the normal equations, whose
+        condition number is the square of that of the reconstruction
+        matrix, single precision is only suitable for well-conditioned
+        problems; see `bionet.ted.solvers`.
 
     Returns
     -------
@@ -152,13 +188,13 @@ def iaf_decode_pop(s_list, dur, dt, bw, b_list, d_list, R_list,
         raise ValueError('2*pi*M/bw must exceed the signal length')
 
     bwM = bw/M
-    em = lambda m, t: np.exp(1j*m*bwM*t)
 
     # Number of interspike intervals per neuron:
     ns = np.array(map(len, s_list))
 
     # Compute the spike times:
-    ts_list = map(np.cumsum, s_list)
+    ts_list = map(spike_times, s_list)
+    s_list = [np.asarray(spike_intervals(s)) for s in s_list]
 
     # Indices for accessing subblocks of the reconstruction matrix:
     Fi = np.cumsum(np.hstack([0, ns-1]))
@@ -166,50 +202,172 @@ def iaf_decode_pop(s_list, dur, dt, bw, b_list, d_list, R_list,
     # Compute the values of the matrix that must be inverted to obtain
     # the reconstruction coefficients:
     Nq = np.sum(ns)-np.sum(ns>1)
-    F = np.empty((Nq, 2*M+1), complex)
-    q = np.empty((Nq, 1), np.float)
-    if all(np.isinf(R_list)):
-        for i in xrange(N):
-            ts = ts_list[i]
-            F_temp = np.empty((ns[i]-1, 2*M+1), complex)
-            q_temp = np.empty((ns[i], 1), np.float)
-            for k in xrange(ns[i]-1):
-                for m in xrange(-M, M+1):
-                    if m == 0:
-                        F_temp[k, m+M] = s_list[i][k+1]
-                    else:
-                        F_temp[k, m+M] = (em(m, ts[k+1])- \
-                                          em(m, ts[k]))/(1j*m*bwM)
-
-            F[Fi[i]:Fi[i+1], :] = F_temp
+    F = np.empty((Nq, 2*M+1), np.result_type(dtype, np.complex64))
+    q = np.empty((Nq, 1), dtype)
+    for i in xrange(N):
+        RC = R_list[i]*C_list[i]
+        F[Fi[i]:Fi[i+1], :] = _iaf_trig_F(s_list[i], ts_list[i], bwM, M, RC)
+        if np.isinf(R_list[i]):
             q[Fi[i]:Fi[i+1], 0] = \
                 C_list[i]*d_list[i]-b_list[i]*s_list[i][1:]
-    else:
-        for i in xrange(N):
-            ts = ts_list[i]
-            F_temp = np.empty((ns[i]-1, 2*M+1), complex)
-            q_temp = np.empty((ns[i], 1), np.float)
-            RC = R_list[i]*C_list[i]
-            for k in xrange(ns[i]-1):
-                for m in xrange(-M, M+1):
-                    if m == 0:
-                        F_temp[k, m+M] = (np.exp(ts[k+1]/RC)-np.exp(ts[k]/RC))* \
-                                         np.exp(-ts[k+1]/RC)*RC
-                    else:
-                        x = 1j*m*bwM+1/RC
-                        F_temp[k, m+M] = (np.exp(ts[k+1]*x)-np.exp(ts[k]*x))* \
-                                         np.exp(-ts[k+1]/RC)/x
-
-            F[Fi[i]:Fi[i+1], :] = F_temp
+        else:
             q[Fi[i]:Fi[i+1], 0] = \
                 C_list[i]*d_list[i]-b_list[i]*RC*(1-np.exp(-s_list[i][1:]/RC))
 
     FH = F.conj().T
-    c = np.dot(np.dot(np.linalg.pinv(np.dot(FH, F)+(N-1)*smoothing*np.eye(2*M+1), __pinv_rcond__), FH), q)
+    c = solvers.solve(np.dot(FH, F)+(N-1)*smoothing*np.eye(2*M+1, dtype=dtype),
+                      np.dot(FH, q), 'pinv', __pinv_rcond__)
+
+    # Reconstruct the signal using the coefficients:
+    return np.asarray(np.real(trig_synth(c, -M*bwM, bwM, dur, dt)), dtype)
+
+class IAFTrigDecoder(object):
+    """
+    Streaming MISO IAF time decoding machine using trigonometric polynomials.
+
+    Decode a signal encoded with one or more Integrate-and-Fire neurons
+    assuming that the encoded signal is representable in terms of
+    trigonometric polynomials. Rather than storing the reconstruction
+    matrix `F`, whose number of rows is equal to the total number of
+    interspike intervals, the decoder accumulates the products `F^H*F`
+    and `F^H*q` as blocks of interspike intervals are added; its memory
+    use is therefore proportional to `M**2` regardless of the number
+    of spikes.
+
+    Parameters
+    ----------
+    bw : float
+        Signal bandwidth (in rad/s).
+    M : int
+        2*M+1 coefficients are used for reconstructing the signal.
+    smoothing : float
+        Smoothing parameter.
+    dtype : {numpy.float64, numpy.float32}
+        Floating point type used to accumulate the normal equations and
+        compute the reconstruction coefficients and the recovered
+        signal.
+
+    Methods
+    -------
+    add(s, b, d, R=np.inf, C=1.0, neuron=0)
+        Add a block of interspike intervals produced by a neuron.
+    coeffs()
+        Compute the reconstruction coefficients.
+    decode(dur, dt)
+        Reconstruct the signal.
 
-    t = np.arange(0, dur, dt)
-    u_rec = np.zeros(len(t), complex)
-    for m in xrange(-M, M+1):
-        u_rec += c[m+M]*em(m, t)
+    Notes
+    -----
+    Blocks of intervals produced by different neurons may be added in
+    any order, but the blocks produced by each neuron must be added in
+    the order in which they were produced. The smoothing parameter is
+    scaled by the total number of intervals added; when the intervals
+    produced by a single neuron are added, the result is therefore
+    equivalent to that of `iaf_decode`.
+    """
 
-    return np.real(u_rec)
+    def __init__(self, bw, M=5, smoothing=0.0, dtype=np.float64):
+        self.bw = bw
+        self.M = M
+        self.smoothing = smoothing
+        self.bwM = bw/M
+        self.dtype = dtype
+        self.FHF = np.zeros((2*M+1, 2*M+1), np.result_type(dtype, np.complex64))
+        self.FHq = np.zeros(2*M+1, self.FHF.dtype)
+
+        # Number of intervals added:
+        self.n = 0
+
+        # Time of the last spike produced by each neuron:
+        self.t_last = {}
+
+    def add(self, s, b, d, R=np.inf, C=1.0, neuron=0):
+        """
+        Add a block of interspike intervals produced by a neuron.
+
+        Parameters
+        ----------
+        s : ndarray of floats
+            Encoded signal block. The values represent the time between
+            spikes (in s); the first value of the first block added for
+            a neuron represents the time of its first spike.
+        b : float
+            Encoder bias.
+        d : float
+            Encoder threshold.
+        R : float
+            Neuron resistance.
+        C : float
+            Neuron capacitance.
+        neuron : hashable
+            Identifier of the neuron that produced the block.
+        """
+
+        s = np.asarray(s, np.float)
+        if neuron in self.t_last:
+            s = np.hstack(([0.0], s))
+            ts = self.t_last[neuron]+np.cumsum(s)
+        else:
+            ts = np.cumsum(s)
+        if len(ts) == 0:
+            return
+        self.t_last[neuron] = ts[-1]
+        if len(ts) < 2:
+            return
+
+        RC = R*C
+        F = np.asarray(_iaf_trig_F(s, ts, self.bwM, self.M, RC),
+                       self.FHF.dtype)
+        if np.isinf(R):
+            q = C*d-b*s[1:]
+        else:
+            q = C*(d+b*R*(np.exp(-s[1:]/RC)-1))
+        q = np.asarray(q, self.dtype)
+        FH = F.conj().T
+        self.FHF += np.dot(FH, F)
+        self.FHq += np.dot(FH, q)
+        self.n += len(q)
+
+    def coeffs(self):
+        """
+        Compute the reconstruction coefficients.
+
+        Returns
+        -------
+        c : ndarray of complex
+            Coefficients of the basis functions `exp(1j*m*bw*t/M)`,
+            `m = -M, ..., M`.
+        """
+
+        return solvers.solve(self.FHF+ \
+                             self.n*self.smoothing*np.eye(2*self.M+1,
+                                                         dtype=self.dtype),
+                             self.FHq, 'pinv', __pinv_rcond__)
+
+    def decode(self, dur, dt):
+        """
+        Reconstruct the signal.
+
+        Parameters
+        ----------
+        dur : float
+            Duration of signal (in s).
+        dt : float
+            Sampling resolution of original signal; the sampling frequency
+            is 1/dt Hz.
+
+        Returns
+        -------
+        u_rec : ndarray of floats
+            Recovered signal.
+        """
+
+        if 2*np.pi*self.M/self.bw < dur:
+            raise ValueError('2*pi*M/bw must exceed the signal length')
+
+        return np.asarray(np.real(trig_synth(self.coeffs(), -self.M*self.bwM,
+                                             self.bwM, dur, dt)), self.dtype)
+
+    def __repr__(self):
+        return self.__class__.__name__+ \
+            repr((self.bw, self.M, self.smoothing))
@@ -27,6 +27,7 @@ import scikits.cuda.misc as cumisc
 import scikits.cuda.linalg as culinalg
 
 from iaf_cuda import iaf_encode, iaf_encode_pop
+from bionet.ted.spikes import spike_intervals, spike_times
 
 # Get installation location of C headers:
 from scikits.cuda import install_headers
@@ -167,7 +168,7 @@ def iaf_decode(s, dur, dt, bw, b, d, R=np.inf, C=1.0, M=5, smoothing=0.0):
 
     Parameters
     ----------
-    s : ndarray of floats
+    s : array_like of floats or SpikeTrain
         Encoded signal. The values represent the time between spikes (in s).
     dur : float
         Duration of signal (in s).
@@ -196,6 +197,10 @@ def iaf_decode(s, dur, dt, bw, b, d, R=np.inf, C=1.0, M=5, smoothing=0.0):
 
     """
 
+    # Compute the spike times:
+    ts = spike_times(s)
+    s = spike_intervals(s)
+
     N = len(s)
     float_type = s.dtype.type
     if float_type == np.float32:
@@ -237,8 +242,6 @@ def iaf_decode(s, dur, dt, bw, b, d, R=np.inf, C=1.0, M=5, smoothing=0.0):
     # Load data into GPU memory:
     s_gpu = gpuarray.to_gpu(s)
 
-    # XXX: Eventually replace this with a PyCUDA equivalent
-    ts = np.cumsum(s)
     ts_gpu = gpuarray.to_gpu(ts)
 
     # Set up GPUArrays for intermediary data. Note that all of the
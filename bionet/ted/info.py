@@ -9,8 +9,15 @@ signals to and from a time domain representation.
 Available modules
 -----------------
 - asdm           Algorithms based upon the asynchronous sigma-delta modulator.
+- event          Event-driven encoding of analytically specified signals.
 - iaf            Algorithms based upon the integrate-and-fire neuron.
+- operators      Matrix-free linear operators used by the decoding algorithms.
+- parallel       Parallel computation routines used by the decoding algorithms.
+- plans          Reusable decoding algorithms for fixed sets of spike trains.
 - rt             Real-time time encoding and decoding algorithms.
+- solvers        Linear system solvers used by the decoding algorithms.
+- spikes         Spike train data structures.
+- synthesis      Signal synthesis routines used by the decoding algorithms.
 """
 
 # Copyright (c) 2009-2015, Lev Givon
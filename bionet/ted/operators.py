@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+
+"""
+Matrix-free linear operators used by the time decoding algorithms.
+
+- GOperator - Reconstruction matrix of ideal IAF and ASDM decoders.
+
+"""
+
+# Copyright (c) 2009-2015, Lev Givon
+# All rights reserved.
+# Distributed under the terms of the BSD license:
+# http://www.opensource.org/licenses/bsd-license
+
+__all__ = ['GOperator']
+
+import numpy as np
+import scipy.special
+import scipy.sparse.linalg as spla
+
+from bionet.ted.synthesis import _toeplitz_synth, _toeplitz_nodes
+
+# Ratio of the Nyquist interval pi/bw to the spacing of the uniform
+# grid used to evaluate sums of sine integrals:
+__oversample__ = 8
+
+# Maximum number of grid points used to interpolate sums of sine
+# integrals at arbitrary times:
+__max_points__ = 24
+
+# Maximum number of kernel entries to compute at once when evaluating
+# sums of sine integrals directly:
+__block_entries__ = 2**16
+
+def _si_sum_direct(t, tk, a, bw):
+    """
+    Evaluate `sum(a[k]*Si(bw*(t-tk[k]))/pi)` at the times `t` directly.
+    """
+
+    block_size = max(1, __block_entries__/max(len(tk), 1))
+    S = np.empty(len(t), np.float)
+    for i in xrange(0, len(t), block_size):
+        S[i:i+block_size] = \
+            np.dot(scipy.special.sici(bw*(t[i:i+block_size, np.newaxis]-tk))[0], a)
+    return S/np.pi
+
+def _si_sum_fft(t, tk, a, bw, tol):
+    """
+    Evaluate `sum(a[k]*Si(bw*(t-tk[k]))/pi)` at the times `t` by
+    computing the sum on a fine uniform grid with the FFT and
+    interpolating it at the specified times.
+    """
+
+    h = np.pi/(__oversample__*bw)
+
+    # Find the smallest (even) number of grid points whose Lagrange
+    # interpolation error bound, (bw*h)**P/P!*prod(|1/2-k|), does not
+    # exceed the tolerance:
+    for P in xrange(2, __max_points__+1, 2):
+        k = np.arange(-P/2+1, P/2+1)
+        if (bw*h)**P/scipy.special.factorial(P)*np.prod(np.abs(0.5-k)) <= tol:
+            break
+
+    # Compute the sum on the grid; the sine integral's derivatives are
+    # bounded by those of the sinc kernel:
+    t0 = t.min()-(P/2+1)*h
+    Nt = int(np.ceil((t.max()-t0)/h))+P/2+2
+    S_grid = _toeplitz_synth(lambda x: scipy.special.sici(bw*x)[0]/np.pi,
+                             t0, h, Nt, tk, a,
+                             min(_toeplitz_nodes(bw, h, tol), 16))
+
+    # Interpolate the sum at the specified times using the P grid
+    # points surrounding each time:
+    b = np.floor((t-t0)/h).astype(np.int)
+    u = (t-t0)/h-b
+    S = np.zeros(len(t), np.float)
+    for i in k:
+        w = np.ones(len(t), np.float)
+        for j in k:
+            if j != i:
+                w *= (u-j)/float(i-j)
+        S += w*S_grid[b+i]
+    return S
+
+class GOperator(spla.LinearOperator):
+    """
+    Reconstruction matrix of ideal IAF and ASDM decoders.
+
+    Linear operator equivalent to the matrix `G` whose entries
+    `G[i, j] = (Si(bw*(t[i+1]-tsh[j]))-Si(bw*(t[i]-tsh[j])))/pi` are
+    the integrals of the sinc kernels centered at the times `tsh` over
+    the intervals between consecutive spike times `t`. Products with
+    `G` and its transpose are computed without forming `G`.
+
+    Parameters
+    ----------
+    ts : ndarray of floats or list of ndarrays of floats
+        Spike times (in s). If a list of spike time arrays is
+        specified, the rows of `G` correspond to the intervals between
+        consecutive spike times of each array in turn.
+    tsh : ndarray of floats
+        Centers of the sinc kernels (in s).
+    bw : float
+        Signal bandwidth (in rad/s).
+    tol : float
+        Maximum error of the computed products relative to the sum of
+        the magnitudes of the vector entries when `method` is 'fft'.
+    method : {'fft', 'direct'}
+        Method used to compute the products. The 'fft' method
+        evaluates sums of sine integrals on a uniform grid with the
+        FFT; its cost is proportional to `n*log(n)`, where `n` is the
+        number of grid points needed to cover the spike times at a
+        resolution finer than the Nyquist interval `pi/bw`. The
+        'direct' method evaluates the entries of `G` in blocks of rows;
+        its cost is proportional to the number of entries in `G`.
+    """
+
+    def __init__(self, ts, tsh, bw, tol=1e-12, method='fft'):
+        if isinstance(ts, np.ndarray) and ts.ndim == 1:
+            ts_list = [ts]
+        else:
+            ts_list = map(np.asarray, ts)
+        if method not in ['fft', 'direct']:
+            raise ValueError('unrecognized method')
+        self.t = np.hstack(ts_list).astype(np.float)
+        self.tsh = np.asarray(tsh, np.float)
+        self.bw = bw
+        self.tol = tol
+        self.method = method
+
+        # Find the indices of the spike times at the start of each
+        # interval:
+        Ns_cumsum = np.cumsum([0]+map(len, ts_list))
+        self.starts = np.hstack([np.arange(Ns_cumsum[i], Ns_cumsum[i+1]-1)
+                                 for i in xrange(len(ts_list))]).astype(np.int)
+        super(GOperator, self).__init__(np.float,
+                                        (len(self.starts), len(self.tsh)))
+
+    def _si_sum(self, t, tk, a):
+        a = np.ravel(a)
+        if np.iscomplexobj(a):
+            return self._si_sum(t, tk, np.real(a))+ \
+                1j*self._si_sum(t, tk, np.imag(a))
+        if len(t) == 0 or len(tk) == 0:
+            return np.zeros(len(t), np.float)
+        if self.method == 'fft':
+            return _si_sum_fft(t, tk, a, self.bw, self.tol)
+        else:
+            return _si_sum_direct(t, tk, a, self.bw)
+
+    def _matvec(self, x):
+        S = self._si_sum(self.t, self.tsh, x)
+        return S[self.starts+1]-S[self.starts]
+
+    def _rmatvec(self, y):
+        y = np.ravel(y)
+        w = np.zeros(len(self.t), y.dtype)
+        w[self.starts+1] += y
+        w[self.starts] -= y
+
+        # Si is odd:
+        return -self._si_sum(self.tsh, self.t, w)
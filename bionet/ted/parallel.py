@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+
+"""
+Routines for computing parts of the time decoding algorithms in parallel.
+
+- assemble_blocks - Fill the blocks of a matrix in parallel.
+
+"""
+
+# Copyright (c) 2009-2015, Lev Givon
+# All rights reserved.
+# Distributed under the terms of the BSD license:
+# http://www.opensource.org/licenses/bsd-license
+
+__all__ = ['assemble_blocks']
+
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
+
+def _compute_block(task):
+    """
+    Compute a matrix block in a worker process.
+
+    If the matrix is memory-mapped, the block is written directly to
+    the mapped file; otherwise, it is returned to the parent process.
+    """
+
+    func, args, index, memmap_info = task
+    block = func(*args)
+    if memmap_info is None:
+        return index, block
+    filename, dtype, shape, offset = memmap_info
+    G = np.memmap(filename, dtype, 'r+', offset, shape)
+    r0, r1, c0, c1 = index
+    G[r0:r1, c0:c1] = block
+    G.flush()
+    del G
+    return index, None
+
+def assemble_blocks(G, tasks, func, n_workers=1, executor='thread'):
+    """
+    Fill the blocks of a matrix in parallel.
+
+    Parameters
+    ----------
+    G : ndarray or numpy.memmap
+        Preallocated matrix to fill.
+    tasks : list of tuples
+        Blocks to compute. Each tuple `((r0, r1, c0, c1), args)` causes
+        `G[r0:r1, c0:c1]` to be set to `func(*args)`.
+    func : function
+        Function that computes a block. If `executor` is 'process', the
+        function and its arguments must be picklable, i.e., the
+        function must be defined at the top level of a module.
+    n_workers : int
+        Number of workers. If None, the number of processors is used.
+        If 1, the blocks are computed serially.
+    executor : {'thread', 'process'}
+        Type of workers. Threads share `G` with the caller and are
+        most efficient when `func` spends most of its time in numpy
+        routines that release the global interpreter lock. Worker
+        processes return the blocks they compute to the caller unless
+        `G` is a `numpy.memmap`, in which case they write their blocks
+        directly to the mapped file.
+
+    Returns
+    -------
+    G : ndarray or numpy.memmap
+        Filled matrix.
+    """
+
+    if n_workers is None:
+        n_workers = multiprocessing.cpu_count()
+    if n_workers == 1 or len(tasks) <= 1:
+        for (r0, r1, c0, c1), args in tasks:
+            G[r0:r1, c0:c1] = func(*args)
+        return G
+
+    if executor == 'thread':
+        def f(task):
+            (r0, r1, c0, c1), args = task
+            G[r0:r1, c0:c1] = func(*args)
+        pool = ThreadPool(n_workers)
+        try:
+            pool.map(f, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    elif executor == 'process':
+        if isinstance(G, np.memmap):
+            G.flush()
+            memmap_info = (G.filename, G.dtype, G.shape, G.offset)
+        else:
+            memmap_info = None
+        pool = multiprocessing.Pool(n_workers)
+        try:
+            for (r0, r1, c0, c1), block in \
+                    pool.imap_unordered(_compute_block,
+                                        [(func, args, index, memmap_info) \
+                                         for index, args in tasks]):
+                if block is not None:
+                    G[r0:r1, c0:c1] = block
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        raise ValueError('unrecognized executor')
+    return G
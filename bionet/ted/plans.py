@@ -0,0 +1,407 @@
+#!/usr/bin/env python
+
+"""
+Reusable time decoding machines for fixed sets of spike trains.
+
+- DecoderPlan   - Factorized time decoding machine.
+- PlanCache     - Least recently used cache of decoder plans.
+- asdm_plan     - ASDM decoder plan.
+- asdm_pop_plan - MISO ASDM decoder plan.
+- iaf_plan      - IAF decoder plan.
+- iaf_pop_plan  - MISO IAF decoder plan.
+
+The reconstruction matrix of the ASDM and IAF time decoding machines
+only depends on the spike times and the signal bandwidth (and, for
+leaky IAF neurons, on the neurons' time constants), while the quanta
+also depend on the encoding parameters. A plan computes the
+pseudoinverse of the reconstruction matrix once; signals may then be
+decoded for different encoding parameters, several sets of quanta, or
+different output grids without recomputing it.
+
+"""
+
+# Copyright (c) 2009-2015, Lev Givon
+# All rights reserved.
+# Distributed under the terms of the BSD license:
+# http://www.opensource.org/licenses/bsd-license
+
+__all__ = ['DecoderPlan', 'PlanCache', 'asdm_plan', 'asdm_pop_plan',
+           'iaf_plan', 'iaf_pop_plan']
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from bionet.ted.synthesis import sinc_synth
+from bionet.ted.iaf import _iaf_G_block, _iaf_quanta
+from bionet.ted.asdm import _asdm_G_block, _asdm_quanta
+from bionet.ted.spikes import spike_intervals, spike_midpoints, spike_times
+
+# Pseudoinverse singular value cutoff:
+__pinv_rcond__ = 1e-8
+
+class DecoderPlan(object):
+    """
+    Factorized time decoding machine.
+
+    Decode signals encoded by a fixed set of spike trains as weighted
+    sums of sinc kernels.
+
+    Parameters
+    ----------
+    G : ndarray
+        Reconstruction matrix.
+    tsh : ndarray of floats
+        Centers of the sinc kernels (in s).
+    bw : float
+        Signal bandwidth (in rad/s).
+    quanta : callable
+        Function that computes the quanta from the encoding parameters
+        passed to `decode()`.
+    rcond : float
+        Pseudoinverse singular value cutoff.
+
+    Methods
+    -------
+    solve(q)
+        Compute the reconstruction coefficients.
+    synthesize(c, dur, dt)
+        Reconstruct a signal from its coefficients.
+    decode(dur, dt, *args)
+        Reconstruct a signal from its encoding parameters.
+    """
+
+    def __init__(self, G, tsh, bw, quanta=None, rcond=__pinv_rcond__):
+        self.G_inv = np.linalg.pinv(G, rcond)
+        self.tsh = tsh
+        self.bw = bw
+        self.quanta = quanta
+
+    def solve(self, q):
+        """
+        Compute the reconstruction coefficients.
+
+        Parameters
+        ----------
+        q : ndarray of floats
+            Quanta. If `q` has several columns, the coefficients are
+            computed for each column.
+
+        Returns
+        -------
+        c : ndarray
+            Reconstruction coefficients with the same shape as `q`.
+        """
+
+        return np.dot(self.G_inv, q)
+
+    def synthesize(self, c, dur, dt):
+        """
+        Reconstruct a signal from its coefficients.
+
+        Parameters
+        ----------
+        c : ndarray
+            Reconstruction coefficients. Since the sinc kernels are
+            real, only the real part of the coefficients contributes
+            to the signal. If `c` has several columns, a signal is
+            reconstructed for each column.
+        dur : float
+            Duration of signal (in s).
+        dt : float
+            Sampling resolution of signal; the sampling frequency is
+            1/dt Hz.
+
+        Returns
+        -------
+        u_rec : ndarray of floats
+            Recovered signal; if `c` has several columns, the signal
+            reconstructed from each column is stored in the
+            corresponding column of `u_rec`.
+        """
+
+        c = np.real(c)
+        if c.ndim == 1:
+            return sinc_synth(self.tsh, c, dur, dt, self.bw)
+        else:
+            return np.column_stack([sinc_synth(self.tsh, c[:, i], dur,
+                                               dt, self.bw) \
+                                    for i in xrange(c.shape[1])])
+
+    def decode(self, dur, dt, *args):
+        """
+        Reconstruct a signal from its encoding parameters.
+
+        Parameters
+        ----------
+        dur : float
+            Duration of signal (in s).
+        dt : float
+            Sampling resolution of signal; the sampling frequency is
+            1/dt Hz.
+        args : sequence
+            Encoding parameters passed to the plan's quanta function.
+
+        Returns
+        -------
+        u_rec : ndarray of floats
+            Recovered signal.
+        """
+
+        if self.quanta is None:
+            raise ValueError('plan has no quanta function')
+        return self.synthesize(self.solve(self.quanta(*args)), dur, dt)
+
+    def __repr__(self):
+        return self.__class__.__name__+'(%d kernels, bw=%r)' % \
+            (len(self.tsh), self.bw)
+
+def _hash(x):
+    """
+    Compute a digest of an array.
+    """
+
+    return hashlib.sha1(np.ascontiguousarray(x, np.float).tostring()).hexdigest()
+
+class PlanCache(object):
+    """
+    Least recently used cache of decoder plans.
+
+    Parameters
+    ----------
+    max_plans : int
+        Maximum number of plans to retain. When a plan is added to a
+        full cache, the least recently used plan is discarded.
+
+    Methods
+    -------
+    get(key, build)
+        Retrieve a plan, building it if necessary.
+    clear()
+        Discard all plans.
+
+    Notes
+    -----
+    The plan builders in this module use the digests of the spike
+    trains and the other parameters that determine the reconstruction
+    matrix as cache keys.
+    """
+
+    def __init__(self, max_plans=8):
+        self.max_plans = max_plans
+        self.plans = OrderedDict()
+
+    def get(self, key, build):
+        """
+        Retrieve a plan, building it if necessary.
+
+        Parameters
+        ----------
+        key : hashable
+            Key identifying the plan.
+        build : callable
+            Function that builds the plan if it is not in the cache.
+
+        Returns
+        -------
+        plan : DecoderPlan
+            Retrieved plan.
+        """
+
+        try:
+            plan = self.plans.pop(key)
+        except KeyError:
+            plan = build()
+            while len(self.plans) >= max(self.max_plans, 1):
+                self.plans.popitem(last=False)
+        self.plans[key] = plan
+        return plan
+
+    def clear(self):
+        """
+        Discard all plans.
+        """
+
+        self.plans.clear()
+
+    def __contains__(self, key):
+        return key in self.plans
+
+    def __len__(self):
+        return len(self.plans)
+
+def iaf_plan(s, bw, R=np.inf, C=1.0, cache=None):
+    """
+    IAF decoder plan.
+
+    Build a plan for decoding signals encoded with an Integrate-and-Fire
+    neuron. The plan's `decode()` method accepts the parameters
+    `b, d` (the encoder bias and threshold) after the duration and
+    sampling resolution of the signal; its result is equivalent to that
+    of `bionet.ted.iaf.iaf_decode`.
+
+    Parameters
+    ----------
+    s : array_like of floats or SpikeTrain
+        Encoded signal. The values represent the time between spikes (in s).
+    bw : float
+        Signal bandwidth (in rad/s).
+    R : float
+        Neuron resistance.
+    C : float
+        Neuron capacitance.
+    cache : PlanCache
+        If specified, the plan is retrieved from or stored in this cache.
+
+    Returns
+    -------
+    plan : DecoderPlan
+        Decoder plan.
+    """
+
+    if cache is not None:
+        return cache.get(('iaf', _hash(s), bw, R, C),
+                         lambda: iaf_plan(s, bw, R, C))
+
+    ts = spike_times(s)
+    tsh = spike_midpoints(s)
+    s = np.asarray(spike_intervals(s))
+    return DecoderPlan(_iaf_G_block(ts, tsh, bw, R*C), tsh, bw,
+                       lambda b, d: _iaf_quanta(s, b, d, R, C))
+
+def iaf_pop_plan(s_list, bw, R_list, C_list, cache=None):
+    """
+    MISO IAF decoder plan.
+
+    Build a plan for decoding a signal encoded with an ensemble of
+    Integrate-and-Fire neurons. The plan's `decode()` method accepts
+    the parameters `b_list, d_list` (the encoder biases and thresholds)
+    after the duration and sampling resolution of the signal; its
+    result is equivalent to that of `bionet.ted.iaf.iaf_decode_pop`.
+
+    Parameters
+    ----------
+    s_list : list of ndarrays of floats or SpikeEnsemble
+        Signal encoded by an ensemble of encoders. The values represent the
+        time between spikes (in s).
+    bw : float
+        Signal bandwidth (in rad/s).
+    R_list : list of floats
+        List of encoder neuron resistances.
+    C_list : list of floats.
+        List of encoder neuron capacitances.
+    cache : PlanCache
+        If specified, the plan is retrieved from or stored in this cache.
+
+    Returns
+    -------
+    plan : DecoderPlan
+        Decoder plan.
+    """
+
+    if cache is not None:
+        return cache.get(('iaf_pop', tuple(map(_hash, s_list)), bw,
+                          tuple(R_list), tuple(C_list)),
+                         lambda: iaf_pop_plan(s_list, bw, R_list, C_list))
+
+    M = len(s_list)
+    if not M:
+        raise ValueError('no spike data given')
+    ts_list = map(spike_times, s_list)
+    tsh_list = map(spike_midpoints, s_list)
+    s_list = map(np.asarray, map(spike_intervals, s_list))
+    G = np.vstack([np.hstack([_iaf_G_block(ts_list[l], tsh_list[m], bw,
+                                           R_list[l]*C_list[l]) \
+                              for m in xrange(M)]) for l in xrange(M)])
+    def quanta(b_list, d_list):
+        return np.hstack([_iaf_quanta(s_list[l], b_list[l], d_list[l],
+                                      R_list[l], C_list[l]) \
+                          for l in xrange(M)])
+    return DecoderPlan(G, np.hstack(tsh_list), bw, quanta)
+
+def asdm_plan(s, bw, cache=None):
+    """
+    ASDM decoder plan.
+
+    Build a plan for decoding signals encoded with an Asynchronous
+    Sigma-Delta Modulator. The plan's `decode()` method accepts the
+    parameters `b, d, k=1.0, sgn=-1` (the encoder bias, threshold,
+    integration constant, and the sign of the first spike) after the
+    duration and sampling resolution of the signal; its result is
+    equivalent to that of `bionet.ted.asdm.asdm_decode`.
+
+    Parameters
+    ----------
+    s : array_like of floats or SpikeTrain
+        Encoded signal. The values represent the time between spikes (in s).
+    bw : float
+        Signal bandwidth (in rad/s).
+    cache : PlanCache
+        If specified, the plan is retrieved from or stored in this cache.
+
+    Returns
+    -------
+    plan : DecoderPlan
+        Decoder plan.
+    """
+
+    if cache is not None:
+        return cache.get(('asdm', _hash(s), bw), lambda: asdm_plan(s, bw))
+
+    if len(s) < 2:
+        raise ValueError('s must contain at least 2 elements')
+    ts = spike_times(s)
+    tsh = spike_midpoints(s)
+    s = np.asarray(spike_intervals(s))
+    return DecoderPlan(_asdm_G_block(ts, tsh, bw), tsh, bw,
+                       lambda b, d, k=1.0, sgn=-1: \
+                           _asdm_quanta(s, b, d, k, sgn))
+
+def asdm_pop_plan(s_list, bw, cache=None):
+    """
+    MISO ASDM decoder plan.
+
+    Build a plan for decoding a signal encoded with an ensemble of
+    Asynchronous Sigma-Delta Modulators. The plan's `decode()` method
+    accepts the parameters `b_list, d_list, k_list, sgn_list=[]` after
+    the duration and sampling resolution of the signal; its result is
+    equivalent to that of `bionet.ted.asdm.asdm_decode_pop`.
+
+    Parameters
+    ----------
+    s_list : list of ndarrays of floats or SpikeEnsemble
+        Signal encoded by an ensemble of encoders. The values represent the
+        time between spikes (in s).
+    bw : float
+        Signal bandwidth (in rad/s).
+    cache : PlanCache
+        If specified, the plan is retrieved from or stored in this cache.
+
+    Returns
+    -------
+    plan : DecoderPlan
+        Decoder plan.
+    """
+
+    if cache is not None:
+        return cache.get(('asdm_pop', tuple(map(_hash, s_list)), bw),
+                         lambda: asdm_pop_plan(s_list, bw))
+
+    M = len(s_list)
+    if not M:
+        raise ValueError('no spike data given')
+    ts_list = map(spike_times, s_list)
+    tsh_list = map(spike_midpoints, s_list)
+    s_list = map(np.asarray, map(spike_intervals, s_list))
+    G = np.vstack([np.hstack([_asdm_G_block(ts_list[l], tsh_list[m], bw) \
+                              for m in xrange(M)]) for l in xrange(M)])
+    def quanta(b_list, d_list, k_list, sgn_list=[]):
+        if sgn_list == []:
+            sgn_list = M*[-1]
+        if len(sgn_list) != M:
+            raise ValueError('incorrect number of first spike signs')
+        return np.hstack([_asdm_quanta(s_list[l], b_list[l], d_list[l],
+                                       k_list[l], sgn_list[l]) \
+                          for l in xrange(M)])
+    return DecoderPlan(G, np.hstack(tsh_list), bw, quanta, 1e-15)
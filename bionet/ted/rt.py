@@ -44,6 +44,11 @@ if debug:
         debug_plot_figsize = (7, 5)
         debug_plot_dpi = 100
 
+import collections
+import itertools
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+
 import numpy as np
 
 import bionet.utils.misc as m
@@ -51,6 +56,56 @@ import bionet.utils.numpy_extras as ne
 import bionet.ted.asdm as asdm
 import bionet.ted.iaf as iaf
 import bionet.ted.vtdm as vtdm
+from bionet.ted.spikes import SpikeEnsemble, SpikeTrain, spike_intervals, \
+     spike_times
+
+class _ArrayWriter(object):
+    """
+    Write successive blocks of data into an array.
+
+    If no output array is specified, the blocks are written into an
+    internal array whose size is doubled whenever it is too small to
+    contain them.
+    """
+
+    def __init__(self, out=None):
+        self.data = out
+        self.fixed = out is not None
+        self.n = 0
+
+    def put(self, y):
+        """Write the block `y` after the blocks already written."""
+
+        y = np.asarray(y)
+        n = len(y)
+        if self.fixed:
+            if self.n+n > len(self.data):
+                raise ValueError('output array is too small')
+        elif self.data is None:
+            self.data = np.empty(max(2*n, 1024), y.dtype)
+        elif self.n+n > len(self.data) or \
+                not np.can_cast(y.dtype, self.data.dtype):
+            capacity = len(self.data)
+            while capacity < self.n+n:
+                capacity *= 2
+            data = np.empty(capacity,
+                            np.result_type(self.data.dtype, y.dtype))
+            data[0:self.n] = self.data[0:self.n]
+            self.data = data
+        self.data[self.n:self.n+n] = y
+        self.n += n
+
+    def result(self):
+        """Return the data written so far."""
+
+        if self.data is None:
+            return np.array((), np.float)
+        if self.fixed:
+            return self.data[0:self.n]
+
+        # Release the unused portion of the internal array:
+        self.data.resize(self.n, refcheck=False)
+        return self.data
 
 class SignalProcessor(object):
     """
@@ -78,22 +133,28 @@ class SignalProcessor(object):
 
         self.params = args
 
-    def __call__(self, x):
+    def __call__(self, x, chunk_size=None, out=None):
         """Calling a class instance is equivalent to running the
-        processor on the specified sequence `x`."""
-
-        result = []
-        iterator = m.chunks(x, len(x)/10)
+        processor on the specified sequence `x` in chunks of
+        `chunk_size` entries (one tenth of `x` by default). The
+        processed data is returned in an array; if `out` is
+        specified, the data is written into it (it may be a
+        `numpy.memmap`) and the filled portion of `out` is returned."""
+
+        if chunk_size is None:
+            chunk_size = max(len(x)/10, 1)
+        if chunk_size < 1:
+            raise ValueError('chunk size must be at least 1')
+        writer = _ArrayWriter(out)
+        iterator = m.chunks(x, chunk_size)
         def get():
             try:
                 return iterator.next()
             except StopIteration:
                 return []
-        def put(y):
-            result.extend(y)
 
-        self.process(get, put)
-        return result
+        self.process(get, writer.put)
+        return writer.result()
 
     def process(self, get, put):
         """Process data obtained in blocks from the function `get()`
@@ -150,14 +211,18 @@ class RealTimeEncoder(SignalProcessor):
         # The invocation of self.encode() assumes that the method
         # returns a tuple containing processed data in its first entry
         # followed by all of the parameters be passed back to the
-        # method in subsequent invocations:
+        # method in subsequent invocations. Since the blocks are
+        # encoded without flushing, the final empty block is also
+        # encoded so as to flush any data retained by the encoder:
         while True:
             input_data = get()
-            if len(input_data) == 0:
-                break
             temp = self.encode(input_data)
             encoded_data = temp[0]
             self.params = temp[1:]
+            if len(input_data) == 0:
+                if len(encoded_data):
+                    put(encoded_data)
+                break
             put(encoded_data)
 
 class RealTimeDecoder(SignalProcessor):
@@ -181,17 +246,38 @@ class RealTimeDecoder(SignalProcessor):
         block.
     K : int
         Number of spikes in the overlap between successive blocks.
+    n_workers : int
+        Number of workers used to decode blocks concurrently. If None,
+        the number of processors is used. If 1, the blocks are
+        decoded serially.
+    executor : {'thread', 'process'}
+        Type of workers used to decode blocks when `n_workers` exceeds 1.
+    lookahead : int
+        Maximum number of blocks read ahead of the block currently
+        being stitched. If None, twice the number of workers is used.
 
     Methods
     -------
     decode(data, ...)
         Decode a block of data using the additional parameters.
+    decode_task(data, dur, sgn)
+        Return a function and arguments that decode a block of data.
     process(get, put)
         Process data obtained from `get()` and write it using `put()`.
 
+    Notes
+    -----
+    Each block is decoded independently of the others; only the
+    stitching of the decoded blocks must be performed in order. When
+    `n_workers` exceeds 1, up to `lookahead` blocks are therefore
+    decoded concurrently by the function returned by `decode_task()`
+    and stitched as soon as the earliest of them is available. The
+    decoded signal is identical to that obtained serially.
+
     """
 
-    def __init__(self, dt, bw, N, M, K):
+    def __init__(self, dt, bw, N, M, K, n_workers=1, executor='thread',
+                 lookahead=None):
 
         SignalProcessor.__init__(self, dt, bw, N, M, K)
 
@@ -209,12 +295,26 @@ class RealTimeDecoder(SignalProcessor):
         self.K = K
         self.J = N-2*M-K # number of spikes between overlapping blocks
 
+        if n_workers is None:
+            n_workers = multiprocessing.cpu_count()
+        if n_workers < 1:
+            raise ValueError('n_workers must be at least 1')
+        if executor not in ['thread', 'process']:
+            raise ValueError('unrecognized executor')
+        if lookahead is None:
+            lookahead = 2*n_workers
+        if lookahead < 1:
+            raise ValueError('lookahead must be at least 1')
+        self.n_workers = n_workers
+        self.executor = executor
+        self.lookahead = lookahead
+
         # Needed to adjust sign for compensation principle used in
         # decoding algorithm:
         self.sgn = 1
 
         # Spike intervals and spike indicies:
-        self.s = []
+        self.s = np.array((), np.float)
         self.tk = np.array((), np.float)
 
         # Overlap:
@@ -240,21 +340,29 @@ class RealTimeDecoder(SignalProcessor):
             self.ax.set_ylabel('y(t)')
             self.offset = 0.0
 
-    def decode(self, *args):
+    def decode(self, data):
         """Decode a block of data. This method must be reimplemented
-        to use a specific decoding algorithm implementation."""
+        to use a specific decoding algorithm implementation unless
+        `decode_task()` is reimplemented."""
 
-        pass
+        func, args = self.decode_task(data, self.curr_dur, self.sgn)
+        return func(*args)
 
-    def process(self, get, put):
-        """Decode data returned in blocks by function `get()` and
-        write it to some destination using the function `put()`."""
+    def decode_task(self, data, dur, sgn):
+        """Return a function and the arguments with which it must be
+        called to decode the block of data `data` of duration `dur`
+        whose first spike has sign `sgn`. This method must be
+        reimplemented to decode blocks concurrently; when the blocks
+        are decoded by worker processes, the function and its
+        arguments must be picklable."""
 
-        SignalProcessor.process(self, get, put)
+        raise NotImplementedError
 
-        # Set up a buffer to queue input data from the source:
-        # XXX: the number of initial entries here is arbitrary:
-        sb = m.SerialBuffer(get, 10*self.N)
+    def _blocks(self, sb):
+        """Read the spike intervals in successive blocks from the
+        buffer `sb` and yield the intervals in each block
+        along with the sign of its first spike and its window
+        flags."""
 
         while True:
 
@@ -269,7 +377,7 @@ class RealTimeDecoder(SignalProcessor):
                 self.window_right = False
 
             # Add the read data to the block to be decoded:
-            self.s.extend(self.intervals_to_add)
+            self.s = np.hstack((self.s, self.intervals_to_add))
 
             # After the first block, the number of extra spike
             # intervals to read during subsequent iterations should be
@@ -277,76 +385,15 @@ class RealTimeDecoder(SignalProcessor):
             if self.intervals_needed != self.J:
                 self.intervals_needed = self.J
             else:
-                del self.s[0:self.J]
-
-            # Find the times of the spikes in the current block:
-            self.ts = np.cumsum(self.s)
-            self.tk = np.array(np.round(self.ts/self.dt), int)
-            self.curr_dur = max(self.ts)
-            self.t = np.arange(0, self.curr_dur, self.dt)
-
-            # Decode the current block:            
-            self.u = self.decode(self.s)
-
-            # Discard the portion of the reconstructed signal after
-            # the second to last spike interval for all blocks except the
-            # last one:
-            if self.window_right:
-                self.n = self.tk[-1]
-                self.tk = self.tk[0:-1]
-                self.u = self.u[0:self.n]
-                self.t = self.t[0:self.n]
+                self.s = self.s[self.J:]
+
+            yield self.s, self.sgn, self.window_left, self.window_right
 
             # The sign of the spike at the beginning of the next block
             # must be the reverse of the current one if J is odd:
             if self.J % 2:
                 self.sgn *= -1
 
-            # Construct and apply shaping window to decoded signal:
-            if self.window_left:
-                ll = self.ts[self.M]
-                lr = self.ts[self.M+self.K]
-            else:
-                ll = -self.dt # needed to force first entry in window to be 1
-                lr = 0.0
-            if self.window_right:
-                rl = self.ts[self.N-self.M-self.K]
-                rr = self.ts[self.N-self.M]
-            else:
-                rl = self.t[-1]
-                rr = self.t[-1]
-            self.w = self.window(self.t, ll, lr, rl, rr)
-            self.uw = self.u*self.w
-
-            if debug:
-                self.ax.plot(self.offset+self.t, self.uw)
-
-            # Apart from the first block, the saved nonzero
-            # overlapping portion of the previous block must be
-            # combined with that of the current block:
-            if self.window_left:
-                self.u_out = self.overlap + \
-                             self.uw[self.tk[self.M]:self.tk[self.M+self.K]]
-            else:
-                self.u_out = self.uw[0:self.tk[self.M+self.K]]
-
-            # Apart from the last block, the nonzero portion of the
-            # current block that will overlap with the next block must
-            # be retained for the next iteration:
-            if self.window_right:
-                self.u_out = np.hstack((self.u_out,
-                    self.uw[self.tk[self.M+self.K]:self.tk[self.N-self.M-self.K]]))
-                self.overlap = \
-                    self.uw[self.tk[self.N-self.M-self.K]:self.tk[self.N-self.M]]
-                if debug:
-                    self.offset += self.t[self.tk[self.J-1]]
-            else:
-                self.u_out = np.hstack((self.u_out,
-                                     self.uw[self.tk[self.M+self.K]::]))
-                self.overlap = np.array((), np.float)
-                if debug:
-                    self.offset += 0
-
             # The first block decoded should only be windowed on its
             # right side if at all. Hence, if window_left is false and
             # window_right is true, window_left should be set to true
@@ -355,19 +402,139 @@ class RealTimeDecoder(SignalProcessor):
             if self.window_right and not self.window_left:
                 self.window_left = True
 
-            # Write out the current decoded block:
-            put(self.u_out)
-
             # If window_left is true and window_right is false, the
-            # last block has been decoded and processing is complete:
+            # last block has been read and processing is complete:
             if not self.window_right:
                 break
 
-    def __call__(self, x):
+    def _stitch(self, u, window_left, window_right):
+        """Window the signal `u` decoded from the current block and
+        combine it with the overlapping portion of the previous
+        block. Returns the portion of the decoded signal that is
+        complete."""
+
+        self.u = u
+
+        # Discard the portion of the reconstructed signal after
+        # the second to last spike interval for all blocks except the
+        # last one:
+        if window_right:
+            self.n = self.tk[-1]
+            self.tk = self.tk[0:-1]
+            self.u = self.u[0:self.n]
+            self.t = self.t[0:self.n]
+
+        # Construct and apply shaping window to decoded signal:
+        if window_left:
+            ll = self.ts[self.M]
+            lr = self.ts[self.M+self.K]
+        else:
+            ll = -self.dt # needed to force first entry in window to be 1
+            lr = 0.0
+        if window_right:
+            rl = self.ts[self.N-self.M-self.K]
+            rr = self.ts[self.N-self.M]
+        else:
+            rl = self.t[-1]
+            rr = self.t[-1]
+        self.w = self.window(self.t, ll, lr, rl, rr)
+        self.uw = self.u*self.w
+
+        if debug:
+            self.ax.plot(self.offset+self.t, self.uw)
+
+        # Apart from the first block, the saved nonzero
+        # overlapping portion of the previous block must be
+        # combined with that of the current block:
+        if window_left:
+            self.u_out = self.overlap + \
+                         self.uw[self.tk[self.M]:self.tk[self.M+self.K]]
+        else:
+            self.u_out = self.uw[0:self.tk[self.M+self.K]]
+
+        # Apart from the last block, the nonzero portion of the
+        # current block that will overlap with the next block must
+        # be retained for the next iteration:
+        if window_right:
+            self.u_out = np.hstack((self.u_out,
+                self.uw[self.tk[self.M+self.K]:self.tk[self.N-self.M-self.K]]))
+            self.overlap = \
+                self.uw[self.tk[self.N-self.M-self.K]:self.tk[self.N-self.M]]
+            if debug:
+                self.offset += self.t[self.tk[self.J-1]]
+        else:
+            self.u_out = np.hstack((self.u_out,
+                                 self.uw[self.tk[self.M+self.K]::]))
+            self.overlap = np.array((), np.float)
+            if debug:
+                self.offset += 0
+
+        return self.u_out
+
+    def _set_times(self, s):
+        """Find the times of the spikes in the block with spike
+        intervals `s`."""
+
+        self.ts = np.cumsum(s)
+        self.tk = np.array(np.round(self.ts/self.dt), int)
+        self.curr_dur = max(self.ts)
+        self.t = np.arange(0, self.curr_dur, self.dt)
+
+    def process(self, get, put):
+        """Decode data returned in blocks by function `get()` and
+        write it to some destination using the function `put()`."""
+
+        SignalProcessor.process(self, get, put)
+
+        # Set up a buffer to queue input data from the source; enough
+        # entries to fill all of the blocks that may be read ahead
+        # are loaded:
+        # XXX: the number of initial entries here is arbitrary:
+        sb = m.ArrayBuffer(get, max(10*self.N,
+                                    self.N+2+self.lookahead*self.J))
+
+        if self.n_workers == 1:
+            for s, sgn, window_left, window_right in self._blocks(sb):
+
+                # Decode the current block:
+                self._set_times(s)
+                u = self.decode(s)
+
+                # Write out the current decoded block:
+                put(self._stitch(u, window_left, window_right))
+            return
+
+        # Decode up to lookahead blocks concurrently and stitch them
+        # in the order in which they were read:
+        if self.executor == 'thread':
+            pool = ThreadPool(self.n_workers)
+        else:
+            pool = multiprocessing.Pool(self.n_workers)
+        pending = collections.deque()
+        def stitch_next():
+            s, window_left, window_right, result = pending.popleft()
+            self._set_times(s)
+            put(self._stitch(result.get(), window_left, window_right))
+        try:
+            for s, sgn, window_left, window_right in self._blocks(sb):
+                func, args = self.decode_task(s, max(np.cumsum(s)), sgn)
+                pending.append((s, window_left, window_right,
+                                pool.apply_async(func, args)))
+                if len(pending) >= self.lookahead:
+                    stitch_next()
+            while pending:
+                stitch_next()
+        finally:
+            pool.close()
+            pool.join()
+
+    def __call__(self, x, chunk_size=None, out=None):
         """Calling a class instance is equivalent to running the
-        decoder on the specified sequence `x`."""
+        decoder on the specified sequence `x` of interspike intervals
+        or `SpikeTrain`."""
 
-        result = SignalProcessor.__call__(self, x)
+        result = SignalProcessor.__call__(self, spike_intervals(x),
+                                          chunk_size, out)
         if debug:
             self.canvas = FigureCanvasAgg(self.fig)
             self.canvas.print_figure(debug_plot_filename,
@@ -446,7 +613,7 @@ class ASDMRealTimeEncoder(RealTimeEncoder):
     def encode(self, data):
         """Encode a block of data with an ASDM encoder."""
 
-        return asdm.asdm_encode(data, *self.params)
+        return asdm.asdm_encode(data, *self.params, flush=False)
 
 class ASDMRealTimeDecoder(RealTimeDecoder):
     """
@@ -475,31 +642,40 @@ class ASDMRealTimeDecoder(RealTimeDecoder):
         block.
     K : int
         Number of spikes in the overlap between successive blocks.
+    n_workers : int
+        Number of workers used to decode blocks concurrently.
+    executor : {'thread', 'process'}
+        Type of workers used to decode blocks.
+    lookahead : int
+        Maximum number of blocks read ahead of the block being stitched.
 
     Methods
     -------
     decode(data, ...)
         Decode a block of data using the additional parameters.
+    decode_task(data, dur, sgn)
+        Return a function and arguments that decode a block of data.
     process(get, put)
         Process data obtained from `get()` and write it using `put()`.
 
     """
 
-    def __init__(self, dt, bw, b, d, k, N, M, K):
+    def __init__(self, dt, bw, b, d, k, N, M, K, n_workers=1,
+                 executor='thread', lookahead=None):
 
-        RealTimeDecoder.__init__(self, dt, bw, N, M, K)
+        RealTimeDecoder.__init__(self, dt, bw, N, M, K, n_workers,
+                                 executor, lookahead)
 
         self.b = b
         self.d = d
         self.k = k
 
-    def decode(self, data):
-        """Decode a block of data that was encoded with an ASDM
-        encoder."""
+    def decode_task(self, data, dur, sgn):
+        """Return the function and arguments that decode a block of
+        data that was encoded with an ASDM encoder."""
 
-        return vtdm.asdm_decode_vander(data, self.curr_dur, self.dt,
-                                       self.bw, self.b, self.d, self.k,
-                                       self.sgn)
+        return vtdm.asdm_decode_vander, \
+               (data, dur, self.dt, self.bw, self.b, self.d, self.k, sgn)
 
 class ASDMRealTimeDecoderIns(RealTimeDecoder):
     """
@@ -525,28 +701,38 @@ class ASDMRealTimeDecoderIns(RealTimeDecoder):
         block.
     K : int
         Number of spikes in the overlap between successive blocks.
+    n_workers : int
+        Number of workers used to decode blocks concurrently.
+    executor : {'thread', 'process'}
+        Type of workers used to decode blocks.
+    lookahead : int
+        Maximum number of blocks read ahead of the block being stitched.
 
     Methods
     -------
     decode(data, ...)
         Decode a block of data using the additional parameters.
+    decode_task(data, dur, sgn)
+        Return a function and arguments that decode a block of data.
     process(get, put)
         Process data obtained from `get()` and write it using `put()`.
 
     """
 
-    def __init__(self, dt, bw, b, N, M, K):
+    def __init__(self, dt, bw, b, N, M, K, n_workers=1,
+                 executor='thread', lookahead=None):
 
-        RealTimeDecoder.__init__(self, dt, bw, N, M, K)
+        RealTimeDecoder.__init__(self, dt, bw, N, M, K, n_workers,
+                                 executor, lookahead)
 
         self.b = b
 
-    def decode(self, data):
-        """Decode a block of data that was encoded with an ASDM
-        encoder."""
+    def decode_task(self, data, dur, sgn):
+        """Return the function and arguments that decode a block of
+        data that was encoded with an ASDM encoder."""
 
-        return vtdm.asdm_decode_vander_ins(data, self.curr_dur, self.dt,
-                                           self.bw, self.b, self.sgn)
+        return vtdm.asdm_decode_vander_ins, \
+               (data, dur, self.dt, self.bw, self.b, sgn)
 
 class IAFRealTimeEncoder(RealTimeEncoder):
     """
@@ -593,7 +779,7 @@ class IAFRealTimeEncoder(RealTimeEncoder):
     def encode(self, data):
         """Encode a block of data with an IAF neuron."""
 
-        return iaf.iaf_encode(data, *self.params)
+        return iaf.iaf_encode(data, *self.params, flush=False)
 
 class IAFRealTimeDecoder(RealTimeDecoder):
     """
@@ -624,33 +810,44 @@ class IAFRealTimeDecoder(RealTimeDecoder):
         block.
     K : int
         Number of spikes in the overlap between successive blocks.
+    n_workers : int
+        Number of workers used to decode blocks concurrently.
+    executor : {'thread', 'process'}
+        Type of workers used to decode blocks.
+    lookahead : int
+        Maximum number of blocks read ahead of the block being stitched.
 
     Methods
     -------
     decode(data, ...)
         Decode a block of data using the additional parameters.
+    decode_task(data, dur, sgn)
+        Return a function and arguments that decode a block of data.
     process(get, put)
         Process data obtained from `get()` and write it using `put()`.
 
     """
 
-    def __init__(self, dt, bw, b, d, R, C, N, M, K):
+    def __init__(self, dt, bw, b, d, R, C, N, M, K, n_workers=1,
+                 executor='thread', lookahead=None):
 
-        RealTimeDecoder.__init__(self, dt, bw, N, M, K)
+        RealTimeDecoder.__init__(self, dt, bw, N, M, K, n_workers,
+                                 executor, lookahead)
 
         self.b = b
         self.d = d
         self.R = R
         self.C = C
 
-    def decode(self, data):
-        """Decode a block of data that was encoded with an
-        IAF neuron."""
+    def decode_task(self, data, dur, sgn):
+        """Return the function and arguments that decode a block of
+        data that was encoded with an IAF neuron."""
 
-        return vtdm.iaf_decode_vander(data, self.curr_dur, self.dt,
-                                      self.bw, self.b, self.d, self.R, self.C)
+        return vtdm.iaf_decode_vander, \
+               (data, dur, self.dt, self.bw, self.b, self.d, self.R, self.C)
 
-def iaf_encode(u, dt, b, d, R=np.inf, C=1.0, dte=0, quad_method='trapz'):
+def iaf_encode(u, dt, b, d, R=np.inf, C=1.0, dte=0, quad_method='trapz',
+               chunk_size=None, out=None, spike_train=False):
     """
     Real-time IAF neuron time encoding machine.
     
@@ -678,10 +875,19 @@ def iaf_encode(u, dt, b, d, R=np.inf, C=1.0, dte=0, quad_method='trapz'):
         Quadrature method to use (rectangular or trapezoidal) when the
         neuron is ideal; exponential Euler integration is used
         when the neuron is leaky.
+    chunk_size : int
+        Number of samples of `u` to encode at a time. If None, the
+        signal is encoded in 10 chunks.
+    out : ndarray of floats
+        Array (or `numpy.memmap`) into which to write the encoded
+        signal. If None, an array is allocated.
+    spike_train : bool
+        If set, the encoded signal is returned as a `SpikeTrain`
+        rather than as an array of interspike intervals.
 
     Returns
     -------
-    s : ndarray of floats
+    s : ndarray of floats or SpikeTrain
         Returns the signal encoded as an
         array of time intervals between spikes.
         
@@ -692,10 +898,16 @@ def iaf_encode(u, dt, b, d, R=np.inf, C=1.0, dte=0, quad_method='trapz'):
 
     """
 
+    if spike_train:
+        return SpikeTrain.from_intervals(iaf_encode(u, dt, b, d, R, C, dte,
+                                                    quad_method,
+                                                    chunk_size, out))
+
     encoder = IAFRealTimeEncoder(dt, b, d, R, C, dte, quad_method)
-    return np.asarray(encoder(u))
+    return encoder(u, chunk_size, out)
 
-def iaf_decode(s, dt, bw, b, d, R, C, N=10, M=3, K=1):
+def iaf_decode(s, dt, bw, b, d, R, C, N=10, M=3, K=1, n_workers=1,
+               executor='thread', lookahead=None, chunk_size=None, out=None):
     """
     Real-time IAF neuron time decoding machine.
     
@@ -726,6 +938,19 @@ def iaf_decode(s, dt, bw, b, d, R, C, N=10, M=3, K=1):
         block.
     K : int
         Number of spikes in the overlap between successive blocks.
+    n_workers : int
+        Number of workers used to decode blocks concurrently. If None,
+        the number of processors is used.
+    executor : {'thread', 'process'}
+        Type of workers used to decode blocks.
+    lookahead : int
+        Maximum number of blocks read ahead of the block being stitched.
+    chunk_size : int
+        Number of spike intervals of `s` to read at a time. If None,
+        the intervals are read in 10 chunks.
+    out : ndarray of floats
+        Array (or `numpy.memmap`) into which to write the recovered
+        signal. If None, an array is allocated.
 
     Returns
     -------
@@ -734,11 +959,13 @@ def iaf_decode(s, dt, bw, b, d, R, C, N=10, M=3, K=1):
         
     """
 
-    decoder = IAFRealTimeDecoder(dt, bw, b, d, R, C, N, M, K)
-    return np.asarray(decoder(s))
+    decoder = IAFRealTimeDecoder(dt, bw, b, d, R, C, N, M, K, n_workers,
+                                 executor, lookahead)
+    return decoder(s, chunk_size, out)
 
 def iaf_encode_delay(u_list, T_block, t_begin, dt,
-                     b_list, d_list, k_list, a_list, w_list):
+                     b_list, d_list, k_list, a_list, w_list,
+                     spike_train=False):
     """
     Real-time multi-input multi-output delayed IAF time encoding machine.
 
@@ -766,14 +993,22 @@ def iaf_encode_delay(u_list, T_block, t_begin, dt,
         Array of neuron delays (in s). Must have shape `(N, M)`.
     w_list : array_like
         Array of scaling factors. Must have shape `(N, M)`.
+    spike_train : bool
+        If set, the encoded signals are returned as a `SpikeEnsemble`
+        rather than as a list of arrays of interspike intervals.
 
     Returns
     -------
-    s_list : list
+    s_list : list or SpikeEnsemble
         List of arrays of interspike intervals.
 
     """
 
+    if spike_train:
+        return SpikeEnsemble.from_intervals(
+            iaf_encode_delay(u_list, T_block, t_begin, dt, b_list, d_list,
+                             k_list, a_list, w_list))
+
     M = len(u_list)
     if not M:
         raise ValueError('no spike data given')
@@ -842,7 +1077,7 @@ def _theta1(t, l, r):
 def _theta2(t, l, r):
     return np.cos((np.pi/2)*(t-l)/(r-l))**2
 
-def _get_spike_block(s_list, t_start, t_end):
+def _get_spike_block(s_list, t_start, t_end, ts_list=None):
     """
     Get block of interspike intervals.
 
@@ -858,6 +1093,10 @@ def _get_spike_block(s_list, t_start, t_end):
         Starting time of block.
     t_end : float
         Ending time of block.
+    ts_list : list
+        List of spike time arrays, i.e., the cumulative sums of the
+        arrays in `s_list`. These are computed if not specified;
+        precomputing them avoids doing so for every block.
 
     Returns
     -------
@@ -875,23 +1114,34 @@ def _get_spike_block(s_list, t_start, t_end):
     if t_end <= t_start:
         raise ValueError('t_end must exceed t_start')
 
-    ts_list = map(np.cumsum, s_list)
+    if ts_list is None:
+        ts_list = map(np.cumsum, s_list)
     s_block_list = []
     for i in xrange(len(s_list)):
-        block_indices = \
-                      np.intersect1d(np.where(ts_list[i] > t_start)[0],
-                                     np.where(ts_list[i] <= t_end)[0])
-        s_block = s_list[i][block_indices].copy()
+
+        # The spike times are sorted, so the spikes in the interval
+        # (t_start, t_end] can be found by bisection:
+        k_first, k_last = np.searchsorted(ts_list[i], [t_start, t_end],
+                                          'right')
+        s_block = s_list[i][k_first:k_last].copy()
 
         # Adjust first interspike interval in the block:
-        s_block[0] = ts_list[i][block_indices[0]]-t_start
+        s_block[0] = ts_list[i][k_first]-t_start
 
-        s_block_list.append(s_block.copy())
+        s_block_list.append(s_block)
 
     return s_block_list
 
+def _iaf_decode_delay_block(args):
+    """
+    Decode a block of spikes with `bionet.ted.iaf.iaf_decode_delay`.
+    """
+
+    return iaf.iaf_decode_delay(*args)
+
 def iaf_decode_delay(s_list, T_block, T_overlap, dt,
-                     b_list, d_list, k_list, a_list, w_list):
+                     b_list, d_list, k_list, a_list, w_list,
+                     n_workers=1, executor='thread'):
     """
     Real-time multi-input multi-output delayed IAF time decoding machine.
 
@@ -921,17 +1171,33 @@ def iaf_decode_delay(s_list, T_block, T_overlap, dt,
         Array of neuron delays (in s). Must be of shape `(N, M)`.
     w_list : array_like
         Array of scaling factors. Must be of shape `(N, M)`.
+    n_workers : int
+        Number of workers used to decode blocks concurrently. If None,
+        the number of processors is used. If 1, the blocks are decoded
+        serially.
+    executor : {'thread', 'process'}
+        Type of workers used to decode blocks.
 
     Returns
     -------
     u_list : list
         Decoded signals.
 
+    Notes
+    -----
+    Each block is decoded independently of the others; only the
+    stitching of the decoded blocks must be performed in order.
+
     """
 
     if 2*T_overlap >= T_block:
         raise ValueError('overlap cannot exceed half of the block length')
 
+    # Compute the spike times once so that the spikes in each block
+    # can be found quickly:
+    ts_list = map(spike_times, s_list)
+    s_list = [np.asarray(spike_intervals(s)) for s in s_list]
+
     # Stitching the first and last blocks requires special treatment:
     first_block = True
     last_block = False
@@ -963,51 +1229,20 @@ def iaf_decode_delay(s_list, T_block, T_overlap, dt,
     if k_max < K_block:
         return iaf.iaf_decode_delay(s_list, K*dt, dt, b_list, d_list,
                                           k_list, a_list, w_list)
+    # Select the blocks of spike times to decode:
+    block_list = []
+    task_list = []
     count = 0
     while k_start < k_max:
-
-        # Select block of spike times to decode:
-        s_block_list = _get_spike_block(s_list, k_start*dt, k_end*dt)
+        s_block_list = _get_spike_block(s_list, k_start*dt, k_end*dt,
+                                        ts_list)
         print '%i: window: [%f, %f]' % (count, k_start*dt, k_end*dt)
         count += 1
-
-        # Decode the block:
-        u_curr_list = iaf.iaf_decode_delay(s_block_list, K*dt, dt, b_list, d_list,
-                                                 k_list, a_list, w_list)
-
-        # Convert decoded block into a 2D array to make processing easier:
-        u_curr = np.array(u_curr_list)
-
-        # The first block doesn't need to be stitched on its left side:
-        if first_block:
-            u_block_list.append(u_curr[:, 0:K_overlap])
-        else:
-
-            # Generate windowing functions needed to taper the overlap
-            # from the previous iteration and the overlap from the
-            # current iteration:
-            win_prev = _theta2(np.arange(K_overlap, dtype=np.float), 0,
-                               K_overlap)
-            win_curr = _theta1(np.arange(K_overlap, dtype=np.float), 0,
-                               K_overlap)
-
-            # Stitch and save the overlapping portion of the block:
-            u_block_list.append(u_overlap*win_prev+\
-                                u_curr[:, 0:K_overlap]*win_curr)
-
+        block_list.append((first_block, last_block))
+        task_list.append((s_block_list, K*dt, dt, b_list, d_list,
+                          k_list, a_list, w_list))
         if last_block:
-
-            # Save the rest of the current block and exit:
-            u_block_list.append(u_curr[:, K_overlap:])
             break
-        else:
-
-            # Save the portion of the block that doesn't require stitching:
-            u_block_list.append(u_curr[:, K_overlap:-K_overlap])
-
-            # Retain the overlap on the right side of the decoded
-            # block for the next iteration:
-            u_overlap = u_curr[:, -K_overlap:]
 
         # Advance t_start and t_end allowing for an overlap:
         k_start += K_inc
@@ -1025,6 +1260,60 @@ def iaf_decode_delay(s_list, T_block, T_overlap, dt,
         # Indicate that the first block has been processed:
         if first_block:
             first_block = False
-            
+
+    # Decode the blocks; the decoded blocks are returned in order:
+    if n_workers is None:
+        n_workers = multiprocessing.cpu_count()
+    if n_workers == 1 or len(task_list) == 1:
+        pool = None
+        u_curr_iter = itertools.imap(_iaf_decode_delay_block, task_list)
+    elif executor == 'thread':
+        pool = ThreadPool(n_workers)
+        u_curr_iter = pool.imap(_iaf_decode_delay_block, task_list)
+    elif executor == 'process':
+        pool = multiprocessing.Pool(n_workers)
+        u_curr_iter = pool.imap(_iaf_decode_delay_block, task_list)
+    else:
+        raise ValueError('unrecognized executor')
+
+    # Generate windowing functions needed to taper the overlap from
+    # the previous block and the overlap from the current block:
+    win_prev = _theta2(np.arange(K_overlap, dtype=np.float), 0, K_overlap)
+    win_curr = _theta1(np.arange(K_overlap, dtype=np.float), 0, K_overlap)
+
+    try:
+        for (first_block, last_block), u_curr_list in \
+                itertools.izip(block_list, u_curr_iter):
+
+            # Convert decoded block into a 2D array to make processing easier:
+            u_curr = np.array(u_curr_list)
+
+            # The first block doesn't need to be stitched on its left side:
+            if first_block:
+                u_block_list.append(u_curr[:, 0:K_overlap])
+            else:
+
+                # Stitch and save the overlapping portion of the block:
+                u_block_list.append(u_overlap*win_prev+\
+                                    u_curr[:, 0:K_overlap]*win_curr)
+
+            if last_block:
+
+                # Save the rest of the current block:
+                u_block_list.append(u_curr[:, K_overlap:])
+            else:
+
+                # Save the portion of the block that doesn't require
+                # stitching:
+                u_block_list.append(u_curr[:, K_overlap:-K_overlap])
+
+                # Retain the overlap on the right side of the decoded
+                # block for the next iteration:
+                u_overlap = u_curr[:, -K_overlap:]
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
     # Concatenate all of the decoded blocks and return as a list of arrays:
     return list(np.hstack(u_block_list))
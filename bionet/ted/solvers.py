@@ -0,0 +1,328 @@
+#!/usr/bin/env python
+
+"""
+Linear system solvers used to compute the reconstruction coefficients
+of the time decoding algorithms.
+
+- cg_solve     - Conjugate gradient solver applied to the normal equations.
+- get_solver   - Look up a solver by name.
+- is_iterative - Check whether a solver is iterative.
+- lsqr_solve   - LSQR least-squares solver.
+- minres_solve - MINRES solver applied to the normal equations.
+- pinv_solve   - Pseudoinverse solver.
+- solve        - Solve a system with a specified solver.
+- tsvd_solve   - Truncated or regularized SVD solver.
+
+The direct solvers (`pinv_solve`, `tsvd_solve`) require the system
+matrix to be an ndarray. The iterative solvers (`cg_solve`,
+`lsqr_solve`, `minres_solve`) only access the matrix through
+matrix-vector products, and therefore also accept any object that can
+be converted to a `scipy.sparse.linalg.LinearOperator`; they stop
+iterating once the relative residual falls below a specified
+tolerance.
+
+The decoders that accept a `dtype` parameter may solve their systems
+in single precision. Singular values of single precision matrices
+smaller than about 1e-6 times the largest singular value cannot be
+resolved, so `solve` raises the singular value cutoff of the direct
+solvers to 1e-6 for such matrices. For noiseless spike trains, this
+typically lowers the SNR of the recovered signal by 0-10 dB (to about
+50-60 dB) while halving the memory occupied by the system matrix.
+Because numpy's FFT only operates in double precision, the recovered
+signals are synthesized from the single precision coefficients in
+double precision and then converted to single precision.
+
+"""
+
+# Copyright (c) 2009-2015, Lev Givon
+# All rights reserved.
+# Distributed under the terms of the BSD license:
+# http://www.opensource.org/licenses/bsd-license
+
+__all__ = ['pinv_solve', 'tsvd_solve', 'cg_solve', 'lsqr_solve',
+           'minres_solve', 'get_solver', 'is_iterative', 'solve']
+
+import numpy as np
+import scipy.sparse.linalg as spla
+
+# Pseudoinverse singular value cutoff:
+__pinv_rcond__ = 1e-8
+
+# Relative residual tolerance of the iterative solvers:
+__solver_tol__ = 1e-8
+
+# Smallest singular value cutoff that can be resolved in single
+# precision:
+__single_rcond__ = 1e-6
+
+def pinv_solve(G, q, rcond=__pinv_rcond__):
+    """
+    Pseudoinverse solver.
+
+    Solve `G*c = q` by multiplying `q` by the pseudoinverse of `G`.
+
+    Parameters
+    ----------
+    G : ndarray
+        System matrix.
+    q : ndarray
+        Right-hand side vector or matrix.
+    rcond : float
+        Cutoff for small singular values of `G`.
+
+    Returns
+    -------
+    c : ndarray
+        Solution with the same number of dimensions as `q`.
+    """
+
+    return np.dot(np.linalg.pinv(G, rcond), q)
+
+def tsvd_solve(G, q, rcond=__pinv_rcond__, rank=None, reg=0.0):
+    """
+    Truncated or regularized SVD solver.
+
+    Solve `G*c = q` using the singular value decomposition of `G`.
+    Singular values below `rcond` times the largest singular value are
+    discarded; if `rank` is specified, at most `rank` singular values
+    are retained. If `reg` is nonzero, the retained components are
+    additionally weighted by the Tikhonov filter factors
+    `s**2/(s**2+reg**2)`, i.e., `c` minimizes
+    `||G*c-q||**2+reg**2*||c||**2` over the retained subspace.
+
+    Parameters
+    ----------
+    G : ndarray
+        System matrix.
+    q : ndarray
+        Right-hand side vector or matrix.
+    rcond : float
+        Relative cutoff for small singular values of `G`.
+    rank : int
+        Maximum number of singular values to retain.
+    reg : float
+        Tikhonov regularization parameter.
+
+    Returns
+    -------
+    c : ndarray
+        Solution with the same number of dimensions as `q`.
+    """
+
+    U, s, Vh = np.linalg.svd(G, full_matrices=False)
+    k = np.sum(s > rcond*s[0]) if len(s) else 0
+    if rank is not None:
+        k = min(k, rank)
+    U, s, Vh = U[:, :k], s[:k], Vh[:k]
+
+    # Compute the (filtered) inverses of the retained singular values:
+    s_inv = s/(s**2+reg**2)
+    Uq = np.dot(U.conj().T, q)
+    if Uq.ndim == 1:
+        return np.dot(Vh.conj().T, s_inv*Uq)
+    else:
+        return np.dot(Vh.conj().T, s_inv[:, np.newaxis]*Uq)
+
+def _normal_operator(A):
+    """
+    Return the operator `A^H*A` of the normal equations of `A`.
+    """
+
+    return spla.LinearOperator((A.shape[1], A.shape[1]),
+                               matvec=lambda x: A.rmatvec(A.matvec(x)),
+                               dtype=A.dtype)
+
+def _split(x):
+    """
+    Stack the real and imaginary parts of a complex vector.
+    """
+
+    x = np.ravel(x)
+    return np.hstack((x.real, x.imag))
+
+def _solve_columns(f, q):
+    """
+    Apply the single right-hand side solver `f` to each column of `q`.
+    """
+
+    q = np.asarray(q)
+    if q.ndim == 1:
+        return f(q)
+    else:
+        return np.column_stack([f(q[:, i]) for i in xrange(q.shape[1])])
+
+def cg_solve(G, q, tol=__solver_tol__, maxiter=None):
+    """
+    Conjugate gradient solver applied to the normal equations.
+
+    Solve `G^H*G*c = G^H*q` with the conjugate gradient method.
+
+    Parameters
+    ----------
+    G : ndarray or LinearOperator
+        System matrix.
+    q : ndarray
+        Right-hand side vector or matrix.
+    tol : float
+        Relative residual tolerance of the normal equations at which to
+        stop iterating.
+    maxiter : int
+        Maximum number of iterations.
+
+    Returns
+    -------
+    c : ndarray
+        Solution with the same number of dimensions as `q`.
+    """
+
+    A = spla.aslinearoperator(G)
+    AHA = _normal_operator(A)
+    return _solve_columns(lambda b: spla.cg(AHA, A.rmatvec(b), tol=tol,
+                                            maxiter=maxiter)[0], q)
+
+def lsqr_solve(G, q, tol=__solver_tol__, maxiter=None):
+    """
+    LSQR least-squares solver.
+
+    Solve `G*c = q` in the least-squares sense with the LSQR method.
+
+    Parameters
+    ----------
+    G : ndarray or LinearOperator
+        System matrix.
+    q : ndarray
+        Right-hand side vector or matrix.
+    tol : float
+        Relative residual tolerance at which to stop iterating.
+    maxiter : int
+        Maximum number of iterations.
+
+    Returns
+    -------
+    c : ndarray
+        Solution with the same number of dimensions as `q`.
+    """
+
+    A = spla.aslinearoperator(G)
+    return _solve_columns(lambda b: spla.lsqr(A, b, atol=tol, btol=tol,
+                                              iter_lim=maxiter)[0], q)
+
+def minres_solve(G, q, tol=__solver_tol__, maxiter=None):
+    """
+    MINRES solver applied to the normal equations.
+
+    Solve `G^H*G*c = G^H*q` with the minimum residual method.
+
+    Parameters
+    ----------
+    G : ndarray or LinearOperator
+        System matrix.
+    q : ndarray
+        Right-hand side vector or matrix.
+    tol : float
+        Relative residual tolerance of the normal equations at which to
+        stop iterating.
+    maxiter : int
+        Maximum number of iterations.
+
+    Returns
+    -------
+    c : ndarray
+        Solution with the same number of dimensions as `q`.
+    """
+
+    A = spla.aslinearoperator(G)
+    AHA = _normal_operator(A)
+    if not np.issubdtype(A.dtype, np.complexfloating):
+        return _solve_columns(lambda b: spla.minres(AHA, A.rmatvec(b), tol=tol,
+                                                    maxiter=maxiter)[0], q)
+
+    # MINRES is applied to the equivalent real symmetric system of
+    # twice the size when G is complex:
+    N = AHA.shape[0]
+    AHA_real = spla.LinearOperator((2*N, 2*N),
+                                   matvec=lambda x: _split(AHA.matvec(x[:N]+1j*x[N:])),
+                                   dtype=np.float)
+    def f(b):
+        x = spla.minres(AHA_real, _split(A.rmatvec(b)), tol=tol,
+                        maxiter=maxiter)[0]
+        return x[:N]+1j*x[N:]
+    return _solve_columns(f, q)
+
+_solvers = {'pinv': pinv_solve,
+            'tsvd': tsvd_solve,
+            'cg': cg_solve,
+            'lsqr': lsqr_solve,
+            'minres': minres_solve}
+
+def get_solver(solver):
+    """
+    Look up a solver by name.
+
+    Parameters
+    ----------
+    solver : {'pinv', 'tsvd', 'cg', 'lsqr', 'minres'} or callable
+        Solver name. If `solver` is callable, it is returned unchanged.
+
+    Returns
+    -------
+    f : callable
+        Function that accepts a system matrix and a right-hand side
+        and returns the solution.
+    """
+
+    if callable(solver):
+        return solver
+    try:
+        return _solvers[solver]
+    except KeyError:
+        raise ValueError('unrecognized solver')
+
+def is_iterative(solver):
+    """
+    Check whether a solver is iterative.
+
+    Parameters
+    ----------
+    solver : {'pinv', 'tsvd', 'cg', 'lsqr', 'minres'} or callable
+        Solver name.
+
+    Returns
+    -------
+    result : bool
+        True if `solver` is the name of an iterative solver, i.e., one
+        that only requires products with the system matrix.
+    """
+
+    return solver in ('cg', 'lsqr', 'minres')
+
+def solve(G, q, solver='pinv', rcond=__pinv_rcond__):
+    """
+    Solve a system with a specified solver.
+
+    Parameters
+    ----------
+    G : ndarray or LinearOperator
+        System matrix.
+    q : ndarray
+        Right-hand side vector or matrix.
+    solver : {'pinv', 'tsvd', 'cg', 'lsqr', 'minres'} or callable
+        Solver to use. A callable solver is invoked as `solver(G, q)`;
+        solver parameters other than the defaults may be specified by
+        passing a callable such as `functools.partial(lsqr_solve, tol=1e-6)`.
+    rcond : float
+        Singular value cutoff passed to the 'pinv' and 'tsvd' solvers.
+        If `G` is a single precision matrix, the cutoff is raised to at
+        least 1e-6 because smaller singular values cannot be resolved.
+
+    Returns
+    -------
+    c : ndarray
+        Solution with the same number of dimensions as `q`.
+    """
+
+    if solver in ('pinv', 'tsvd'):
+        if G.dtype in (np.float32, np.complex64):
+            rcond = max(rcond, __single_rcond__)
+        return get_solver(solver)(G, q, rcond)
+    return get_solver(solver)(G, q)
@@ -0,0 +1,317 @@
+#!/usr/bin/env python
+
+"""
+Spike train data structures. The time decoding algorithms accept
+these in place of arrays of interspike intervals.
+
+- SpikeTrain      - Spike times of a single neuron.
+- SpikeEnsemble   - Spike times of a population of neurons.
+- spike_intervals - Return the interspike intervals of a spike train.
+- spike_midpoints - Return the midpoints between successive spikes.
+- spike_times     - Return the spike times of a spike train.
+
+"""
+
+# Copyright (c) 2009-2015, Lev Givon
+# All rights reserved.
+# Distributed under the terms of the BSD license:
+# http://www.opensource.org/licenses/bsd-license
+
+__all__ = ['SpikeTrain', 'SpikeEnsemble',
+           'spike_intervals', 'spike_midpoints', 'spike_times']
+
+import numpy as np
+
+def _as_times(times, tick):
+    """
+    Convert spike times to the representation used to store them.
+
+    Spike times are stored as floats unless a tick is specified, in
+    which case they are stored as 64-bit integer multiples of the
+    tick.
+    """
+
+    times = np.asarray(times)
+    if tick is None:
+        return np.asarray(times, np.float64)
+    if not np.issubdtype(times.dtype, np.integer):
+        times = np.round(times/tick)
+    return times.astype(np.int64, copy=False)
+
+class SpikeTrain(object):
+    """
+    Spike train.
+
+    This class stores the absolute times of the spikes emitted by a
+    single neuron. Unlike the times obtained by cumulatively summing
+    interspike intervals, these times do not accumulate round-off
+    error over long recordings. The spike times, interspike intervals,
+    and midpoints between successive spikes are computed when first
+    needed and then cached.
+
+    Parameters
+    ----------
+    times : array_like
+        Spike times (in s) in increasing order. If `tick` is
+        specified and `times` contains integers, the latter are
+        interpreted as multiples of the tick.
+    tick : float
+        Time resolution (in s). If specified, the spike times are
+        stored as 64-bit integer multiples of `tick`.
+
+    Methods
+    -------
+    from_intervals(s, tick=None)
+        Create a spike train from interspike intervals.
+
+    Notes
+    -----
+    Converting a spike train to an array, e.g., with `numpy.asarray`,
+    returns its interspike intervals; the first interval is the time
+    of the first spike.
+
+    """
+
+    __slots__ = ['_data', '_tick', '_times', '_intervals', '_midpoints']
+
+    def __init__(self, times, tick=None):
+        self._data = _as_times(times, tick)
+        if self._data.ndim != 1:
+            raise ValueError('spike times must be stored in a 1D array')
+        self._tick = tick
+        self._times = None
+        self._intervals = None
+        self._midpoints = None
+
+    @classmethod
+    def from_intervals(cls, s, tick=None):
+        """Create a spike train from the interspike intervals `s`."""
+
+        return cls(np.cumsum(s), tick)
+
+    @property
+    def tick(self):
+        """Time resolution of the stored spike times."""
+
+        return self._tick
+
+    @property
+    def data(self):
+        """Stored spike times (in s or in ticks)."""
+
+        return self._data
+
+    @property
+    def times(self):
+        """Spike times (in s)."""
+
+        if self._times is None:
+            if self._tick is None:
+                self._times = self._data
+            else:
+                self._times = self._data*self._tick
+        return self._times
+
+    @property
+    def intervals(self):
+        """Interspike intervals (in s)."""
+
+        # Differencing integer ticks is exact:
+        if self._intervals is None:
+            if self._tick is None:
+                self._intervals = np.diff(self._data, prepend=0.0)
+            else:
+                self._intervals = np.diff(self._data, prepend=0)*self._tick
+        return self._intervals
+
+    @property
+    def midpoints(self):
+        """Midpoints between successive spike times (in s)."""
+
+        if self._midpoints is None:
+            ts = self.times
+            self._midpoints = (ts[0:-1]+ts[1:])/2
+        return self._midpoints
+
+    def __len__(self):
+        return len(self._data)
+
+    def __array__(self, dtype=None):
+        return np.asarray(self.intervals, dtype)
+
+    def __repr__(self):
+        if self._tick is None:
+            return 'SpikeTrain(%r)' % self._data
+        else:
+            return 'SpikeTrain(%r, tick=%r)' % (self._data, self._tick)
+
+class SpikeEnsemble(object):
+    """
+    Ensemble of spike trains.
+
+    This class stores the absolute times of the spikes emitted by a
+    population of neurons in a single array in compressed sparse row
+    format: the spike times of neuron `i` are stored in
+    `data[indptr[i]:indptr[i+1]]`. Indexing or iterating over an
+    ensemble returns `SpikeTrain` instances that share this array;
+    slicing an ensemble returns an ensemble of the selected neurons.
+
+    Parameters
+    ----------
+    times_list : list of array_like
+        Spike times (in s) of each neuron in increasing order.
+    tick : float
+        Time resolution (in s). If specified, the spike times are
+        stored as 64-bit integer multiples of `tick`.
+
+    Methods
+    -------
+    from_intervals(s_list, tick=None)
+        Create an ensemble from lists of interspike intervals.
+    from_csr(data, indptr, tick=None)
+        Create an ensemble from stored spike times and row offsets.
+
+    """
+
+    __slots__ = ['_data', '_indptr', '_tick', '_trains']
+
+    def __init__(self, times_list, tick=None):
+        times_list = [_as_times(times, tick) for times in times_list]
+        if times_list:
+            data = np.concatenate(times_list)
+        else:
+            data = _as_times([], tick)
+        indptr = np.cumsum([0]+map(len, times_list))
+        self._set(data, indptr, tick)
+
+    def _set(self, data, indptr, tick):
+        self._data = data
+        self._indptr = np.asarray(indptr, np.int64)
+        self._tick = tick
+        self._trains = [None]*(len(self._indptr)-1)
+
+    @classmethod
+    def from_intervals(cls, s_list, tick=None):
+        """Create an ensemble from the arrays of interspike
+        intervals in `s_list`."""
+
+        return cls(map(np.cumsum, s_list), tick)
+
+    @classmethod
+    def from_csr(cls, data, indptr, tick=None):
+        """Create an ensemble from the array of concatenated spike
+        times `data` (in s or in ticks) and the array of offsets
+        `indptr` of each neuron's spike times in `data`."""
+
+        ensemble = cls.__new__(cls)
+        ensemble._set(_as_times(data, tick), indptr, tick)
+        return ensemble
+
+    @property
+    def tick(self):
+        """Time resolution of the stored spike times."""
+
+        return self._tick
+
+    @property
+    def data(self):
+        """Concatenated spike times (in s or in ticks)."""
+
+        return self._data
+
+    @property
+    def indptr(self):
+        """Offsets of each neuron's spike times in `data`."""
+
+        return self._indptr
+
+    def __len__(self):
+        return len(self._trains)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+
+            # Contiguous neurons can share the stored spike times:
+            if step == 1:
+                indptr = self._indptr[start:max(start, stop)+1]
+                return SpikeEnsemble.from_csr(self._data[indptr[0]:indptr[-1]],
+                                              indptr-indptr[0], self._tick)
+            return SpikeEnsemble([self[j].data for j in
+                                  xrange(start, stop, step)], self._tick)
+        if not isinstance(i, (int, long, np.integer)):
+            raise TypeError('spike ensemble indices must be integers '
+                            'or slices')
+        if self._trains[i] is None:
+            if i < 0:
+                i += len(self)
+            self._trains[i] = \
+                SpikeTrain(self._data[self._indptr[i]:self._indptr[i+1]],
+                           self._tick)
+        return self._trains[i]
+
+    def __iter__(self):
+        for i in xrange(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        return 'SpikeEnsemble(%r)' % list(self)
+
+def spike_times(s):
+    """
+    Return the spike times of a spike train.
+
+    Parameters
+    ----------
+    s : SpikeTrain or array_like of floats
+        Spike train or interspike intervals.
+
+    Returns
+    -------
+    ts : ndarray of floats
+        Spike times (in s).
+    """
+
+    if isinstance(s, SpikeTrain):
+        return s.times
+    return np.cumsum(s)
+
+def spike_intervals(s):
+    """
+    Return the interspike intervals of a spike train.
+
+    Parameters
+    ----------
+    s : SpikeTrain or array_like of floats
+        Spike train or interspike intervals.
+
+    Returns
+    -------
+    s : array_like of floats
+        Interspike intervals (in s). Arrays of intervals are returned
+        unchanged.
+    """
+
+    if isinstance(s, SpikeTrain):
+        return s.intervals
+    return s
+
+def spike_midpoints(s):
+    """
+    Return the midpoints between the successive spikes of a spike train.
+
+    Parameters
+    ----------
+    s : SpikeTrain or array_like of floats
+        Spike train or interspike intervals.
+
+    Returns
+    -------
+    tsh : ndarray of floats
+        Midpoints between successive spike times (in s).
+    """
+
+    if isinstance(s, SpikeTrain):
+        return s.midpoints
+    ts = np.cumsum(s)
+    return (ts[0:-1]+ts[1:])/2
@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+
+"""
+Signal synthesis routines shared by the time decoding algorithms.
+
+- sinc_synth - Evaluate a weighted sum of shifted sinc kernels.
+- trig_synth - Evaluate a weighted sum of equispaced complex exponentials.
+
+"""
+
+# Copyright (c) 2009-2015, Lev Givon
+# All rights reserved.
+# Distributed under the terms of the BSD license:
+# http://www.opensource.org/licenses/bsd-license
+
+__all__ = ['sinc_synth', 'trig_synth']
+
+import numpy as np
+
+# Maximum number of kernel entries to compute at once when
+# synthesizing a signal directly:
+__block_entries__ = 2**16
+
+# Maximum number of interpolation nodes used by the Toeplitz
+# synthesis method:
+__max_nodes__ = 16
+
+# Minimum FFT length used by the chirp-z synthesis method:
+__min_czt_size__ = 2**12
+
+def _direct_synth(t, tsh, c, bw, block_size):
+    """
+    Synthesize a signal by directly evaluating the sinc kernels in
+    blocks of `block_size` time samples.
+    """
+
+    u = np.zeros(len(t), np.result_type(c, np.float))
+    for i in xrange(0, len(t), block_size):
+
+        # Evaluate sin(bw*x)/(pi*x) in place to limit the number of
+        # temporary arrays:
+        x = t[i:i+block_size, np.newaxis]-tsh
+        k = np.sin(bw*x)
+        zero = x == 0
+        x[zero] = 1.0
+        k /= x
+        k[zero] = bw
+        u[i:i+block_size] = np.dot(k, c)/np.pi
+    return u
+
+def _toeplitz_synth(kernel, t0, dt, Nt, tsh, c, P):
+    """
+    Synthesize the real signal `sum(c[k]*kernel(t-tsh[k]))` on the
+    uniform grid `t0+i*dt`, `i = 0, ..., Nt-1`, by interpolating the
+    kernel offsets from the grid with `P` Chebyshev nodes and computing
+    the resulting convolutions with the FFT.
+    """
+
+    # Split each kernel center into the nearest grid index and an
+    # offset in [-dt/2, dt/2]:
+    m = np.round((tsh-t0)/dt).astype(np.int)
+    delta = tsh-t0-m*dt
+    m_min = m.min()
+    m_max = m.max()
+
+    # Weight each coefficient by the Lagrange basis polynomials
+    # associated with the Chebyshev nodes evaluated at its offset:
+    nodes = (dt/2)*np.cos((2*np.arange(P)+1)*np.pi/(2*P))
+    L = np.ones((P, len(tsh)), np.float)
+    for q in xrange(P):
+        for r in xrange(P):
+            if r != q:
+                L[q] *= (delta-nodes[r])/(nodes[q]-nodes[r])
+
+    # The kernels are sampled over all lags between the kernel centers
+    # and the output grid; the synthesized signal is the sum of the
+    # convolutions of the weighted coefficients with the kernels:
+    lags = np.arange(-m_max, Nt-m_min)*dt
+    N_fft = 2**int(np.ceil(np.log2(len(lags)+m_max-m_min+1)))
+    U = np.zeros(N_fft/2+1, np.complex)
+    for q in xrange(P):
+        x = np.bincount(m-m_min, L[q]*c, m_max-m_min+1)
+        h = kernel(lags-nodes[q])
+        U += np.fft.rfft(x, N_fft)*np.fft.rfft(h, N_fft)
+    return np.fft.irfft(U, N_fft)[m_max-m_min:m_max-m_min+Nt]
+
+def _toeplitz_nodes(bw, dt, tol, max_nodes=__max_nodes__):
+    """
+    Find the smallest number of Chebyshev nodes that interpolates
+    the offsets of a kernel whose derivatives are bounded by those of a
+    sinc kernel of bandwidth `bw` to within `tol` on a grid with spacing
+    `dt`; return `max_nodes+1` if the tolerance cannot be attained.
+    """
+
+    # The interpolation error bound relative to the peak value of the
+    # kernel is 2*(bw*dt/4)**P/(P!*(P+1)):
+    P = 1
+    err = bw*dt/4.0
+    while P <= max_nodes and err > tol:
+        P += 1
+        err *= (bw*dt/4.0)/(P+1)
+    return P
+
+def sinc_synth(tsh, c, dur, dt, bw, tol=1e-13, method=None, block_size=None):
+    """
+    Evaluate a weighted sum of shifted sinc kernels.
+
+    Synthesize the signal `u(t) = sum(c[k]*sinc(bw*(t-tsh[k])/pi)*bw/pi)`
+    at the times `t = arange(0, dur, dt)`.
+
+    Parameters
+    ----------
+    tsh : array_like of floats
+        Centers of the sinc kernels (in s).
+    c : array_like
+        Kernel weights. If `c` is complex, the synthesized signal is
+        also complex.
+    dur : float
+        Duration of signal (in s).
+    dt : float
+        Sampling resolution of signal; the sampling frequency is 1/dt Hz.
+    bw : float
+        Signal bandwidth (in rad/s).
+    tol : float
+        Maximum error of each interpolated kernel relative to the
+        kernel's peak value `bw/pi` when `method` is 'toeplitz'; the
+        number of interpolation nodes is chosen to satisfy this bound.
+    method : {'direct', 'toeplitz'}
+        Synthesis method. The 'direct' method evaluates every kernel
+        at every time sample in blocks of time samples; its cost is
+        proportional to `len(tsh)*dur/dt`. The 'toeplitz' method
+        exploits the uniform spacing of the time samples to compute
+        the sum as a few FFT convolutions; its cost is roughly
+        proportional to `(dur/dt)*log(dur/dt)`. If not specified, the
+        'toeplitz' method is used unless `tol` cannot be attained with
+        a reasonable number of interpolation nodes.
+    block_size : int
+        Number of time samples synthesized at once by the 'direct'
+        method. If not specified, the block size is chosen to limit the
+        temporary arrays to about 2**16 entries.
+
+    Returns
+    -------
+    u : ndarray
+        Synthesized signal.
+    """
+
+    tsh = np.asarray(tsh, np.float).ravel()
+    c = np.asarray(c).ravel()
+    if len(tsh) != len(c):
+        raise ValueError('number of kernel centers and weights must be equal')
+
+    bwpi = bw/np.pi
+    t = np.arange(0, dur, dt)
+    if len(tsh) == 0 or len(t) == 0:
+        return np.zeros(len(t), np.result_type(c, np.float))
+
+    P = _toeplitz_nodes(bw, dt, tol)
+    if method is None:
+        method = 'toeplitz' if P <= __max_nodes__ else 'direct'
+
+    if method == 'direct':
+        if block_size is None:
+            block_size = max(1, __block_entries__/len(tsh))
+        return _direct_synth(t, tsh, c, bw, int(block_size))
+    elif method == 'toeplitz':
+        P = min(P, __max_nodes__)
+        kernel = lambda x: np.sinc(bwpi*x)*bwpi
+        if np.iscomplexobj(c):
+            return _toeplitz_synth(kernel, 0.0, dt, len(t), tsh, np.real(c), P)+\
+                1j*_toeplitz_synth(kernel, 0.0, dt, len(t), tsh, np.imag(c), P)
+        else:
+            return _toeplitz_synth(kernel, 0.0, dt, len(t), tsh, c, P)
+    else:
+        raise ValueError('unrecognized synthesis method')
+
+def _czt_synth(c, w0, dw, t0, dt, Nt, block_size):
+    """
+    Synthesize the signal `sum(c[m]*exp(1j*(w0+m*dw)*t))` at the times
+    `t0+n*dt`, `n = 0, ..., Nt-1`, by evaluating the sum over blocks of
+    `block_size` time samples with the chirp-z transform.
+    """
+
+    K = len(c)
+    w = w0+np.arange(K)*dw
+    u = np.empty(Nt, np.complex)
+
+    # Within each block, the sum is the chirp-z transform of the
+    # coefficients evaluated at the points z**n, z = exp(1j*dw*dt),
+    # which can be computed as a convolution with the chirp
+    # z**(-k**2/2) (Bluestein's algorithm):
+    B = min(block_size, Nt)
+    N_fft = 2**int(np.ceil(np.log2(K+B-1)))
+    k = np.arange(-(K-1), B)
+    chirp = np.exp(0.5j*dw*dt*k**2)
+    H = np.fft.fft(np.conj(chirp), N_fft)
+    chirp_m = chirp[K-1::-1]
+    chirp_n = chirp[K-1:]*np.exp(1j*w0*dt*np.arange(B))
+    for n0 in xrange(0, Nt, B):
+        n1 = min(n0+B, Nt)
+
+        # Shift the phases of the coefficients to the start of the
+        # block so that the chirp only spans the block:
+        x = c*np.exp(1j*w*(t0+n0*dt))*chirp_m
+        y = np.fft.ifft(np.fft.fft(x, N_fft)*H)[K-1:K-1+B]
+        u[n0:n1] = (chirp_n*y)[:n1-n0]
+    return u
+
+def _direct_trig_synth(c, w0, dw, t0, dt, Nt, block_size):
+    """
+    Synthesize the signal `sum(c[m]*exp(1j*(w0+m*dw)*t))` at the times
+    `t0+n*dt`, `n = 0, ..., Nt-1`, by directly evaluating the
+    exponentials in blocks of `block_size` time samples.
+    """
+
+    w = w0+np.arange(len(c))*dw
+    u = np.empty(Nt, np.complex)
+    for n0 in xrange(0, Nt, block_size):
+        t = t0+np.arange(n0, min(n0+block_size, Nt))*dt
+        u[n0:n0+len(t)] = np.dot(np.exp(1j*np.outer(t, w)), c)
+    return u
+
+def trig_synth(c, w0, dw, dur, dt, window=None, method='czt', block_size=None):
+    """
+    Evaluate a weighted sum of equispaced complex exponentials.
+
+    Synthesize the signal `u(t) = sum(c[m]*exp(1j*(w0+m*dw)*t))`,
+    `m = 0, ..., len(c)-1`, at the times `t = arange(0, dur, dt)`.
+
+    Parameters
+    ----------
+    c : array_like of complex
+        Weights of the exponentials.
+    w0 : float
+        Frequency of the first exponential (in rad/s).
+    dw : float
+        Spacing between the frequencies of the exponentials (in rad/s).
+    dur : float
+        Duration of signal (in s).
+    dt : float
+        Sampling resolution of signal; the sampling frequency is 1/dt Hz.
+    window : tuple of floats
+        If specified, only the samples of the signal at the times in the
+        interval `[window[0], window[1])` are synthesized.
+    method : {'czt', 'direct'}
+        Synthesis method. The 'czt' method evaluates the sum over
+        blocks of time samples with the chirp-z transform, i.e., with a
+        few zero-padded FFTs per block; its cost is roughly
+        proportional to `(dur/dt)*log(len(c))`. The 'direct' method
+        evaluates every exponential at every time sample; its cost is
+        proportional to `len(c)*dur/dt`.
+    block_size : int
+        Number of time samples synthesized at once. If not specified,
+        the block size is chosen to limit the temporary arrays to
+        about 2**16 entries for the 'direct' method and to make the
+        FFT length at least 2**12 for the 'czt' method.
+
+    Returns
+    -------
+    u : ndarray of complex
+        Synthesized signal.
+    """
+
+    c = np.asarray(c, np.complex).ravel()
+    t = np.arange(0, dur, dt)
+    if window is None:
+        n0, n1 = 0, len(t)
+    else:
+        n0, n1 = np.searchsorted(t, window)
+    Nt = max(n1-n0, 0)
+    if len(c) == 0 or Nt == 0:
+        return np.zeros(Nt, np.complex)
+
+    if method == 'direct':
+        if block_size is None:
+            block_size = max(1, __block_entries__/len(c))
+        return _direct_trig_synth(c, w0, dw, n0*dt, dt, Nt, int(block_size))
+    elif method == 'czt':
+        if block_size is None:
+            N_fft = 2**int(np.ceil(np.log2(max(2*len(c), __min_czt_size__))))
+            block_size = N_fft-len(c)+1
+        return _czt_synth(c, w0, dw, n0*dt, dt, Nt, int(block_size))
+    else:
+        raise ValueError('unrecognized synthesis method')
@@ -16,8 +16,10 @@ import numpy as np
 
 import bionet.utils.numpy_extras as ne
 import bionet.ted.bpa as bpa
+from bionet.ted.synthesis import trig_synth
+from bionet.ted.spikes import spike_intervals, spike_times
 
-def asdm_decode_vander(s, dur, dt, bw, b, d, k, sgn=-1):
+def asdm_decode_vander(s, dur, dt, bw, b, d, k, sgn=-1, dtype=np.float64):
     """
     Asynchronous Sigma-Delta Modulator time decoding machine that uses
     BPA.
@@ -28,7 +30,7 @@ def asdm_decode_vander(s, dur, dt, bw, b, d, k, sgn=-1):
 
     Parameters
     ----------
-    s: array_like of floats
+    s: array_like of floats or SpikeTrain
         Encoded signal. The values represent the time between spikes (in s).
     dur: float
         Duration of signal (in s).
@@ -45,6 +47,13 @@ def asdm_decode_vander(s, dur, dt, bw, b, d, k, sgn=-1):
         Encoder integration constant.
     sgn: {-1, 1}
         Sign of first spike.
+    dtype : {numpy.float64, numpy.float32}
+        Floating point type used to compute the reconstruction
+        coefficients; the Vandermonde system is complex with the same
+        precision. The recovered signal is synthesized from the
+        coefficients in double precision and converted to `dtype`.
+        Since Vandermonde systems are generally ill-conditioned,
+        single precision is only suitable for small numbers of spikes.
 
     Returns
     -------
@@ -57,19 +66,20 @@ def asdm_decode_vander(s, dur, dt, bw, b, d, k, sgn=-1):
     ns = len(s)-1
     n = ns-1               # corresponds to N in Prof. Lazar's paper
 
-    # Cast s to an ndarray to permit ndarray operations:
-    s = np.asarray(s)
-
     # Compute the spike times:
-    ts = np.cumsum(s)
+    ts = spike_times(s)
+    s = np.asarray(spike_intervals(s))
 
     # Create the vectors and matricies needed to obtain the
     # reconstruction coefficients:
-    z = np.exp(1j*2*bw*ts[:-1]/n)
+    cdtype = np.result_type(dtype, np.complex64)
+    z = np.exp(1j*2*bw*ts[:-1]/n).astype(cdtype)
 
-    V = np.fliplr(np.vander(z))  # pecularity of numpy's vander() function
-    P = np.triu(np.ones((ns, ns), np.float))
-    D = np.diag(np.exp(1j*bw*ts[:-1]))
+    # numpy's vander() reverses the column order and always returns a
+    # double precision matrix:
+    V = np.fliplr(np.vander(z)).astype(cdtype)
+    P = np.triu(np.ones((ns, ns), dtype))
+    D = np.diag(np.exp(1j*bw*ts[:-1]).astype(cdtype))
 
     # Compute the quanta:
     if sgn == -1:
@@ -79,18 +89,16 @@ def asdm_decode_vander(s, dur, dt, bw, b, d, k, sgn=-1):
 
     # Obtain the reconstruction coefficients by solving the
     # Vandermonde system using BPA:
-    d = bpa.bpa(V, ne.mdot(D, P, q[:, np.newaxis]))
-
-    # Reconstruct the signal:
-    t = np.arange(0, dur, dt)
-    u_rec = np.zeros(len(t), np.complex)
-    for i in xrange(ns):
-        c = 1j*(bw-i*2*bw/n)
-        u_rec += c*d[i]*np.exp(-c*t)
+    d = bpa.bpa(V, ne.mdot(D, P, q[:, np.newaxis].astype(dtype)))
 
-    return np.real(u_rec)
+    # Reconstruct the signal; the signal is a sum of the exponentials
+    # exp(-c[i]*t), where c[i] = 1j*(bw-i*2*bw/n), weighted by
+    # c[i]*d[i]:
+    c = (1j*(bw-np.arange(ns)*2*bw/n)).astype(cdtype)
+    return np.asarray(np.real(trig_synth(c*np.ravel(d), -bw, 2*bw/n, dur, dt)),
+                      dtype)
 
-def asdm_decode_vander_ins(s, dur, dt, bw, b, sgn=-1):
+def asdm_decode_vander_ins(s, dur, dt, bw, b, sgn=-1, dtype=np.float64):
     """
     Threshold-insensitive ASDM time decoding machine that uses BPA.
 
@@ -101,7 +109,7 @@ def asdm_decode_vander_ins(s, dur, dt, bw, b, sgn=-1):
 
     Parameters
     ----------
-    s: array_like of floats
+    s: array_like of floats or SpikeTrain
         Encoded signal. The values represent the time between spikes (in s).
     dur: float
         Duration of signal (in s).
@@ -114,6 +122,13 @@ def asdm_decode_vander_ins(s, dur, dt, bw, b, sgn=-1):
         Encoder bias.
     sgn: {-1, 1}
         Sign of first spike.
+    dtype : {numpy.float64, numpy.float32}
+        Floating point type used to compute the reconstruction
+        coefficients; the Vandermonde system is complex with the same
+        precision. The recovered signal is synthesized from the
+        coefficients in double precision and converted to `dtype`.
+        Since Vandermonde systems are generally ill-conditioned,
+        single precision is only suitable for small numbers of spikes.
 
     Returns
     -------
@@ -126,24 +141,25 @@ def asdm_decode_vander_ins(s, dur, dt, bw, b, sgn=-1):
     ns = len(s)-1
     n = ns-1               # corresponds to N in Prof. Lazar's paper
 
-    # Cast s to an ndarray to permit ndarray operations:
-    s = np.asarray(s)
-
     # Compute the spike times:
-    ts = np.cumsum(s)
+    ts = spike_times(s)
+    s = np.asarray(spike_intervals(s))
 
     # Create the vectors and matricies needed to obtain the
     # reconstruction coefficients:
-    z = np.exp(1j*2*bw*ts[:-1]/n)
-    V = np.fliplr(np.vander(z))  # pecularity of numpy's vander() function
-    D = np.diag(np.exp(1j*bw*ts[:-1]))
-    P = np.triu(np.ones((ns, ns), np.float))
-
-    a = np.zeros(ns, np.float)
+    cdtype = np.result_type(dtype, np.complex64)
+    z = np.exp(1j*2*bw*ts[:-1]/n).astype(cdtype)
+    # numpy's vander() reverses the column order and always returns a
+    # double precision matrix:
+    V = np.fliplr(np.vander(z)).astype(cdtype)
+    D = np.diag(np.exp(1j*bw*ts[:-1]).astype(cdtype))
+    P = np.triu(np.ones((ns, ns), dtype))
+
+    a = np.zeros(ns, dtype)
     a[::-2] = 1.0
     a = a[:, np.newaxis]      # column vector
 
-    bh = np.zeros(ns, np.float)
+    bh = np.zeros(ns, dtype)
     bh[-1] = 1.0
     bh = bh[np.newaxis]       # row vector
 
@@ -152,27 +168,27 @@ def asdm_decode_vander_ins(s, dur, dt, bw, b, sgn=-1):
         ex[0::2] = -1.0
     else:
         ex[1::2] = -1.0
-    r = (ex*s[1:])[:, np.newaxis]
+    r = (ex*s[1:])[:, np.newaxis].astype(dtype)
 
-    # Solve the Vandermonde systems using BPA:
+    # Solve both Vandermonde systems at once using BPA:
     ## Observation: constructing P-dot(a,bh) directly without
     ## creating P, a, and bh separately does not speed this up
-    x = bpa.bpa(V, ne.mdot(D, P-np.dot(a, bh), r))
-    y = bpa.bpa(V, np.dot(D, a))
+    xy = bpa.bpa(V, np.hstack((ne.mdot(D, P-np.dot(a, bh), r),
+                               np.dot(D, a))))
+    x = xy[:, :1]
+    y = xy[:, 1:]
 
     # Compute the coefficients:
     d = b*(x-ne.mdot(y, np.conj(y.T), x)/np.dot(np.conj(y.T), y))
 
-    # Reconstruct the signal:
-    t = np.arange(0, dur, dt)
-    u_rec = np.zeros(len(t), np.complex)
-    for i in xrange(ns):
-        c = 1j*(bw-i*2*bw/n)
-        u_rec += c*d[i]*np.exp(-c*t)
+    # Reconstruct the signal; the signal is a sum of the exponentials
+    # exp(-c[i]*t), where c[i] = 1j*(bw-i*2*bw/n), weighted by
+    # c[i]*d[i]:
+    c = (1j*(bw-np.arange(ns)*2*bw/n)).astype(cdtype)
+    return np.asarray(np.real(trig_synth(c*np.ravel(d), -bw, 2*bw/n, dur, dt)),
+                      dtype)
 
-    return np.real(u_rec)
-
-def iaf_decode_vander(s, dur, dt, bw, b, d, R, C):
+def iaf_decode_vander(s, dur, dt, bw, b, d, R, C, dtype=np.float64):
     """
     IAF time decoding machine that uses BPA.
 
@@ -182,7 +198,7 @@ def iaf_decode_vander(s, dur, dt, bw, b, d, R, C):
 
     Parameters
     ----------
-    s: array_like of floats
+    s: array_like of floats or SpikeTrain
         Encoded signal. The values represent the time between spikes (in s).
     dur: float
         Duration of signal (in s).
@@ -199,6 +215,13 @@ def iaf_decode_vander(s, dur, dt, bw, b, d, R, C):
         Neuron resistance.
     C: float
         Neuron capacitance.
+    dtype : {numpy.float64, numpy.float32}
+        Floating point type used to compute the reconstruction
+        coefficients; the Vandermonde system is complex with the same
+        precision. The recovered signal is synthesized from the
+        coefficients in double precision and converted to `dtype`.
+        Since Vandermonde systems are generally ill-conditioned,
+        single precision is only suitable for small numbers of spikes.
 
     Returns
     -------
@@ -211,19 +234,20 @@ def iaf_decode_vander(s, dur, dt, bw, b, d, R, C):
     ns = len(s)-1
     n = ns-1               # corresponds to N in Prof. Lazar's paper
 
-    # Cast s to an ndarray to permit ndarray operations:
-    s = np.asarray(s)
-
     # Compute the spike times:
-    ts = np.cumsum(s)
+    ts = spike_times(s)
+    s = np.asarray(spike_intervals(s))
 
     # Create the vectors and matricies needed to obtain the
     # reconstruction coefficients:
-    z = np.exp(1j*2*bw*ts[:-1]/n)
+    cdtype = np.result_type(dtype, np.complex64)
+    z = np.exp(1j*2*bw*ts[:-1]/n).astype(cdtype)
 
-    V = np.fliplr(np.vander(z))  # pecularity of numpy's vander() function
-    P = np.triu(np.ones((ns, ns), np.float))
-    D = np.diag(np.exp(1j*bw*ts[:-1]))
+    # numpy's vander() reverses the column order and always returns a
+    # double precision matrix:
+    V = np.fliplr(np.vander(z)).astype(cdtype)
+    P = np.triu(np.ones((ns, ns), dtype))
+    D = np.diag(np.exp(1j*bw*ts[:-1]).astype(cdtype))
 
     # Compute the quanta:
     if np.isinf(R):
@@ -233,13 +257,11 @@ def iaf_decode_vander(s, dur, dt, bw, b, d, R, C):
 
     # Obtain the reconstruction coefficients by solving the
     # Vandermonde system using BPA:
-    d = bpa.bpa(V, ne.mdot(D, P, q[:, np.newaxis]))
-
-    # Reconstruct the signal:
-    t = np.arange(0, dur, dt)
-    u_rec = np.zeros(len(t), np.complex)
-    for i in xrange(ns):
-        c = 1j*(bw-i*2*bw/n)
-        u_rec += c*d[i]*np.exp(-c*t)
-
-    return np.real(u_rec)
+    d = bpa.bpa(V, ne.mdot(D, P, q[:, np.newaxis].astype(dtype)))
+
+    # Reconstruct the signal; the signal is a sum of the exponentials
+    # exp(-c[i]*t), where c[i] = 1j*(bw-i*2*bw/n), weighted by
+    # c[i]*d[i]:
+    c = (1j*(bw-np.arange(ns)*2*bw/n)).astype(cdtype)
+    return np.asarray(np.real(trig_synth(c*np.ravel(d), -bw, 2*bw/n, dur, dt)),
+                      dtype)
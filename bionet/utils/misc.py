@@ -8,6 +8,7 @@ This module contains various unclassified utility functions and classes.
 - chunks           Return a generator that splits a sequence into chunks.
 - func_timer       Function execution timer. Can be used as a decorator.
 - SerialBuffer     Buffer interface to a serial data source.
+- ArrayBuffer      Array-backed buffer interface to a serial data source.
 """
 
 # Copyright (c) 2009-2015, Lev Givon
@@ -15,10 +16,12 @@ This module contains various unclassified utility functions and classes.
 # Distributed under the terms of the BSD license:
 # http://www.opensource.org/licenses/bsd-license
 
-__all__ = ['chunks', 'func_timer', 'SerialBuffer']
+__all__ = ['chunks', 'func_timer', 'SerialBuffer', 'ArrayBuffer']
 
 import time
 
+import numpy as np
+
 def chunks(seq, n):
     """
     Chunk generator.
@@ -158,3 +161,149 @@ class SerialBuffer:
         """Remove all elements from the buffer."""
 
         self.data = []
+
+class ArrayBuffer(object):
+    """
+    Array-backed serial buffer class.
+
+    This class implements a buffer with the same interface as
+    `SerialBuffer` that stores its contents in a circular buffer
+    backed by a preallocated array rather than in a list. Reading
+    data from the buffer therefore does not require moving its
+    remaining contents or boxing each entry. The storage is doubled
+    in size whenever it is too small to contain the buffered data.
+
+    Parameters
+    ----------
+    get : function
+        Data retrieval function. Must return an empty sequence or None
+        when it can no longer retrieve any data.
+    n : int
+        Number of initial entries to load into buffer.
+    dtype : numpy.dtype
+        Type of the buffered entries.
+
+    Methods
+    -------
+    clear()
+        Empty buffer.
+    read(n=1, copy=True)
+        Read `n` elements from buffer.
+    replenish(n=1)
+        Replenish buffer to contain at least `n` elements.
+
+    """
+
+    def __init__(self, get, n=1, dtype=np.float64):
+
+        if not callable(get):
+            raise ValueError('get() must be callable')
+        else:
+            self.get = get
+            self.data = np.empty(max(n, 1), dtype)
+
+            # Index of the first buffered entry in the storage array
+            # and number of buffered entries:
+            self.start = 0
+            self.size = 0
+            self.replenish(n)
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return repr(self._peek(self.size))
+
+    def _peek(self, n):
+        """Return the first `n` buffered entries without removing
+        them. A view of the storage array is returned unless the
+        entries wrap around its end."""
+
+        end = self.start+n
+        if end <= len(self.data):
+            return self.data[self.start:end]
+        else:
+            return np.concatenate((self.data[self.start:],
+                                   self.data[0:end-len(self.data)]))
+
+    def _reserve(self, n):
+        """Grow the storage array geometrically until it can contain
+        at least `n` entries."""
+
+        capacity = len(self.data)
+        if n <= capacity:
+            return
+        while capacity < n:
+            capacity *= 2
+        data = np.empty(capacity, self.data.dtype)
+        data[0:self.size] = self._peek(self.size)
+        self.data = data
+        self.start = 0
+
+    def _write(self, new_data):
+        """Append the entries in `new_data` to the buffer."""
+
+        new_data = np.ravel(np.asarray(new_data, self.data.dtype))
+        n = len(new_data)
+        self._reserve(self.size+n)
+
+        # Copy as many entries as will fit before the end of the
+        # storage array and wrap the remainder around to its beginning:
+        i = (self.start+self.size) % len(self.data)
+        k = min(n, len(self.data)-i)
+        self.data[i:i+k] = new_data[0:k]
+        self.data[0:n-k] = new_data[k:]
+        self.size += n
+
+    def replenish(self, n=1):
+        """Attempt to replenish the buffer such that it contains at
+        least `n` entries (but do not throw any exception if
+        insufficient data can be obtained)."""
+
+        while True:
+            try:
+                new_data = self.get()
+            except:
+                break
+            else:
+
+                # Append the new data to the buffer; stop attempting
+                # to retrieve new data if get() doesn't return
+                # anything:
+                if new_data is None or np.size(new_data) == 0:
+                    break
+                self._write(new_data)
+
+                if n <= self.size:
+                    break
+
+    def read(self, n=1, copy=True):
+        """Read a block of data (default length = 1). If `copy` is
+        False, the returned array may be a view of the buffer storage
+        that is overwritten when the buffer is subsequently
+        replenished."""
+
+        # Attempt to replenish queue if it contains too few elements:
+        if n > self.size:
+            self.replenish(n)
+
+        # This will return without error regardless of the number of
+        # buffered entries:
+        n = min(n, self.size)
+        result = self._peek(n)
+        if copy and self.start+n <= len(self.data):
+            result = result.copy()
+        self.start = (self.start+n) % len(self.data)
+        self.size -= n
+
+        # Reset the position of an empty buffer so that subsequent
+        # reads are less likely to wrap around the end of the storage:
+        if self.size == 0:
+            self.start = 0
+        return result
+
+    def clear(self):
+        """Remove all elements from the buffer."""
+
+        self.start = 0
+        self.size = 0
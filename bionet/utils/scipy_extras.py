@@ -23,7 +23,7 @@ scipy [1]_.
 __all__ = ['ei', 'si', 'ci', 'li', 'shi', 'chi']
 
 from numpy import pi, inf, log, array, asarray, complex, iscomplexobj, real, \
-     iterable, asscalar, any, where
+     iterable, asscalar, any
 from scipy.special import exp1
 
 def ei(z):
@@ -38,9 +38,9 @@ def ei(z):
         res = real(res)
 
     # Return 0 for -inf, inf for +inf, and -inf for 0:
-    res[where(zc==-inf)[0]] = 0
-    res[where(zc==inf)[0]] = inf
-    res[where(zc==0)[0]] = -inf
+    res[zc==-inf] = 0
+    res[zc==inf] = inf
+    res[zc==0] = -inf
 
     if iterable(z):
         return res
@@ -59,9 +59,9 @@ def si(z):
         res = real(res)
 
     # Return 0 for 0, pi/2 for +inf, -pi/2 for -inf:
-    res[where(zc==-inf)[0]] = -pi/2
-    res[where(zc==inf)[0]] = pi/2
-    res[where(zc==0)[0]] = 0
+    res[zc==-inf] = -pi/2
+    res[zc==inf] = pi/2
+    res[zc==0] = 0
 
     if iterable(z):
         return res
@@ -81,9 +81,9 @@ def ci(z):
         res = real(res)
 
     # Return -inf for 0, 0 for +inf, and pi*1j for -inf:
-    res[where(zc==-inf)[0]] = pi*1j
-    res[where(zc==inf)[0]] = 0
-    res[where(zc==0)[0]] = -inf
+    res[zc==-inf] = pi*1j
+    res[zc==inf] = 0
+    res[zc==0] = -inf
 
     if iterable(z):
         return res
@@ -102,9 +102,9 @@ def li(z):
         res = real(res)
 
     # Return 0 for 0, -inf for 1, and +inf for +inf:
-    res[where(zc==inf)[0]] = inf
-    res[where(zc==0)[0]] = 0
-    res[where(zc==1)[0]] = -inf
+    res[zc==inf] = inf
+    res[zc==0] = 0
+    res[zc==1] = -inf
 
     if iterable(z):
         return res
@@ -123,9 +123,9 @@ def shi(z):
         res = real(res)
 
     # Return 0 for 0, +inf for +inf, -inf for -inf:
-    res[where(zc==-inf)[0]] = -inf
-    res[where(zc==inf)[0]] = inf
-    res[where(zc==0)[0]] = 0
+    res[zc==-inf] = -inf
+    res[zc==inf] = inf
+    res[zc==0] = 0
 
     if iterable(z):
         return res
@@ -144,9 +144,9 @@ def chi(z):
         res = real(res)
 
     # Return -inf for 0, +inf for +inf, +inf for -inf:
-    res[where(zc==-inf)[0]] = inf
-    res[where(zc==inf)[0]] = inf
-    res[where(zc==0)[0]] = -inf
+    res[zc==-inf] = inf
+    res[zc==inf] = inf
+    res[zc==0] = -inf
 
     if iterable(z):
         return res
@@ -19,6 +19,7 @@ Filtering Routines
 - fftfilt         Apply an FIR filter to a signal using the overlap-add method.
 - remezord        Determine filter parameters for Remez algorithm.
 - upsample        Upsample an array.
+- Upsampler       Stateful polyphase interpolator for streaming signals.
 
 Miscellaneous Routines
 ----------------------
@@ -29,11 +30,11 @@ Miscellaneous Routines
 """
 
 __all__ = ['db', 'downsample', 'fftfilt', 'nextpow2', 'oddceil', 'oddround',
-           'remezord', 'rms', 'snr', 'upsample']
+           'remezord', 'rms', 'snr', 'upsample', 'Upsampler']
 
-from numpy import abs, arange, arctan, argmin, asarray, ceil, floor, \
-     hstack, int, log10, log2, max, mean, min, mod, pi, shape, \
-     sqrt, zeros
+from numpy import abs, arange, arctan, argmin, asarray, ceil, concatenate, \
+     floor, hstack, int, kaiser, log10, log2, max, mean, min, mod, \
+     newaxis, pi, shape, sinc, sqrt, zeros
 
 # Since the fft function in scipy is faster than that in numpy, try to
 # import the former before falling back to the latter:
@@ -97,6 +98,128 @@ def downsample(x, n, offset=0):
         raise ValueError('x must be a vector')
     return x[offset::n]
 
+class Upsampler(object):
+    """
+    Stateful polyphase interpolator.
+
+    This class increases the sampling rate of a signal by an integer
+    factor one block at a time. The signal is interpolated with a
+    Kaiser-windowed sinc filter whose polyphase components are applied
+    to the input samples directly, so neither the zero-stuffed signal
+    nor the FFT of the entire signal is ever computed. The input samples
+    needed to interpolate across block boundaries are retained between
+    calls, so the interpolated blocks are identical to the corresponding
+    portions of the interpolated signal regardless of how the latter
+    is split into blocks.
+
+    Parameters
+    ----------
+    n : int
+        Upsampling factor.
+    half_len : int
+        Number of input samples on either side of each interpolated
+        sample that contribute to it.
+    beta : float
+        Kaiser window shape parameter.
+
+    Methods
+    -------
+    __call__(x, flush=False)
+        Interpolate a block of samples.
+    blocks(x, block_size=None, flush=False, overlap=False)
+        Return a generator that interpolates a signal block by block.
+    reset()
+        Discard the retained samples.
+
+    Notes
+    -----
+    Because each interpolated sample depends on the `half_len` input
+    samples that follow it, the interpolated samples associated with
+    the last `half_len` samples of a block are returned after the next
+    block is processed, or when `flush` is set; the signal is assumed to
+    be zero before its first and after its last sample. The original
+    samples are preserved exactly by the interpolation.
+    The input may also be a 2D array whose rows are interpolated
+    independently.
+
+    """
+
+    def __init__(self, n, half_len=32, beta=8.0):
+        if n < 1 or n != int(n):
+            raise ValueError('n must be a positive integer')
+        self.n = int(n)
+        self.half_len = half_len
+
+        # Reorder the filter coefficients such that h[r, p] is the
+        # coefficient applied to the input sample r-half_len samples
+        # before the one preceding output phase p:
+        L = 2*half_len*self.n+1
+        h = zeros((2*half_len+1)*self.n)
+        h[0:L] = sinc(arange(-half_len*self.n, half_len*self.n+1)/
+                      float(self.n))*kaiser(L, beta)
+        self.h = h.reshape((2*half_len+1, self.n))
+
+        # Normalize the polyphase components to unit DC gain:
+        self.h /= self.h.sum(0)
+        self.reset()
+
+    def reset(self):
+        """Discard the retained samples."""
+
+        self.hist = None
+        self.last = None
+
+    def __call__(self, x, flush=False):
+        """Interpolate the block of samples `x` (along its last axis).
+        If `flush` is set, the interpolated samples associated with
+        all of the remaining input samples are returned."""
+
+        x = asarray(x, float)
+        K = self.half_len
+        if self.hist is None:
+            self.hist = zeros(x.shape[:-1]+(K,))
+        xb = concatenate((self.hist, x), -1)
+        if flush:
+            xb = concatenate((xb, zeros(x.shape[:-1]+(K,))), -1)
+
+        # Compute the interpolated samples that can be obtained
+        # from the samples received so far:
+        N = max([xb.shape[-1]-2*K, 0])
+        y = zeros(x.shape[:-1]+(N, self.n))
+        for r in xrange(2*K+1):
+            y += xb[..., 2*K-r:2*K-r+N, newaxis]*self.h[r]
+        y = y.reshape(x.shape[:-1]+(N*self.n,))
+
+        # Retain the samples needed to compute the next interpolated
+        # samples:
+        if flush:
+            self.reset()
+        else:
+            self.hist = xb[..., N:]
+            if N:
+                self.last = y[..., -1]
+        return y
+
+    def blocks(self, x, block_size=None, flush=False, overlap=False):
+        """Return a generator that interpolates the signal `x` in
+        blocks of `block_size` input samples. If `overlap` is set,
+        each block is preceded by the last interpolated sample of the
+        preceding block (if any). If `flush` is set, the signal is
+        flushed after its last block; an empty signal may be specified
+        to flush the samples retained from previous calls."""
+
+        x = asarray(x)
+        if block_size is None:
+            block_size = max([2**18/self.n, 1])
+        N = x.shape[-1]
+        for i in xrange(0, max([N, 1 if flush else 0]), block_size):
+            last = self.last
+            y = self(x[..., i:i+block_size],
+                     flush and i+block_size >= N)
+            if overlap and last is not None:
+                y = concatenate((asarray(last)[..., newaxis], y), -1)
+            yield y
+
 # --- Filtering functions ---
 
 def nextpow2(x):
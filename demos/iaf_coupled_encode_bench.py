@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of the coupled IAF time encoding machine with coupling
+functions evaluated over the spike history and with tabulated coupling
+kernels for increasing signal lengths.
+"""
+
+# Copyright (c) 2009-2015, Lev Givon
+# All rights reserved.
+# Distributed under the terms of the BSD license:
+# http://www.opensource.org/licenses/bsd-license
+
+import time
+import numpy as np
+
+import bionet.utils.band_limited as bl
+import bionet.ted.iaf as iaf
+
+def timed(f, *args, **kwargs):
+    start = time.time()
+    result = f(*args, **kwargs)
+    return time.time()-start, result
+
+dt = 1e-5
+f = 100
+support = 0.5
+
+# Coupling functions used in the coupled IAF demo:
+a = 1.0/0.015
+c = 1.0/3.0
+h = lambda t: c*np.exp(-a*t)*((a*t)**5/120.0-(a*t)**7/5040.0)*(t>=0)
+h_list = [[lambda t: 0, lambda t: -h(t)],
+          [h, lambda t: 0]]
+
+np.random.seed(0)
+
+print '%10s %10s %10s %8s %8s' % ('samples', 'tabulated', 'loop',
+                                  'speedup', 'match')
+for dur in [0.1, 0.2, 0.4, 0.8]:
+    u = bl.gen_band_limited(dur, dt, f, None, 10)
+    u /= max(u)
+    args = (u, dt, [4.0, -4.0], [0.75, -0.75], [0.01, 0.01], h_list, [1, -1])
+    t_tab, s_tab = timed(iaf.iaf_encode_coupled, *args, support=support)
+    t_loop, s_loop = timed(iaf.iaf_encode_coupled, *args)
+    match = all([len(s0) == len(s1) and np.allclose(s0, s1) \
+                 for s0, s1 in zip(s_tab, s_loop)])
+    print '%10i %10.3f %10.3f %8.1f %8s' % \
+          (len(u), t_tab, t_loop, t_loop/t_tab, match)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of the MIMO IAF time encoding machine for increasing numbers
+of neurons and signal lengths.
+"""
+
+# Copyright (c) 2009-2015, Lev Givon
+# All rights reserved.
+# Distributed under the terms of the BSD license:
+# http://www.opensource.org/licenses/bsd-license
+
+import time
+import numpy as np
+
+import bionet.utils.band_limited as bl
+import bionet.ted.iaf as iaf
+
+def iaf_encode_pop_loop(u_array, dt, b_array, d_array, C_array):
+    """Encode signals with ideal IAF neurons one time step at a time."""
+
+    s_list = [[] for i in xrange(u_array.shape[0])]
+    y = np.zeros(u_array.shape[0], np.float)
+    interval = np.zeros(u_array.shape[0], np.float)
+    for i in xrange(u_array.shape[1]-1):
+        y = y + dt*(b_array+(u_array[:, i]+u_array[:, i+1])/2.0)/C_array
+        interval += dt
+        exceeded = np.where(y >= d_array)[0]
+        for j in exceeded:
+            s_list[j].append(interval[j])
+        y[exceeded] -= d_array[exceeded]
+        interval[exceeded] = 0.0
+    return [np.array(s) for s in s_list]
+
+def timed(f, *args):
+    start = time.time()
+    f(*args)
+    return time.time()-start
+
+dt = 1e-5
+f = 32
+np.random.seed(0)
+
+print '%8s %10s %10s %10s %8s' % ('neurons', 'samples', 'batched', 'loop',
+                                  'speedup')
+for dur in [0.1, 1.0]:
+    u = bl.gen_band_limited(dur, dt, f)
+    for N in [10, 100, 1000, 10000]:
+
+        # Skip problems that require too much memory:
+        if N*len(u) > 10**8:
+            continue
+        u_array = np.tile(u, (N, 1))
+        b_array = np.random.uniform(3.0, 4.0, N)
+        d_array = np.random.uniform(0.5, 0.9, N)
+        R_array = np.repeat(np.inf, N)
+        C_array = np.repeat(0.01, N)
+
+        t_batched = timed(iaf.iaf_encode_pop, u_array, dt, b_array, d_array,
+                          R_array, C_array)
+
+        t_loop = timed(iaf_encode_pop_loop, u_array, dt, b_array,
+                       d_array, C_array)
+        print '%8i %10i %10.3f %10.3f %8.1f' % \
+              (N, len(u), t_batched, t_loop, t_loop/t_batched)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of the list-backed and array-backed serial buffers for
+increasing read sizes.
+"""
+
+# Copyright (c) 2009-2015, Lev Givon
+# All rights reserved.
+# Distributed under the terms of the BSD license:
+# http://www.opensource.org/licenses/bsd-license
+
+import time
+import numpy as np
+
+import bionet.utils.misc as m
+
+def drain(buffer_class, x, chunk_size, read_size):
+    """Read all of the data in `x` from a buffer replenished in chunks."""
+
+    i = m.chunks(x, chunk_size)
+    def get():
+        try:
+            return i.next()
+        except StopIteration:
+            return []
+    sb = buffer_class(get, 10*read_size)
+    while len(sb.read(read_size)):
+        pass
+
+def timed(f, *args):
+    start = time.time()
+    f(*args)
+    return time.time()-start
+
+np.random.seed(0)
+x = np.random.rand(10**6)
+
+print '%10s %10s %10s %10s %8s' % ('chunk', 'read', 'list', 'array',
+                                   'speedup')
+for chunk_size in [100, 10000]:
+    for read_size in [10, 100, 1000, 10000]:
+        t_list = timed(drain, m.SerialBuffer, x, chunk_size, read_size)
+        t_array = timed(drain, m.ArrayBuffer, x, chunk_size, read_size)
+        print '%10i %10i %10.3f %10.3f %8.1f' % \
+              (chunk_size, read_size, t_list, t_array, t_list/t_array)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+
+"""
+Test ASDM time encoding machines.
+"""
+
+import numpy as np
+from numpy.testing import *
+from unittest import main
+
+import bionet.utils.band_limited as bl
+from bionet.utils.signal_extras import snr
+import bionet.ted.asdm as asdm
+
+def asdm_encode_loop(u, dt, b, d, k=1.0, y=0.0, interval=0.0, sgn=1,
+                     quad_method='trapz'):
+    """
+    Encode a signal by updating the integrator one sample at a time.
+    """
+
+    if quad_method == 'rect':
+        compute_y = lambda y, sgn, i: y + dt*(sgn*b+u[i])/k
+        last = len(u)
+    else:
+        compute_y = lambda y, sgn, i: y + dt*(sgn*b+(u[i]+u[i+1])/2.0)/k
+        last = len(u)-1
+    s = []
+    for i in xrange(last):
+        y = compute_y(y, sgn, i)
+        interval += dt
+        if np.abs(y) >= d:
+            s.append(interval)
+            interval = 0.0
+            y = d*sgn
+            sgn = -sgn
+    return np.array(s), y, interval, sgn
+
+class TestASDMEncode(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.dur = 0.1
+        self.dt = 1e-5
+        self.u = bl.gen_band_limited(self.dur, self.dt, 32)
+        self.b = 3.5
+        self.d = 0.7
+        self.k = 0.01
+
+    def test_rect(self):
+        s = asdm.asdm_encode(self.u, self.dt, self.b, self.d, self.k,
+                             quad_method='rect')
+        s_ref = asdm_encode_loop(self.u, self.dt, self.b, self.d, self.k,
+                                 quad_method='rect')[0]
+        assert(len(s) > 10)
+        assert_array_equal(s, s_ref)
+
+    def test_trapz(self):
+        s = asdm.asdm_encode(self.u, self.dt, self.b, self.d, self.k)
+        s_ref = asdm_encode_loop(self.u, self.dt, self.b, self.d, self.k)[0]
+        assert(len(s) > 10)
+        assert_array_equal(s, s_ref)
+
+    def test_full_output(self):
+        s_ref, y_ref, interval_ref, sgn_ref = \
+               asdm_encode_loop(self.u, self.dt, self.b, self.d, self.k,
+                                sgn=-1, quad_method='rect')
+        params = [self.dt, self.b, self.d, self.k, 0.0, 0.0, 0.0, -1,
+                  'rect', True]
+        s_list = []
+        for u_block in np.array_split(self.u, 7):
+            result = asdm.asdm_encode(u_block, *params)
+            s_list.append(result[0])
+            params = result[1:]
+        assert_array_equal(np.hstack(s_list), s_ref)
+        assert_equal(params[5], y_ref)
+        assert_equal(params[6], interval_ref)
+        assert_equal(params[7], sgn_ref)
+
+class TestASDMDecode(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.dur = 0.1
+        self.dt = 1e-5
+        self.bw = 2*np.pi*32
+        self.u = bl.gen_band_limited(self.dur, self.dt, 32)
+        self.s1 = asdm.asdm_encode(self.u, self.dt, 3.5, 0.7, 0.01)
+        self.s2 = asdm.asdm_encode(self.u, self.dt, 3.0, 0.7, 0.01)
+
+        # Ignore the edges of the recovered signal when computing the
+        # SNR:
+        self.k = int(0.01/self.dt)
+
+    def check_dtype(self, decode, *args):
+        u_rec = decode(*args)
+        u_rec_single = decode(*args, dtype=np.float32)
+        assert_equal(u_rec_single.dtype, np.float32)
+        snr_double = snr(self.u, u_rec, self.k, -self.k)
+        snr_single = snr(self.u, u_rec_single, self.k, -self.k)
+        assert(snr_double > 50)
+        assert(snr_single > snr_double-10)
+
+    def test_dtype(self):
+        self.check_dtype(asdm.asdm_decode, self.s1, self.dur, self.dt,
+                         self.bw, 3.5, 0.7, 0.01)
+
+    def test_dtype_ins(self):
+        self.check_dtype(asdm.asdm_decode_ins, self.s1, self.dur, self.dt,
+                         self.bw, 3.5)
+
+    def test_dtype_pop(self):
+        self.check_dtype(asdm.asdm_decode_pop, [self.s1, self.s2], self.dur,
+                         self.dt, self.bw, [3.5, 3.0], [0.7, 0.7],
+                         [0.01, 0.01])
+
+    def test_dtype_pop_ins(self):
+        self.check_dtype(asdm.asdm_decode_pop_ins, [self.s1, self.s2],
+                         self.dur, self.dt, self.bw, [3.5, 3.0])
+
+if __name__ == "__main__":
+    main()
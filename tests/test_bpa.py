@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+
+"""
+Test the Python implementation of the Bjork-Pereyra algorithm.
+"""
+
+import numpy as np
+from numpy.testing import *
+from unittest import main
+
+import bionet.ted.bpa_python as bpa_python
+
+class TestBPA(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        N = 12
+        self.V = np.fliplr(np.vander(np.exp(2j*np.pi*np.arange(N)/N)))
+        self.d = np.random.randn(N, 3)+1j*np.random.randn(N, 3)
+        self.b = np.dot(self.V, self.d)
+
+    def test_bpa(self):
+        assert_array_almost_equal(bpa_python.bpa(self.V, self.b[:, 0]),
+                                  self.d[:, 0])
+
+    def test_real(self):
+        V = np.fliplr(np.vander(np.arange(1, 6, dtype=np.float)))
+        d = np.arange(5, dtype=np.float)
+        assert_array_almost_equal(bpa_python.bpa(V, np.dot(V, d)), d)
+
+    def test_batch(self):
+        d = bpa_python.bpa(self.V, self.b)
+        assert_equal(d.shape, self.d.shape)
+        assert_array_almost_equal(d, self.d)
+
+if __name__ == "__main__":
+    main()
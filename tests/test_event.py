@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+"""
+Test event-driven time encoding machines.
+"""
+
+import numpy as np
+from numpy.testing import *
+from unittest import main
+
+import bionet.utils.band_limited as bl
+import bionet.utils.trig_poly as tp
+import bionet.ted.asdm as asdm
+import bionet.ted.iaf as iaf
+import bionet.ted.event as event
+
+class TestEventEncode(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.M = 5
+        self.Omega = 2*np.pi*50
+        self.T = 2*np.pi*self.M/self.Omega
+        self.am = tp.gen_dirichlet_coeffs(self.M)
+        self.am /= np.sum(np.abs(self.am))/np.sqrt(self.T)
+        self.u = event.TrigPolySignal(self.am, self.Omega)
+
+    def test_integral(self):
+        dt = 1e-6
+        u = tp.gen_trig_poly(self.T, dt, self.am)
+        k = len(u)/2
+        assert_almost_equal(self.u.integral(0.0, k*dt),
+                            np.trapz(u[:k+1], dx=dt))
+
+    def test_iaf_encode(self):
+        dt = 1e-7
+        u = tp.gen_trig_poly(self.T, dt, self.am)
+        s = event.iaf_encode(self.u, None, 1.5, 0.02, np.inf, 0.01)
+        s_grid = iaf.iaf_encode(u, dt, 1.5, 0.02, np.inf, 0.01)
+        assert_equal(len(s), len(s_grid))
+        assert_array_almost_equal(np.cumsum(s), np.cumsum(s_grid), 6)
+
+    def test_iaf_encode_leaky(self):
+        dt = 1e-7
+        u = tp.gen_trig_poly(self.T, dt, self.am)
+        s = event.iaf_encode(self.u, None, 1.5, 0.02, 1.0, 0.01)
+        s_grid = iaf.iaf_encode(u, dt, 1.5, 0.02, 1.0, 0.01)
+        assert_equal(len(s), len(s_grid))
+        assert_array_almost_equal(np.cumsum(s), np.cumsum(s_grid), 6)
+
+    def test_asdm_encode(self):
+        dt = 1e-7
+        u = tp.gen_trig_poly(self.T, dt, self.am)
+        s = event.asdm_encode(self.u, None, 1.5, 0.02, 0.01)
+        s_grid = asdm.asdm_encode(u, dt, 1.5, 0.02, 0.01)
+        assert_equal(len(s), len(s_grid))
+        assert_array_almost_equal(np.cumsum(s), np.cumsum(s_grid), 4)
+
+class TestEventEncodeSinc(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.dt = 1e-3
+        self.bw = 2*np.pi*100
+        self.u = bl.gen_band_limited(0.05, self.dt, 50, None, 2)
+        self.u /= np.max(np.abs(self.u))
+
+    def test_iaf_encode(self):
+
+        # Interpolate the samples on a fine grid:
+        dt = 1e-6
+        tk = np.arange(len(self.u))*self.dt
+        t = np.arange(0, len(self.u)*self.dt, dt)
+        u = np.dot(np.sinc(self.bw*(t[:, np.newaxis]-tk)/np.pi),
+                   self.u)*self.bw*self.dt/np.pi
+        s = event.iaf_encode(event.SincSignal(self.u, self.dt, self.bw),
+                             None, 1.5, 0.02, np.inf, 0.01)
+        s_grid = iaf.iaf_encode(u, dt, 1.5, 0.02, np.inf, 0.01)
+        assert_equal(len(s), len(s_grid))
+        assert_array_almost_equal(np.cumsum(s), np.cumsum(s_grid), 5)
+
+    def test_iaf_encode_truncated(self):
+        s = event.iaf_encode(event.SincSignal(self.u, self.dt, self.bw),
+                             None, 1.5, 0.02, np.inf, 0.01)
+
+        # Truncating the interpolation to all of the samples should not
+        # change the encoding:
+        u = event.SincSignal(self.u, self.dt, self.bw, len(self.u))
+        assert_array_almost_equal(event.iaf_encode(u, None, 1.5, 0.02,
+                                                   np.inf, 0.01), s)
+
+        # Truncating it to fewer samples should only perturb the spike
+        # times slightly:
+        u = event.SincSignal(self.u, self.dt, self.bw, 30)
+        s_trunc = event.iaf_encode(u, None, 1.5, 0.02, np.inf, 0.01)
+        assert_equal(len(s_trunc), len(s))
+        assert_array_almost_equal(np.cumsum(s_trunc), np.cumsum(s), 3)
+
+    def test_iaf_encode_leaky(self):
+        u = event.SincSignal(self.u, self.dt, self.bw)
+        self.assertRaises(ValueError, event.iaf_encode, u, None, 1.5, 0.02,
+                          1.0, 0.01)
+
+if __name__ == "__main__":
+    main()
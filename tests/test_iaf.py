@@ -0,0 +1,312 @@
+#!/usr/bin/env python
+
+"""
+Test IAF time encoding and decoding machines.
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from numpy.testing import *
+from unittest import main
+
+import bionet.utils.band_limited as bl
+import bionet.utils.scipy_extras as se
+from bionet.utils.signal_extras import snr
+import bionet.ted.iaf as iaf
+
+def iaf_encode_loop(u, dt, b, d, R=np.inf, C=1.0, y=0.0, interval=0.0,
+                    quad_method='trapz'):
+    """Sample-by-sample IAF encoder used as a reference."""
+
+    s = []
+    if np.isinf(R):
+        if quad_method == 'rect':
+            compute_y = lambda y, i: y + dt*(b+u[i])/C
+            last = len(u)
+        else:
+            compute_y = lambda y, i: y + dt*(b+(u[i]+u[i+1])/2.0)/C
+            last = len(u)-1
+    else:
+        RC = R*C
+        compute_y = lambda y, i: y*np.exp(-dt/RC)+R*(1-np.exp(-dt/RC))*(b+u[i])
+        last = len(u)
+    for i in xrange(last):
+        y = compute_y(y, i)
+        interval += dt
+        if y >= d:
+            s.append(interval)
+            interval = 0.0
+            y -= d
+    return np.array(s), y, interval
+
+def iaf_G_leaky_loop(ts, tsh, bw, RC):
+    """Entry-by-entry leaky IAF reconstruction matrix used as a reference."""
+
+    G = np.empty((len(tsh), len(tsh)), np.complex)
+    for i in xrange(len(tsh)):
+        for j in xrange(len(tsh)):
+            if ts[i] < tsh[j] and tsh[j] < ts[i+1]:
+                G[i,j] = (-1j/4)*np.exp((tsh[j]-ts[i+1])/(RC))* \
+                         (2*se.ei((1-1j*RC*bw)*(ts[i]-tsh[j])/RC)-
+                          2*se.ei((1-1j*RC*bw)*(ts[i+1]-tsh[j])/RC)-
+                          2*se.ei((1+1j*RC*bw)*(ts[i]-tsh[j])/RC)+
+                          2*se.ei((1+1j*RC*bw)*(ts[i+1]-tsh[j])/RC)+
+                          np.log(-1-1j*RC*bw)+np.log(1-1j*RC*bw)-
+                          np.log(-1+1j*RC*bw)-np.log(1+1j*RC*bw)+
+                          np.log(-1j/(-1j+RC*bw))-np.log(1j/(-1j+RC*bw))+
+                          np.log(-1j/(1j+RC*bw))-np.log(1j/(1j+RC*bw)))/np.pi
+            else:
+                G[i,j] = (-1j/2)*np.exp((tsh[j]-ts[i+1])/RC)* \
+                         (se.ei((1-1j*RC*bw)*(ts[i]-tsh[j])/RC)-
+                          se.ei((1-1j*RC*bw)*(ts[i+1]-tsh[j])/RC)-
+                          se.ei((1+1j*RC*bw)*(ts[i]-tsh[j])/RC)+
+                          se.ei((1+1j*RC*bw)*(ts[i+1]-tsh[j])/RC))/np.pi
+    return G
+
+class TestIAFEncode(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.dur = 0.1
+        self.dt = 1e-5
+        self.u = bl.gen_band_limited(self.dur, self.dt, 32)
+        self.b = 3.5
+        self.d = 0.7
+        self.C = 0.01
+
+    def test_ideal_rect(self):
+        s = iaf.iaf_encode(self.u, self.dt, self.b, self.d, C=self.C,
+                           quad_method='rect')
+        s_ref = iaf_encode_loop(self.u, self.dt, self.b, self.d, C=self.C,
+                                quad_method='rect')[0]
+        assert(len(s) > 10)
+        assert_array_equal(s, s_ref)
+
+    def test_ideal_trapz(self):
+        s = iaf.iaf_encode(self.u, self.dt, self.b, self.d, C=self.C)
+        s_ref = iaf_encode_loop(self.u, self.dt, self.b, self.d, C=self.C)[0]
+        assert(len(s) > 10)
+        assert_array_equal(s, s_ref)
+
+    def test_leaky(self):
+        R = 10.0
+        C = 0.01
+        s = iaf.iaf_encode(self.u, self.dt, self.b, self.d, R, C)
+        s_ref = iaf_encode_loop(self.u, self.dt, self.b, self.d, R, C)[0]
+        assert(len(s) > 10)
+        assert_array_equal(s, s_ref)
+
+    def test_full_output(self):
+        R = 10.0
+        C = 0.01
+        s_ref, y_ref, interval_ref = \
+               iaf_encode_loop(self.u, self.dt, self.b, self.d, R, C,
+                               quad_method='rect')
+        params = [self.dt, self.b, self.d, R, C, 0, 0.0, 0.0, 'rect', True]
+        s_list = []
+        for u_block in np.array_split(self.u, 7):
+            result = iaf.iaf_encode(u_block, *params)
+            s_list.append(result[0])
+            params = result[1:]
+        assert_array_equal(np.hstack(s_list), s_ref)
+        assert_equal(params[6], y_ref)
+        assert_equal(params[7], interval_ref)
+
+    def test_upsampled_full_output(self):
+        u = self.u[::10]
+        dt = 10*self.dt
+        s_ref = iaf.iaf_encode(u, dt, self.b, self.d, C=self.C, dte=self.dt)
+        params = [dt, self.b, self.d, np.inf, self.C, self.dt, 0.0, 0.0,
+                  'trapz', True]
+        s_list = []
+        for u_block in np.array_split(u, 7)+[u[0:0]]:
+            result = iaf.iaf_encode(u_block, *params, flush=False)
+            s_list.append(result[0])
+            params = result[1:]
+        assert(len(s_ref) > 10)
+        assert_array_equal(np.hstack(s_list), s_ref)
+
+        # A single call should encode all of the interpolated samples
+        # even when the full output is requested:
+        result = iaf.iaf_encode(u, dt, self.b, self.d, C=self.C,
+                                dte=self.dt, full_output=True)
+        assert_array_equal(result[0], s_ref)
+
+class TestIAFEncodePop(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.dt = 1e-5
+        self.u_list = [bl.gen_band_limited(0.1, self.dt, 32) for i in xrange(4)]
+        self.b_list = [3.5, 3.0, 4.0, 3.5]
+        self.d_list = [0.7, 0.5, 0.7, 0.9]
+        self.C_list = [0.01, 0.01, 0.02, 0.01]
+
+    def test_ideal(self):
+        R_list = [np.inf]*4
+        s_list = iaf.iaf_encode_pop(self.u_list, self.dt, self.b_list,
+                                    self.d_list, R_list, self.C_list,
+                                    block_size=100)
+        for i in xrange(4):
+            s = iaf.iaf_encode(self.u_list[i], self.dt, self.b_list[i],
+                               self.d_list[i], R_list[i], self.C_list[i])
+            assert_array_equal(s_list[i], s)
+
+    def test_leaky(self):
+        R_list = [10.0, 10.0, 5.0, 10.0]
+        result = iaf.iaf_encode_pop(self.u_list, self.dt, self.b_list,
+                                    self.d_list, R_list, self.C_list,
+                                    quad_method='rect', full_output=True)
+        for i in xrange(4):
+            s, y, interval = iaf_encode_loop(self.u_list[i], self.dt,
+                                             self.b_list[i], self.d_list[i],
+                                             R_list[i], self.C_list[i])
+            assert_array_equal(result[0][i], s)
+            assert_equal(result[7][i], y)
+            assert_equal(result[8][i], interval)
+
+class TestIAFEncodeCoupled(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.dur = 0.05
+        self.dt = 1e-5
+        self.u = bl.gen_band_limited(self.dur, self.dt, 100)
+        self.u /= max(self.u)
+
+    def test_support(self):
+        h = lambda t: np.exp(-t/0.005)
+        h_list = [[lambda t: 0.1*h(t), lambda t: -0.3*h(t)],
+                  [lambda t: 0.3*h(t), lambda t: -0.1*h(t)]]
+        args = (self.u, self.dt, [4.0, -4.0], [0.75, -0.75], [0.01, 0.01],
+                h_list, [1, -1])
+        s_list_ref = iaf.iaf_encode_coupled(*args)
+        s_list = iaf.iaf_encode_coupled(*args, support=self.dur)
+        for s, s_ref in zip(s_list, s_list_ref):
+            assert(len(s_ref) > 10)
+            assert_array_almost_equal(s, s_ref)
+
+class TestIAFDecode(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.dt = 1e-5
+        self.u = bl.gen_band_limited(0.1, self.dt, 32)
+        self.bw = 2*np.pi*32
+        self.s = iaf.iaf_encode(self.u, self.dt, 3.5, 0.7, 10.0, 0.01)
+
+    def test_G_leaky(self):
+        ts = np.cumsum(self.s)
+        tsh = (ts[0:-1]+ts[1:])/2
+        G = iaf._iaf_G_leaky(ts, tsh, self.bw, 0.1, tile_size=7)
+        assert_array_almost_equal(G, iaf_G_leaky_loop(ts, tsh, self.bw, 0.1))
+
+    def test_decode_real(self):
+        s = iaf.iaf_encode(self.u, self.dt, 3.5, 0.7, np.inf, 0.01)
+        ts = np.cumsum(s)
+        tsh = (ts[0:-1]+ts[1:])/2
+        G = np.empty((len(tsh), len(tsh)), np.complex)
+        for j in xrange(len(tsh)):
+            temp = se.si(self.bw*(ts-tsh[j]))/np.pi
+            G[:, j] = temp[1:]-temp[:-1]
+        c = np.dot(np.linalg.pinv(G, 1e-8), 0.01*0.7-3.5*s[1:])
+        u_rec = np.zeros(len(self.u), np.complex)
+        for j in xrange(len(tsh)):
+            u_rec += np.sinc(self.bw*(np.arange(len(self.u))*self.dt-tsh[j])/np.pi)* \
+                     self.bw/np.pi*c[j]
+        u_rec_real = iaf.iaf_decode(s, 0.1, self.dt, self.bw, 3.5, 0.7,
+                                    np.inf, 0.01)
+        assert_equal(u_rec_real.dtype, np.float64)
+        assert_array_almost_equal(u_rec_real, np.real(u_rec), 8)
+        u_rec_single = iaf.iaf_decode(s, 0.1, self.dt, self.bw, 3.5, 0.7,
+                                      np.inf, 0.01, dtype=np.float32)
+        assert_equal(u_rec_single.dtype, np.float32)
+        assert_array_almost_equal(u_rec_single, u_rec_real, 2)
+
+    def test_decode_pop_leaky(self):
+        u_rec = iaf.iaf_decode(self.s, 0.1, self.dt, self.bw, 3.5, 0.7,
+                               10.0, 0.01)
+        u_rec_pop = iaf.iaf_decode_pop([self.s], 0.1, self.dt, self.bw,
+                                       [3.5], [0.7], [10.0], [0.01])
+        assert_array_almost_equal(u_rec_pop, u_rec)
+
+    def test_decode_pop_parallel(self):
+        s = iaf.iaf_encode(self.u, self.dt, 3.0, 0.7, np.inf, 0.01)
+        args = ([self.s, s], 0.1, self.dt, self.bw, [3.5, 3.0], [0.7, 0.7],
+                [10.0, np.inf], [0.01, 0.01])
+        u_rec = iaf.iaf_decode_pop(*args)
+        temp_dir = tempfile.mkdtemp()
+        try:
+            G_file = os.path.join(temp_dir, 'G.dat')
+            for executor in ['thread', 'process']:
+                u_rec_par = iaf.iaf_decode_pop(*args, n_workers=2,
+                                               executor=executor,
+                                               G_file=G_file)
+                assert_array_equal(u_rec_par, u_rec)
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_spline_G_block(self):
+        ts = np.cumsum(self.s)
+        tsj = ts[::2]+0.0003
+        for RCi, RCj in [(np.inf, np.inf), (0.1, 0.05)]:
+            G = iaf._iaf_spline_G_block(ts, tsj, RCi, RCj)
+            G_ref = iaf._iaf_spline_G_block(ts, tsj, RCi, RCj, reference=True)
+            assert_array_almost_equal(G/np.abs(G_ref).max(),
+                                      G_ref/np.abs(G_ref).max())
+
+    def test_delay_G_block(self):
+        ts = np.cumsum(self.s)
+        tau_i = ts[np.newaxis, :]-np.array([[0.001], [0.003]])
+        tau_j = ts[np.newaxis, ::2]-np.array([[0.002], [0.0]])
+        w_i = np.array([0.7, 1.1])
+        w_j = np.array([0.9, 0.6])
+        for tau in [tau_i, tau_j]:
+            G = iaf._iaf_delay_G_block(tau_i, tau, w_i, w_j)
+            G_ref = iaf._iaf_delay_G_block(tau_i, tau, w_i, w_j,
+                                           reference=True)
+            assert_array_almost_equal(G/np.abs(G_ref).max(),
+                                      G_ref/np.abs(G_ref).max())
+
+class TestIAFDecodeDelay(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.T = 0.05
+        self.dt = 1e-5
+        self.t_start = 0.02
+        M = 2
+        N = 5
+        self.u_list = []
+        for i in xrange(M):
+            u = bl.gen_band_limited(2*self.T, self.dt, 100, None, 8)
+            self.u_list.append(1.5*u/np.max(u))
+        self.params = (list(np.random.uniform(2.3, 3.3, N)),
+                       list(np.random.uniform(0.15, 0.25, N)),
+                       [0.01]*N,
+                       map(list, np.random.exponential(0.003, (N, M))),
+                       map(list, np.random.uniform(0.5, 1.0, (N, M))))
+        self.s_list = iaf.iaf_encode_delay(self.u_list, self.t_start,
+                                           self.dt, *self.params)
+
+    def test_decode(self):
+        u_rec_list = iaf.iaf_decode_delay(self.s_list, self.T, self.dt,
+                                          *self.params)
+
+        # Ignore the edges of the decoded signals when computing the
+        # SNR:
+        k = int(np.round(self.t_start/self.dt))
+        n = int(np.round(self.T/self.dt))
+        m = int(0.005/self.dt)
+        for u, u_rec in zip(self.u_list, u_rec_list):
+            assert(snr(u[k:k+n], u_rec[:n], m, -m) > 20)
+
+    def test_parallel(self):
+        args = (self.s_list, self.T, self.dt)+self.params
+        u_rec_list = iaf.iaf_decode_delay(*args)
+        for executor in ['thread', 'process']:
+            u_rec_list_par = iaf.iaf_decode_delay(*args, n_workers=2,
+                                                  executor=executor)
+            for u_rec, u_rec_par in zip(u_rec_list, u_rec_list_par):
+                assert_array_equal(u_rec_par, u_rec)
+
+if __name__ == "__main__":
+    main()
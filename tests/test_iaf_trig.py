@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+
+"""
+Test IAF time decoding machines that use trigonometric polynomials.
+"""
+
+import numpy as np
+from numpy.testing import *
+from unittest import main
+
+import bionet.utils.band_limited as bl
+import bionet.ted.iaf as iaf
+import bionet.ted.iaf_trig as iaf_trig
+
+def iaf_trig_F_loop(s, ts, bwM, M, RC):
+    """
+    Compute the reconstruction matrix one entry at a time.
+    """
+
+    em = lambda m, t: np.exp(1j*m*bwM*t)
+    F = np.empty((len(ts)-1, 2*M+1), complex)
+    for k in xrange(len(ts)-1):
+        for m in xrange(-M, M+1):
+            if np.isinf(RC):
+                if m == 0:
+                    F[k, m+M] = s[k+1]
+                else:
+                    F[k, m+M] = (em(m, ts[k+1])-em(m, ts[k]))/(1j*m*bwM)
+            else:
+                yk = RC*(1-np.exp(-s[k+1]/RC))
+                F[k, m+M] = (RC*em(m, ts[k+1])+(yk-RC)*em(m, ts[k]))/ \
+                            (1+1j*m*bwM*RC)
+    return F
+
+class TestIAFTrigDecode(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.dt = 1e-5
+        self.dur = 0.1
+        self.bw = 2*np.pi*32
+        self.M = 16
+        self.u = bl.gen_band_limited(self.dur, self.dt, 32)
+
+    def test_F(self):
+        s = iaf.iaf_encode(self.u, self.dt, 3.5, 0.7, np.inf, 0.01)
+        ts = np.cumsum(s)
+        bwM = self.bw/self.M
+        for RC in [np.inf, 0.1]:
+            assert_array_almost_equal(iaf_trig._iaf_trig_F(s, ts, bwM,
+                                                           self.M, RC),
+                                      iaf_trig_F_loop(s, ts, bwM,
+                                                      self.M, RC))
+
+    def test_decode_pop(self):
+        s = iaf.iaf_encode(self.u, self.dt, 3.5, 0.7, 10.0, 0.01)
+        u_rec = iaf_trig.iaf_decode(s, self.dur, self.dt, self.bw, 3.5, 0.7,
+                                    10.0, 0.01, self.M)
+        u_rec_pop = iaf_trig.iaf_decode_pop([s], self.dur, self.dt, self.bw,
+                                            [3.5], [0.7], [10.0], [0.01],
+                                            self.M)
+        assert_array_almost_equal(u_rec_pop, u_rec)
+
+    def test_list(self):
+        s = iaf.iaf_encode(self.u, self.dt, 3.5, 0.7, np.inf, 0.01)
+        args = (self.dur, self.dt, self.bw, 3.5, 0.7, np.inf, 0.01, self.M)
+        assert_array_equal(iaf_trig.iaf_decode(list(s), *args),
+                           iaf_trig.iaf_decode(s, *args))
+
+    def test_single(self):
+        s = iaf.iaf_encode(self.u, self.dt, 3.5, 0.7, np.inf, 0.01)
+        args = (s, self.dur, self.dt, self.bw, 3.5, 0.7, np.inf, 0.01, self.M)
+        u_rec = iaf_trig.iaf_decode(*args)
+        u_rec_single = iaf_trig.iaf_decode(*args, dtype=np.float32)
+        assert_equal(u_rec_single.dtype, np.float32)
+        assert_array_almost_equal(u_rec_single, u_rec, 2)
+
+    def test_streaming(self):
+        s1 = iaf.iaf_encode(self.u, self.dt, 3.5, 0.7, 10.0, 0.01)
+        s2 = iaf.iaf_encode(self.u, self.dt, 3.0, 0.7, np.inf, 0.01)
+        u_rec = iaf_trig.iaf_decode_pop([s1, s2], self.dur, self.dt, self.bw,
+                                        [3.5, 3.0], [0.7, 0.7],
+                                        [10.0, np.inf], [0.01, 0.01], self.M)
+        decoder = iaf_trig.IAFTrigDecoder(self.bw, self.M)
+        for i in xrange(0, max(len(s1), len(s2)), 5):
+            decoder.add(s2[i:i+5], 3.0, 0.7, np.inf, 0.01, neuron=1)
+            decoder.add(s1[i:i+5], 3.5, 0.7, 10.0, 0.01, neuron=0)
+        assert_array_almost_equal(decoder.decode(self.dur, self.dt), u_rec)
+
+if __name__ == "__main__":
+    main()
@@ -32,5 +32,27 @@ class TestMisc(TestCase):
         x3 = sb.read(5)
         assert(x1 == range(5) and x2 == range(5, 10) and x3 == [])
 
+    def testArrayBufferRead(self):
+        x = range(10)
+        i = iter(x)
+        sb = m.ArrayBuffer(i.next)
+        x1 = sb.read(5)
+        x2 = sb.read(5)
+        x3 = sb.read(5)
+        assert_array_equal(x1, range(5))
+        assert_array_equal(x2, range(5, 10))
+        assert(len(x3) == 0)
+
+    def testArrayBufferWrap(self):
+        i = m.chunks(range(100), 7)
+        sb = m.ArrayBuffer(i.next, 10)
+        x = []
+        while True:
+            y = sb.read(4)
+            if len(y) == 0:
+                break
+            x.extend(y)
+        assert_array_equal(x, range(100))
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+
+"""
+Test matrix-free linear operators.
+"""
+
+import numpy as np
+from numpy.testing import *
+from unittest import main
+import scipy.special
+
+from bionet.ted.operators import GOperator
+
+def G_dense(ts_list, tsh, bw):
+    """Dense reconstruction matrix used as a reference."""
+
+    G_list = []
+    for ts in ts_list:
+        temp = scipy.special.sici(bw*(ts[:, np.newaxis]-tsh))[0]/np.pi
+        G_list.append(temp[1:]-temp[:-1])
+    return np.vstack(G_list)
+
+class TestGOperator(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.bw = 2*np.pi*32
+        self.ts = np.cumsum(np.random.uniform(0.002, 0.008, 200))
+        self.tsh = (self.ts[1:]+self.ts[:-1])/2
+        self.x = np.random.randn(len(self.tsh))
+        self.y = np.random.randn(len(self.tsh))
+
+    def test_fft(self):
+        G = G_dense([self.ts], self.tsh, self.bw)
+        op = GOperator(self.ts, self.tsh, self.bw)
+        assert_array_almost_equal(op.matvec(self.x), np.dot(G, self.x), 10)
+        assert_array_almost_equal(op.rmatvec(self.y), np.dot(G.T, self.y), 10)
+
+    def test_direct(self):
+        G = G_dense([self.ts], self.tsh, self.bw)
+        op = GOperator(self.ts, self.tsh, self.bw, method='direct')
+        assert_array_almost_equal(op.matvec(self.x), np.dot(G, self.x), 12)
+        assert_array_almost_equal(op.rmatvec(self.y), np.dot(G.T, self.y), 12)
+
+    def test_list(self):
+        ts_list = [self.ts[:80], self.ts[80:]]
+        tsh = np.hstack([(ts[1:]+ts[:-1])/2 for ts in ts_list])
+        G = G_dense(ts_list, tsh, self.bw)
+        op = GOperator(ts_list, tsh, self.bw)
+        x = self.x[:len(tsh)]
+        assert_equal(op.shape, G.shape)
+        assert_array_almost_equal(op.matvec(x), np.dot(G, x), 10)
+        assert_array_almost_equal(op.rmatvec(x), np.dot(G.T, x), 10)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+"""
+Test reusable decoder plans.
+"""
+
+import numpy as np
+from numpy.testing import *
+from unittest import main
+
+import bionet.utils.band_limited as bl
+import bionet.ted.asdm as asdm
+import bionet.ted.iaf as iaf
+import bionet.ted.plans as plans
+
+class TestPlans(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.dt = 1e-5
+        self.dur = 0.1
+        self.bw = 2*np.pi*32
+        self.u = bl.gen_band_limited(self.dur, self.dt, 32)
+
+    def test_iaf(self):
+        s = iaf.iaf_encode(self.u, self.dt, 3.5, 0.7, 10.0, 0.01)
+        u_rec = iaf.iaf_decode(s, self.dur, self.dt, self.bw, 3.5, 0.7,
+                               10.0, 0.01)
+        plan = plans.iaf_plan(s, self.bw, 10.0, 0.01)
+        assert_array_almost_equal(plan.decode(self.dur, self.dt, 3.5, 0.7),
+                                  u_rec)
+
+    def test_asdm_pop(self):
+        s_list = [asdm.asdm_encode(self.u, self.dt, b, 0.7, 0.01) \
+                  for b in [0.9, 1.0]]
+        args = ([0.9, 1.0], [0.7, 0.7], [0.01, 0.01])
+        u_rec = asdm.asdm_decode_pop(s_list, self.dur, self.dt, self.bw,
+                                     *args)
+        plan = plans.asdm_pop_plan(s_list, self.bw)
+        assert_array_almost_equal(plan.decode(self.dur, self.dt, *args),
+                                  u_rec)
+
+    def test_columns(self):
+        s = asdm.asdm_encode(self.u, self.dt, 0.9, 0.7, 0.01)
+        plan = plans.asdm_plan(s, self.bw)
+        q = np.column_stack([plan.quanta(0.9, 0.7, 0.01),
+                             plan.quanta(0.9, 0.7, 0.01, 1)])
+        u_rec = plan.synthesize(plan.solve(q), self.dur, self.dt)
+        assert_array_almost_equal(u_rec[:, 0],
+                                  plan.decode(self.dur, self.dt, 0.9, 0.7, 0.01))
+        assert_array_almost_equal(u_rec[:, 1], -u_rec[:, 0])
+
+    def test_cache(self):
+        s = asdm.asdm_encode(self.u, self.dt, 0.9, 0.7, 0.01)
+        cache = plans.PlanCache(2)
+        plan = plans.asdm_plan(s, self.bw, cache=cache)
+        assert plans.asdm_plan(s.copy(), self.bw, cache=cache) is plan
+        plans.asdm_plan(s[:-1], self.bw, cache=cache)
+        plans.asdm_plan(s, self.bw, cache=cache)
+        plans.asdm_plan(s[:-2], self.bw, cache=cache)
+        assert_equal(len(cache), 2)
+        assert plans.asdm_plan(s, self.bw, cache=cache) is plan
+        assert plans.asdm_plan(s[:-1], self.bw, cache=cache) is not plan
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+"""
+Test real-time time encoding and decoding machines.
+"""
+
+import numpy as np
+from numpy.testing import *
+from unittest import main
+
+import bionet.utils.band_limited as bl
+import bionet.ted.asdm as asdm
+import bionet.ted.rt as rt
+
+def get_spike_block_ref(s_list, t_start, t_end):
+    """
+    Select the interspike intervals in a block by searching the
+    entire spike train.
+    """
+
+    s_block_list = []
+    for s in s_list:
+        ts = np.cumsum(s)
+        k = np.intersect1d(np.where(ts > t_start)[0],
+                           np.where(ts <= t_end)[0])
+        s_block = s[k].copy()
+        s_block[0] = ts[k[0]]-t_start
+        s_block_list.append(s_block)
+    return s_block_list
+
+class TestRealTimeDecoder(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.dt = 1e-6
+        self.bw = 2*np.pi*32
+        self.u = bl.gen_band_limited(0.1, self.dt, 32)
+        self.s = rt.iaf_encode(self.u, self.dt, 3.5, 0.7, 10.0, 0.01)
+
+    def test_parallel(self):
+        args = (self.s, self.dt, self.bw, 3.5, 0.7, 10.0, 0.01, 10, 2, 1)
+        u_rec = rt.iaf_decode(*args)
+        for executor in ['thread', 'process']:
+            assert_array_equal(rt.iaf_decode(*args, n_workers=2,
+                                             executor=executor,
+                                             lookahead=3), u_rec)
+
+    def test_parallel_asdm(self):
+
+        # The sign of the first spike of each block alternates when
+        # the number of spikes between blocks is odd:
+        s = asdm.asdm_encode(self.u, self.dt, 3.5, 0.7, 0.01)
+        N, M, K = 10, 2, 1
+        assert_equal((N-2*M-K) % 2, 1)
+        decoder = rt.ASDMRealTimeDecoder(self.dt, self.bw, 3.5, 0.7, 0.01,
+                                         N, M, K)
+        u_rec = decoder(s)
+        assert(len(u_rec) > 0)
+        for executor in ['thread', 'process']:
+            decoder = rt.ASDMRealTimeDecoder(self.dt, self.bw, 3.5, 0.7,
+                                             0.01, N, M, K, n_workers=2,
+                                             executor=executor, lookahead=3)
+            assert_array_equal(decoder(s), u_rec)
+
+    def test_out(self):
+        args = (self.s, self.dt, self.bw, 3.5, 0.7, 10.0, 0.01, 10, 2, 1)
+        u_rec = rt.iaf_decode(*args)
+        out = np.zeros(len(self.u))
+        u_rec_out = rt.iaf_decode(*args, chunk_size=7, out=out)
+        assert_array_equal(u_rec_out, u_rec)
+        assert_array_equal(out[:len(u_rec)], u_rec)
+
+class TestRealTimeDecodeDelay(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.dt = 1e-5
+        self.T_block = 0.025
+        self.T_overlap = self.T_block/3.0
+        u_list = [1.5*bl.gen_band_limited(0.1, self.dt, 100, None, 8)
+                  for i in xrange(2)]
+        N = 3
+        self.params = (list(np.random.uniform(2.8, 3.3, N)),
+                       list(np.random.uniform(0.15, 0.25, N)),
+                       [0.01]*N,
+                       map(list, np.random.exponential(0.003, (N, 2))),
+                       map(list, np.random.uniform(0.5, 1.0, (N, 2))))
+        self.s_list = rt.iaf_encode_delay(u_list, self.T_block, 0.02,
+                                          self.dt, *self.params)
+
+    def test_get_spike_block(self):
+        ts_list = map(np.cumsum, self.s_list)
+
+        # Include block boundaries that coincide with spike times:
+        for t_start, t_end in [(0.0, 0.01), (0.003, 0.021),
+                               (ts_list[0][5], ts_list[1][40]),
+                               (ts_list[2][3], 0.05)]:
+            s_block_list = rt._get_spike_block(self.s_list, t_start, t_end)
+            s_block_list_ref = get_spike_block_ref(self.s_list, t_start,
+                                                   t_end)
+            for s_block, s_block_ref in zip(s_block_list, s_block_list_ref):
+                assert_array_equal(s_block, s_block_ref)
+
+    def test_parallel(self):
+        args = (self.s_list, self.T_block, self.T_overlap, self.dt)+ \
+               self.params
+        u_rec_list = rt.iaf_decode_delay(*args)
+        assert(len(u_rec_list[0]) > 0)
+        for executor in ['thread', 'process']:
+            u_rec_list_par = rt.iaf_decode_delay(*args, n_workers=2,
+                                                 executor=executor)
+            for u_rec, u_rec_par in zip(u_rec_list, u_rec_list_par):
+                assert_array_equal(u_rec_par, u_rec)
+
+if __name__ == "__main__":
+    main()
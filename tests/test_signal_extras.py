@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+
+"""
+Test signal extras.
+"""
+
+import numpy as np
+import scipy.signal
+from numpy.testing import *
+from unittest import main
+
+import bionet.utils.trig_poly as tp
+from bionet.utils.signal_extras import Upsampler
+
+class TestUpsampler(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        M = 5
+        T = 2*np.pi*M/(2*np.pi*50)
+        self.n = 8
+        self.half_len = 32
+        self.x = tp.gen_trig_poly(T, T/200, tp.gen_dirichlet_coeffs(M))
+        self.x /= np.max(np.abs(self.x))
+
+    def test_samples(self):
+        y = Upsampler(self.n, self.half_len)(self.x, flush=True)
+        assert_equal(len(y), self.n*len(self.x))
+        assert_array_almost_equal(y[::self.n], self.x, 12)
+
+    def test_resample(self):
+        y = Upsampler(self.n, self.half_len)(self.x, flush=True)
+        y_ref = scipy.signal.resample(self.x, self.n*len(self.x))
+
+        # The interpolation is only accurate away from the edges of the
+        # signal, which is assumed to be zero outside of its support:
+        h = self.n*self.half_len
+        assert_array_almost_equal(y[h:-h], y_ref[h:-h], 4)
+
+    def test_blocks(self):
+        y = Upsampler(self.n, self.half_len)(self.x, flush=True)
+        upsampler = Upsampler(self.n, self.half_len)
+        y_list = [upsampler(x_block) for x_block in
+                  np.array_split(self.x, 7)]
+        y_list.append(upsampler(self.x[0:0], flush=True))
+        assert_array_equal(np.hstack(y_list), y)
+        y_list = list(Upsampler(self.n, self.half_len).blocks(self.x, 37,
+                                                                flush=True))
+        assert_array_equal(np.hstack(y_list), y)
+
+if __name__ == "__main__":
+    main()
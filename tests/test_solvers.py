@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+
+"""
+Test linear system solvers.
+"""
+
+import numpy as np
+from numpy.testing import *
+from unittest import main
+import scipy.sparse.linalg as spla
+
+import bionet.ted.solvers as solvers
+
+class TestSolvers(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.G = np.random.randn(20, 20)+20*np.eye(20)
+        self.c = np.random.randn(20)
+        self.q = np.dot(self.G, self.c)
+
+    def test_solvers(self):
+        for solver in ['pinv', 'tsvd', 'cg', 'lsqr', 'minres']:
+            c = solvers.solve(self.G, self.q, solver)
+            assert_array_almost_equal(c, self.c)
+
+    def test_columns(self):
+        q = np.column_stack([self.q, 2*self.q])
+        for solver in ['pinv', 'tsvd', 'cg', 'lsqr', 'minres']:
+            c = solvers.solve(self.G, q, solver)
+            assert_equal(c.shape, (20, 2))
+            assert_array_almost_equal(c[:, 1], 2*self.c)
+
+    def test_tsvd_rank(self):
+        U, s, Vh = np.linalg.svd(self.G)
+        c = solvers.tsvd_solve(self.G, self.q, rank=5)
+        c_ref = np.dot(Vh[:5].T, np.dot(U[:, :5].T, self.q)/s[:5])
+        assert_array_almost_equal(c, c_ref)
+
+    def test_operator(self):
+        A = spla.aslinearoperator(self.G)
+        for solver in ['cg', 'lsqr', 'minres']:
+            c = solvers.solve(A, self.q, solver)
+            assert_array_almost_equal(c, self.c)
+
+    def test_complex(self):
+        G = self.G+1j*np.random.randn(20, 20)
+        c_ref = self.c+1j*self.c[::-1]
+        q = np.dot(G, c_ref)
+        for solver in ['pinv', 'tsvd', 'cg', 'lsqr', 'minres']:
+            c = solvers.solve(G, q, solver)
+            assert_array_almost_equal(c, c_ref)
+
+if __name__ == "__main__":
+    main()
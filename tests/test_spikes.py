@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+"""
+Test spike train data structures.
+"""
+
+import numpy as np
+from numpy.testing import *
+from unittest import main
+
+import bionet.utils.band_limited as bl
+import bionet.ted.asdm as asdm
+import bionet.ted.iaf as iaf
+from bionet.ted.spikes import SpikeTrain, SpikeEnsemble, spike_midpoints
+
+class TestSpikes(TestCase):
+    def setUp(self):
+        self.s_list = [np.array([0.1, 0.2, 0.15]), np.array([0.05, 0.3])]
+
+    def test_spike_train(self):
+        st = SpikeTrain.from_intervals(self.s_list[0])
+        assert_array_almost_equal(st.times, [0.1, 0.3, 0.45])
+        assert_array_almost_equal(st.intervals, self.s_list[0])
+        assert_array_almost_equal(st.midpoints, [0.2, 0.375])
+        assert_array_almost_equal(np.asarray(st), self.s_list[0])
+        assert(spike_midpoints(st) is st.midpoints)
+        assert_array_almost_equal(spike_midpoints(self.s_list[0]),
+                                  st.midpoints)
+
+    def test_tick(self):
+        st = SpikeTrain([0.1, 0.3, 0.45], tick=1e-3)
+        assert_equal(st.data, [100, 300, 450])
+        assert_equal(st.data.dtype, np.int64)
+        assert_array_almost_equal(st.intervals, self.s_list[0])
+
+    def test_ensemble(self):
+        se = SpikeEnsemble.from_intervals(self.s_list)
+        assert_equal(len(se), 2)
+        assert_equal(se.indptr, [0, 3, 5])
+        for st, s in zip(se, self.s_list):
+            assert_array_almost_equal(st.intervals, s)
+
+    def test_ensemble_slice(self):
+        se = SpikeEnsemble([[0.1, 0.2], [0.15, 0.3, 0.4], [0.05]])
+        for sl in [slice(0, 2), slice(1, None), slice(None, None, 2),
+                   slice(None, None, -1), slice(2, 1)]:
+            se_sl = se[sl]
+            assert(isinstance(se_sl, SpikeEnsemble))
+            assert_equal(len(se_sl), len(range(3)[sl]))
+            for st, i in zip(se_sl, range(3)[sl]):
+                assert_array_equal(st.times, se[i].times)
+        assert_array_equal(se[-1].times, [0.05])
+        self.assertRaises(TypeError, se.__getitem__, 0.5)
+
+    def test_decode(self):
+        np.random.seed(0)
+        dt = 1e-5
+        dur = 0.1
+        bw = 2*np.pi*32
+        u = bl.gen_band_limited(dur, dt, 32)
+        s = iaf.iaf_encode(u, dt, 3.5, 0.7, 10.0, 0.01)
+        assert_array_almost_equal(iaf.iaf_decode(SpikeTrain.from_intervals(s),
+                                                 dur, dt, bw, 3.5, 0.7,
+                                                 10.0, 0.01),
+                                  iaf.iaf_decode(s, dur, dt, bw, 3.5, 0.7,
+                                                 10.0, 0.01))
+
+    def test_encode(self):
+        np.random.seed(0)
+        dt = 1e-5
+        u = bl.gen_band_limited(0.1, dt, 32)
+        s = iaf.iaf_encode(u, dt, 3.5, 0.7, 10.0, 0.01)
+        st = iaf.iaf_encode(u, dt, 3.5, 0.7, 10.0, 0.01, spike_train=True)
+        assert(isinstance(st, SpikeTrain))
+        assert_array_almost_equal(st.intervals, s)
+        st = asdm.asdm_encode(u, dt, 3.5, 0.7, 0.01, spike_train=True)
+        assert(isinstance(st, SpikeTrain))
+        assert_array_almost_equal(st.intervals,
+                                  asdm.asdm_encode(u, dt, 3.5, 0.7, 0.01))
+        self.assertRaises(ValueError, iaf.iaf_encode, u, dt, 3.5, 0.7,
+                          full_output=True, spike_train=True)
+
+    def test_encode_pop(self):
+        np.random.seed(0)
+        dt = 1e-5
+        u = bl.gen_band_limited(0.1, dt, 32)
+        args = ([u, u], dt, [3.5, 3.0], [0.7, 0.7], [np.inf]*2, [0.01]*2)
+        s_list = iaf.iaf_encode_pop(*args)
+        se = iaf.iaf_encode_pop(*args, spike_train=True)
+        assert(isinstance(se, SpikeEnsemble))
+        assert_equal(len(se), 2)
+        for st, s in zip(se, s_list):
+            assert_array_almost_equal(st.intervals, s)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+"""
+Test signal synthesis routines.
+"""
+
+import numpy as np
+from numpy.testing import *
+from unittest import main
+
+from bionet.ted.synthesis import sinc_synth, trig_synth
+
+def sinc_synth_loop(tsh, c, dur, dt, bw):
+    """Kernel-by-kernel sinc synthesis used as a reference."""
+
+    bwpi = bw/np.pi
+    t = np.arange(0, dur, dt)
+    u = np.zeros(len(t), np.result_type(c, np.float))
+    for i in xrange(len(tsh)):
+        u += np.sinc(bwpi*(t-tsh[i]))*bwpi*c[i]
+    return u
+
+class TestSincSynth(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.dur = 0.1
+        self.dt = 1e-5
+        self.bw = 2*np.pi*32
+        self.tsh = np.sort(np.random.uniform(-0.005, 0.105, 100))
+        self.c = np.random.randn(100)
+        self.u = sinc_synth_loop(self.tsh, self.c, self.dur, self.dt, self.bw)
+
+    def test_direct(self):
+        u = sinc_synth(self.tsh, self.c, self.dur, self.dt, self.bw,
+                       method='direct', block_size=333)
+        assert_array_almost_equal(u, self.u, 10)
+
+    def test_toeplitz(self):
+        u = sinc_synth(self.tsh, self.c, self.dur, self.dt, self.bw,
+                       method='toeplitz')
+        assert_array_almost_equal(u, self.u, 8)
+
+    def test_toeplitz_coarse(self):
+        dt = 1e-3
+        u = sinc_synth(self.tsh, self.c, self.dur, dt, self.bw)
+        u_ref = sinc_synth_loop(self.tsh, self.c, self.dur, dt, self.bw)
+        assert_array_almost_equal(u, u_ref, 8)
+
+    def test_complex(self):
+        c = self.c+1j*self.c[::-1]
+        u = sinc_synth(self.tsh, c, self.dur, self.dt, self.bw)
+        u_ref = sinc_synth_loop(self.tsh, c, self.dur, self.dt, self.bw)
+        assert_array_almost_equal(u, u_ref, 8)
+
+class TestTrigSynth(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.dur = 0.1
+        self.dt = 1.1e-5
+        self.w0 = -2*np.pi*32
+        self.dw = 2*np.pi*32/8
+        self.c = np.random.randn(17)+1j*np.random.randn(17)
+        t = np.arange(0, self.dur, self.dt)
+        self.u = np.zeros(len(t), np.complex)
+        for m in xrange(len(self.c)):
+            self.u += self.c[m]*np.exp(1j*(self.w0+m*self.dw)*t)
+
+    def test_direct(self):
+        u = trig_synth(self.c, self.w0, self.dw, self.dur, self.dt,
+                       method='direct', block_size=333)
+        assert_array_almost_equal(u, self.u, 10)
+
+    def test_czt(self):
+        for block_size in [None, 1000]:
+            u = trig_synth(self.c, self.w0, self.dw, self.dur, self.dt,
+                           method='czt', block_size=block_size)
+            assert_array_almost_equal(u, self.u, 10)
+
+    def test_window(self):
+        t = np.arange(0, self.dur, self.dt)
+        i = (t >= 0.03) & (t < 0.07)
+        u = trig_synth(self.c, self.w0, self.dw, self.dur, self.dt,
+                       window=(0.03, 0.07))
+        assert_array_almost_equal(u, self.u[i], 10)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+
+"""
+Test Vandermonde time decoding machines.
+"""
+
+import numpy as np
+from numpy.testing import *
+from unittest import main
+
+import bionet.utils.band_limited as bl
+from bionet.utils.signal_extras import snr
+import bionet.ted.asdm as asdm
+import bionet.ted.iaf as iaf
+import bionet.ted.vtdm as vtdm
+
+class TestVTDM(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.dt = 1e-5
+        self.bw = 2*np.pi*32
+        self.u = bl.gen_band_limited(0.1, self.dt, 32)
+
+    def check_dtype(self, decode, s, *args):
+
+        # Since Vandermonde systems are ill-conditioned, only a few
+        # spikes are decoded:
+        s = s[:10]
+        dur = np.sum(s)
+        u_rec = decode(s, dur, self.dt, self.bw, *args)
+        u_rec_single = decode(s, dur, self.dt, self.bw, *args,
+                              dtype=np.float32)
+        assert_equal(u_rec_single.dtype, np.float32)
+
+        # Ignore the samples outside of the spikes' interior when
+        # computing the SNR:
+        u = self.u[:len(u_rec)]
+        k_min = int(np.sum(s[:2])/self.dt)
+        k_max = int(np.sum(s[:-2])/self.dt)
+        snr_double = snr(u, u_rec, k_min, k_max)
+        snr_single = snr(u, u_rec_single, k_min, k_max)
+        assert(snr_double > 30)
+        assert(snr_single > snr_double-10)
+
+    def test_asdm_dtype(self):
+        s = asdm.asdm_encode(self.u, self.dt, 3.5, 0.7, 0.01)
+        self.check_dtype(vtdm.asdm_decode_vander, s, 3.5, 0.7, 0.01, 1)
+
+    def test_asdm_ins_dtype(self):
+        s = asdm.asdm_encode(self.u, self.dt, 3.5, 0.7, 0.01)
+        self.check_dtype(vtdm.asdm_decode_vander_ins, s, 3.5, 1)
+
+    def test_iaf_dtype(self):
+        s = iaf.iaf_encode(self.u, self.dt, 3.5, 0.7, np.inf, 0.01)
+        self.check_dtype(vtdm.iaf_decode_vander, s, 3.5, 0.7, np.inf, 0.01)
+
+if __name__ == "__main__":
+    main()